@@ -0,0 +1,11 @@
+"""App configuration for the core app."""
+
+from django.apps import AppConfig
+
+
+class CoreConfig(AppConfig):
+    """Configuration class for the core application."""
+
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "apps.core"
+    verbose_name = "Core"
@@ -0,0 +1,217 @@
+"""
+In-process dispatch of batched API calls.
+
+``/api/batch/`` (see ``apps.core.views.BatchView``) receives several API
+calls in one HTTP request. Each call is resolved with the URL resolver and
+passed straight to its view, skipping the middleware stack, with the user
+and token the batch request was authenticated with: the JWT is decoded
+once per batch, not once per call.
+
+Calls run one after the other in request order, except that:
+
+- with ``parallel``, consecutive read-only calls run concurrently on the
+  process-wide pool of ``BATCH_MAX_WORKERS`` threads; writes still run
+  alone and in order. Pool threads keep their database connections, closed
+  by ``CONN_MAX_AGE`` like those of request threads, so the pool adds at
+  most ``BATCH_MAX_WORKERS`` connections per process. Each call runs in a
+  copy of the batch request's context, with the shared query wrapper of
+  ``apps.monitoring.db`` installed, so its queries count towards the
+  batch's Server-Timing, metrics and slow-query log. Parallel reads pay
+  off when queries wait on a database server; on a local SQLite database
+  they are bound by the interpreter lock (see ``manage.py benchmark_batch``);
+- with ``atomic``, the calls run in one transaction. The first call that
+  fails rolls it back, and the calls after it are not run.
+
+Every call is made with ``Accept: application/json``, which all views
+render, so views without the batch's format still answer. Their data is
+then rendered once, with the batch response, in the format the batch
+request negotiated; compact values are used when that format asks for
+them.
+"""
+
+import contextvars
+import io
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import close_old_connections, transaction
+from django.urls import Resolver404, resolve
+
+from apps.monitoring.db import observed_connections
+
+from .fields import compact_input
+from .renderers import FastJSONRenderer
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+# Request headers of the batch that do not apply to its calls.
+SKIPPED_META = (
+    "CONTENT_TYPE",
+    "CONTENT_LENGTH",
+    "HTTP_ACCEPT_ENCODING",
+    "HTTP_IF_MATCH",
+    "HTTP_IF_NONE_MATCH",
+    "HTTP_IF_MODIFIED_SINCE",
+    "HTTP_IF_UNMODIFIED_SINCE",
+    "HTTP_RANGE",
+)
+# Response headers that describe the rendering, which the batch replaces.
+SKIPPED_HEADERS = ("content-type", "content-length", "vary", "allow")
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def sub_response(status, body, headers=None):
+    """Return the batch entry of one response."""
+    return {"status": status, "headers": headers or {}, "body": body}
+
+
+def build_request(outer, call):
+    """Return the request of ``call``, authenticated like the batch ``outer``."""
+    url = urlsplit(call["path"])
+    body = b"" if call["body"] is None else FastJSONRenderer().render(call["body"])
+    environ = {
+        key: value for key, value in outer.META.items() if key not in SKIPPED_META
+    }
+    environ.update(
+        {
+            "REQUEST_METHOD": call["method"],
+            "PATH_INFO": url.path,
+            "QUERY_STRING": url.query,
+            "CONTENT_TYPE": "application/json",
+            "CONTENT_LENGTH": str(len(body)),
+            # Every view renders JSON; the batch renders the collected data.
+            "HTTP_ACCEPT": "application/json",
+            "wsgi.input": io.BytesIO(body),
+        }
+    )
+    request = WSGIRequest(environ)
+    request.user = outer.user
+    # Read by DRF's Request: authenticate with the batch's user and token
+    # instead of running the authentication classes again.
+    request._force_auth_user = outer.user
+    request._force_auth_token = outer.auth
+    # Read by ``apps.core.fields``: compact values for a compact batch, in
+    # the responses and in the bodies of the calls.
+    request.compact_values = getattr(outer.accepted_renderer, "compact_values", False)
+    request.compact_body = compact_input({"request": outer})
+    return request
+
+
+def response_body(response):
+    """Return the data of ``response``, unrendered when it is a DRF response."""
+    if hasattr(response, "data"):
+        return response.data
+    if response.streaming:
+        return None
+    content = response.content.decode(response.charset, "replace")
+    if "json" in response.get("Content-Type", ""):
+        return json.loads(content)
+    return content
+
+
+def dispatch(outer, call):
+    """Run ``call`` through its view and return its batch entry."""
+    request = build_request(outer, call)
+    try:
+        match = resolve(request.path_info)
+    except Resolver404:
+        return sub_response(404, {"detail": "Not found."})
+    if match.view_name == "batch":
+        return sub_response(400, {"detail": "Batches cannot be nested."})
+
+    request.resolver_match = match
+    response = match.func(request, *match.args, **match.kwargs)
+    headers = {
+        name: value
+        for name, value in response.items()
+        if name.lower() not in SKIPPED_HEADERS
+    }
+    return sub_response(response.status_code, response_body(response), headers)
+
+
+def get_executor():
+    """
+    Return the thread pool running the reads of parallel batches.
+
+    Created on first use, so gunicorn workers do not inherit the threads
+    of a preloading master.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.BATCH_MAX_WORKERS, thread_name_prefix="batch"
+            )
+        return _executor
+
+
+def dispatch_in_thread(outer, call):
+    """Run ``call`` on a pool thread, as a request thread would."""
+    close_old_connections()
+    try:
+        with observed_connections():
+            return dispatch(outer, call)
+    finally:
+        close_old_connections()
+
+
+def run_parallel(outer, calls):
+    """Return the entries of ``calls``, running read-only runs concurrently."""
+    responses = [None] * len(calls)
+    start = 0
+    while start < len(calls):
+        end = start
+        while end < len(calls) and calls[end]["method"] in SAFE_METHODS:
+            end += 1
+        if end - start < 2:
+            end = start + 1
+            responses[start] = dispatch(outer, calls[start])
+        else:
+            # A context can only be entered by one thread at a time.
+            futures = [
+                get_executor().submit(
+                    contextvars.copy_context().run, dispatch_in_thread, outer, call
+                )
+                for call in calls[start:end]
+            ]
+            responses[start:end] = [future.result() for future in futures]
+        start = end
+    return responses
+
+
+def run_atomic(outer, calls):
+    """Return the entries of ``calls`` and whether their transaction committed."""
+    responses = []
+    with transaction.atomic():
+        for call in calls:
+            responses.append(dispatch(outer, call))
+            if responses[-1]["status"] >= 400:
+                transaction.set_rollback(True)
+                break
+    committed = responses[-1]["status"] < 400
+    skipped = len(calls) - len(responses)
+    responses.extend(
+        sub_response(424, {"detail": "Not run: an earlier request failed."})
+        for _ in range(skipped)
+    )
+    return responses, committed
+
+
+def run_batch(outer, requests, parallel=False, atomic=False):
+    """
+    Run the calls of a batch.
+
+    Returns:
+        Tuple of (responses, committed); ``committed`` is False only when an
+        atomic batch was rolled back.
+    """
+    if atomic:
+        return run_atomic(outer, requests)
+    if parallel:
+        return run_parallel(outer, requests), True
+    return [dispatch(outer, call) for call in requests], True
@@ -0,0 +1,157 @@
+"""
+SQLite database backend tuned for single-node production installs.
+
+Extends Django's SQLite backend with:
+
+- per-connection pragmas (WAL journal, busy timeout, mmap and page cache
+  size), configurable through ``OPTIONS["pragmas"]``;
+- an in-process write queue: writers of the same database file are
+  serialized on a process-wide lock before they reach SQLite, so concurrent
+  threads of a gunicorn worker wait their turn instead of failing with
+  "database is locked". Transactions start with ``BEGIN IMMEDIATE`` while
+  holding that lock, which avoids lock-upgrade deadlocks the busy timeout
+  cannot resolve. Set ``OPTIONS["write_queue"]`` to False to disable it.
+"""
+
+import threading
+
+from django.db import OperationalError
+from django.db.backends.sqlite3 import base
+
+DEFAULT_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,
+    "mmap_size": 256 * 1024 * 1024,
+    # Negative values are in KiB: 64 MiB of page cache per connection.
+    "cache_size": -64 * 1024,
+    "temp_store": "MEMORY",
+}
+
+WRITE_STATEMENTS = ("INSERT", "UPDATE", "DELETE", "REPLACE", "CREATE", "DROP", "ALTER")
+
+_write_locks = {}
+_write_locks_guard = threading.Lock()
+
+
+def get_write_lock(name):
+    """Return the process-wide write lock for the database file ``name``."""
+    with _write_locks_guard:
+        return _write_locks.setdefault(str(name), threading.Lock())
+
+
+def is_write(query):
+    """Return whether ``query`` modifies the database."""
+    return query.lstrip()[:7].upper().startswith(WRITE_STATEMENTS)
+
+
+class SQLiteCursorWrapper(base.SQLiteCursorWrapper):
+    """Cursor that queues autocommit writes behind the process write lock."""
+
+    db = None
+
+    def execute(self, query, params=None):
+        """Execute ``query``, waiting for the write lock if it is a write."""
+        if self.db is None or self.db.holds_write_lock or not is_write(query):
+            return super().execute(query, params)
+        with self.db.write_queue():
+            return super().execute(query, params)
+
+    def executemany(self, query, param_list):
+        """Execute ``query`` for each parameter set under the write lock."""
+        if self.db is None or self.db.holds_write_lock or not is_write(query):
+            return super().executemany(query, param_list)
+        with self.db.write_queue():
+            return super().executemany(query, param_list)
+
+
+class _WriteQueue:
+    """Context manager holding a connection's write lock for one statement."""
+
+    def __init__(self, db):
+        self.db = db
+
+    def __enter__(self):
+        self.db.acquire_write_lock()
+
+    def __exit__(self, *exc_info):
+        self.db.release_write_lock()
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """SQLite database wrapper with tuned pragmas and a write queue."""
+
+    holds_write_lock = False
+
+    def get_connection_params(self):
+        """Extract the pragma and write-queue options from ``OPTIONS``."""
+        kwargs = super().get_connection_params()
+        self.pragmas = {**DEFAULT_PRAGMAS, **kwargs.pop("pragmas", {})}
+        use_write_queue = kwargs.pop("write_queue", True)
+        self.write_lock = (
+            get_write_lock(self.settings_dict["NAME"]) if use_write_queue else None
+        )
+        self.write_lock_timeout = self.pragmas["busy_timeout"] / 1000
+        return kwargs
+
+    def get_new_connection(self, conn_params):
+        """Open a connection and apply the configured pragmas to it."""
+        conn = super().get_new_connection(conn_params)
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+
+    def create_cursor(self, name=None):
+        """Return a cursor that knows about this wrapper's write lock."""
+        cursor = self.connection.cursor(factory=SQLiteCursorWrapper)
+        if self.write_lock is not None:
+            cursor.db = self
+        return cursor
+
+    def write_queue(self):
+        """Return a context manager holding the write lock for a statement."""
+        return _WriteQueue(self)
+
+    def acquire_write_lock(self):
+        """Wait for this process's turn to write to the database."""
+        if not self.write_lock.acquire(timeout=self.write_lock_timeout):
+            raise OperationalError("database is locked")
+        self.holds_write_lock = True
+
+    def release_write_lock(self):
+        """Let the next queued writer of this process proceed."""
+        if self.holds_write_lock:
+            self.holds_write_lock = False
+            self.write_lock.release()
+
+    def _start_transaction_under_autocommit(self):
+        """Start a write transaction once the write lock is held."""
+        if self.write_lock is None:
+            return super()._start_transaction_under_autocommit()
+        self.acquire_write_lock()
+        try:
+            self.cursor().execute("BEGIN IMMEDIATE")
+        except Exception:
+            self.release_write_lock()
+            raise
+
+    def _commit(self):
+        """Commit and release the write lock."""
+        try:
+            return super()._commit()
+        finally:
+            self.release_write_lock()
+
+    def _rollback(self):
+        """Roll back and release the write lock."""
+        try:
+            return super()._rollback()
+        finally:
+            self.release_write_lock()
+
+    def _close(self):
+        """Close the connection, releasing the write lock if still held."""
+        try:
+            return super()._close()
+        finally:
+            self.release_write_lock()
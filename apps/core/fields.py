@@ -0,0 +1,95 @@
+"""
+Serializer fields with a compact representation for binary formats.
+
+Clients that ask for MessagePack (see ``apps.core.renderers``) get
+timestamps as integer milliseconds since the Unix epoch and choices as
+small integers, their position in the model field's choices. Requests
+sent as MessagePack may use the same values; every other format keeps
+ISO 8601 strings and choice values.
+
+Add ``CompactModelSerializerMixin`` to a ``ModelSerializer`` to use these
+fields for its model ``DateTimeField`` and choice fields.
+"""
+
+from datetime import datetime
+
+from django.db import models
+
+from rest_framework import serializers
+
+from .parsers import MessagePackParser
+from .renderers import EPOCH, epoch_milliseconds
+
+
+def compact_output(context):
+    """Return whether the response of ``context`` uses compact values."""
+    request = context.get("request")
+    # Set on the calls of a batch, whose data the batch renders.
+    if getattr(request, "compact_values", False):
+        return True
+    renderer = getattr(request, "accepted_renderer", None)
+    return getattr(renderer, "compact_values", False)
+
+
+def compact_input(context):
+    """Return whether the request body of ``context`` uses compact values."""
+    request = context.get("request")
+    # Set on the calls of a batch, whose bodies the batch re-encodes as JSON.
+    if getattr(request, "compact_body", False):
+        return True
+    content_type = getattr(request, "content_type", "") or ""
+    return content_type.split(";")[0].strip() == MessagePackParser.media_type
+
+
+def is_integer(value):
+    """Return whether ``value`` is an integer and not a boolean."""
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+class TimestampField(serializers.DateTimeField):
+    """DateTimeField represented as epoch milliseconds in compact formats."""
+
+    def to_representation(self, value):
+        """Return ``value`` as an ISO 8601 string or epoch milliseconds."""
+        if value is None or not compact_output(self.context):
+            return super().to_representation(value)
+        return epoch_milliseconds(self.enforce_timezone(value))
+
+    def to_internal_value(self, value):
+        """Accept epoch milliseconds in compact request bodies."""
+        if is_integer(value) and compact_input(self.context):
+            try:
+                value = EPOCH + value * datetime.resolution * 1000
+            except OverflowError:
+                self.fail("invalid", format="epoch milliseconds")
+            return self.enforce_timezone(value)
+        return super().to_internal_value(value)
+
+
+class EnumChoiceField(serializers.ChoiceField):
+    """ChoiceField represented by the position of the choice in compact formats."""
+
+    def to_representation(self, value):
+        """Return the choice value or, in compact formats, its position."""
+        if value in ("", None) or not compact_output(self.context):
+            return super().to_representation(value)
+        return list(self.choices).index(value)
+
+    def to_internal_value(self, data):
+        """Accept choice positions in compact request bodies."""
+        if is_integer(data) and compact_input(self.context):
+            choices = list(self.choices)
+            if not 0 <= data < len(choices):
+                self.fail("invalid_choice", input=data)
+            return choices[data]
+        return super().to_internal_value(data)
+
+
+class CompactModelSerializerMixin:
+    """Build model timestamp and choice fields with compact representations."""
+
+    serializer_field_mapping = {
+        **serializers.ModelSerializer.serializer_field_mapping,
+        models.DateTimeField: TimestampField,
+    }
+    serializer_choice_field = EnumChoiceField
@@ -0,0 +1,195 @@
+"""
+Worker warm-up and health endpoints.
+
+The first requests a fresh worker serves pay for lazily built state: URL
+pattern compilation, serializer and filterset fields, the first database
+connection and its TLS handshake. ``warm_up`` builds that state up front;
+``config/gunicorn.py`` runs it in the master (for the parts that are
+shared after ``fork``) and in every worker before it accepts connections.
+Django connections belong to threads, so threaded workers also open one
+connection in each thread of their request pool with ``warm_pool``.
+
+``HealthCheckMiddleware`` answers load balancer probes ahead of every
+other middleware, so they skip host validation, the HTTPS redirect and
+request metrics:
+
+- ``/healthz``: liveness, 200 as long as the process serves requests;
+- ``/readyz``: readiness, 200 once the worker is warmed up and its
+  database answers, 503 otherwise. A worker whose database was down when
+  it booted retries the warm-up on each probe.
+"""
+
+import json
+import logging
+import threading
+import time
+
+from django.db import DatabaseError, connections
+from django.http import HttpResponse
+from django.urls import URLResolver, get_resolver
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+LIVENESS_PATH = "/healthz"
+READINESS_PATH = "/readyz"
+
+# Serializers and filtersets whose fields are built during warm-up.
+WARMUP_CLASSES = (
+    "apps.todos.serializers.TodoSerializer",
+    "apps.todos.serializers.TodoCreateSerializer",
+    "apps.users.serializers.UserSerializer",
+    "apps.todos.filters.TodoFilter",
+)
+
+_warmup_lock = threading.Lock()
+_warmup_timings = None
+
+
+def iter_patterns(patterns):
+    """Yield every URL pattern, compiling each regex on the way."""
+    for pattern in patterns:
+        pattern.pattern.regex
+        if isinstance(pattern, URLResolver):
+            yield from iter_patterns(pattern.url_patterns)
+        else:
+            yield pattern
+
+
+def warm_routes():
+    """Compile every URL pattern and populate the reverse lookup tables."""
+    resolver = get_resolver()
+    resolver.reverse_dict
+    return len(list(iter_patterns(resolver.url_patterns)))
+
+
+def warm_classes():
+    """Build the fields of the serializers and filtersets in WARMUP_CLASSES."""
+    from rest_framework.serializers import BaseSerializer
+
+    for path in WARMUP_CLASSES:
+        cls = import_string(path)
+        if issubclass(cls, BaseSerializer):
+            cls().fields
+        else:
+            cls(queryset=cls._meta.model.objects.none()).form
+    return len(WARMUP_CLASSES)
+
+
+def check_databases():
+    """Connect to every database and run a trivial query."""
+    for connection in connections.all():
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+    return len(connections.all())
+
+
+def warm_pool(executor, threads, timeout=10.0):
+    """
+    Open the database connections of every thread of ``executor``.
+
+    ``threads`` tasks wait for each other before connecting, so each runs
+    in its own thread of a pool of that size. A task still waiting after
+    ``timeout`` seconds connects anyway.
+
+    Returns:
+        Number of threads warmed.
+    """
+    barrier = threading.Barrier(threads)
+
+    def connect():
+        try:
+            barrier.wait(timeout)
+        except threading.BrokenBarrierError:
+            pass
+        check_databases()
+        return threading.get_ident()
+
+    futures = [executor.submit(connect) for _ in range(threads)]
+    return len({future.result() for future in futures})
+
+
+def warm_up(database=True):
+    """
+    Warm up this process and mark it ready.
+
+    ``database=False`` skips the connections, for the gunicorn master whose
+    connections must not be inherited by workers.
+
+    Returns:
+        Dictionary mapping each step to its duration in milliseconds.
+    """
+    global _warmup_timings
+    steps = [("routes", warm_routes), ("serializers", warm_classes)]
+    if database:
+        steps.append(("database", check_databases))
+    timings = {}
+    with _warmup_lock:
+        for name, step in steps:
+            start = time.perf_counter()
+            step()
+            timings[name] = round((time.perf_counter() - start) * 1000, 1)
+        if database:
+            _warmup_timings = timings
+    return timings
+
+
+def is_warm():
+    """Return whether this process completed a full warm-up."""
+    return _warmup_timings is not None
+
+
+def reset():
+    """Forget the warm-up, e.g. in tests."""
+    global _warmup_timings
+    with _warmup_lock:
+        _warmup_timings = None
+
+
+def json_response(data, status=200):
+    """Return an uncacheable JSON response."""
+    response = HttpResponse(
+        json.dumps(data), content_type="application/json", status=status
+    )
+    response["Cache-Control"] = "no-store"
+    return response
+
+
+def readiness():
+    """Return the readiness response of this process."""
+    if not is_warm():
+        return json_response({"status": "warming"}, status=503)
+    try:
+        check_databases()
+    except DatabaseError:
+        # Driver messages can name hosts and users; keep them in the logs.
+        logger.exception("Readiness check failed: database unavailable.")
+        return json_response({"status": "database unavailable"}, status=503)
+    return json_response({"status": "ready", "warmup_ms": _warmup_timings})
+
+
+class HealthCheckMiddleware:
+    """
+    Answer liveness and readiness probes before any other middleware.
+
+    Keep it first in ``MIDDLEWARE``. Processes that were not warmed up by a
+    server hook (e.g. ``runserver``) warm up on their first readiness probe.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        """Answer probes, pass every other request on."""
+        path = request.path_info.rstrip("/")
+        if path == LIVENESS_PATH:
+            return json_response({"status": "alive"})
+        if path == READINESS_PATH:
+            if not is_warm():
+                try:
+                    warm_up()
+                except DatabaseError:
+                    pass
+            return readiness()
+        return self.get_response(request)
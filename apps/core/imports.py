@@ -0,0 +1,84 @@
+"""
+Import-time measurement.
+
+Runs ``python -X importtime`` in a fresh interpreter and turns its output
+into a per-module report. Every module is charged the cumulative time of
+its first import, including the modules it pulled in, so the report shows
+which imports are worth deferring.
+"""
+
+import os
+import subprocess
+import sys
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class ImportTiming:
+    """Import cost of one module, in microseconds."""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+    @property
+    def package(self):
+        """Return the top-level package of the module."""
+        return self.module.split(".")[0]
+
+
+def parse_importtime(output):
+    """Return the ImportTimings of ``-X importtime`` output, in import order."""
+    timings = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        timings.append(
+            ImportTiming(
+                module=name.strip(),
+                self_us=int(self_us),
+                cumulative_us=int(cumulative_us),
+                depth=(len(name) - len(name.lstrip()) - 1) // 2,
+            )
+        )
+    return timings
+
+
+def measure_imports(module, settings_module=None, cwd=None, python=sys.executable):
+    """Import ``module`` in a fresh interpreter and return its ImportTimings."""
+    env = dict(os.environ)
+    if settings_module:
+        env["DJANGO_SETTINGS_MODULE"] = settings_module
+    result = subprocess.run(
+        [python, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        cwd=cwd,
+        check=False,
+    )
+    if result.returncode:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+def total_us(timings, module):
+    """Return the cumulative import time of ``module``."""
+    for timing in timings:
+        if timing.module == module:
+            return timing.cumulative_us
+    raise KeyError(module)
+
+
+def by_package(timings):
+    """
+    Return the self time of every top-level package, most expensive first.
+
+    Self times do not overlap, so the packages add up to the total.
+    """
+    packages = {}
+    for timing in timings:
+        packages[timing.package] = packages.get(timing.package, 0) + timing.self_us
+    return sorted(packages.items(), key=lambda item: -item[1])
@@ -0,0 +1,109 @@
+"""Management command that compares sequential and parallel batches."""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.urls import reverse
+
+from apps.monitoring.db import observe_queries
+from apps.todos.benchmark import BenchmarkCase, run_case
+from apps.todos.seeding import DatasetSpec, seed_dataset
+
+
+def read_calls(todo):
+    """Return the independent read-only calls of the benchmarked batch."""
+    list_url = reverse("todos:todo-list")
+    return [
+        {"path": list_url},
+        {"path": f"{list_url}?completed=false&ordering=-priority"},
+        {"path": f"{list_url}?search=report"},
+        {"path": reverse("todos:todo-upcoming")},
+        {"path": reverse("todos:todo-overdue")},
+        {"path": reverse("todos:todo-detail", args=[todo.pk])},
+        {"path": reverse("users:profile")},
+        {"path": f"{reverse('todos:todo-multi-get')}?ids={todo.pk}"},
+    ]
+
+
+class Command(BaseCommand):
+    """
+    Compare the latency of one batch of reads run sequentially and in parallel.
+
+    Seeds a throwaway database and posts the same batch of independent
+    reads to ``/api/batch/`` with ``parallel`` off and on, in repeated ABBA
+    order. ``--db-latency-ms`` adds a delay after every query to model the
+    round trip to a database server: parallel batches overlap those waits,
+    which a local SQLite database does not have.
+    """
+
+    help = "Measure the latency of parallel versus sequential batches."
+
+    def add_arguments(self, parser):
+        """Register command line arguments."""
+        parser.add_argument("--todos", type=int, default=200)
+        parser.add_argument(
+            "--iterations", type=int, default=50, help="Batches per run."
+        )
+        parser.add_argument("--warmup", type=int, default=5)
+        parser.add_argument("--rounds", type=int, default=3, help="ABBA rounds.")
+        parser.add_argument(
+            "--db-latency-ms",
+            type=float,
+            default=0.0,
+            help="Delay added after every query.",
+        )
+
+    def handle(self, *args, **options):
+        """Seed a throwaway database and benchmark both modes."""
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False
+        )
+        try:
+            user = seed_dataset(DatasetSpec(users=1, todos_per_user=options["todos"]))[
+                0
+            ]
+            calls = read_calls(user.todos.order_by("id").first())
+            cases = {
+                mode: BenchmarkCase(
+                    f"batch ({mode})",
+                    "post",
+                    reverse("batch"),
+                    {"requests": calls, "parallel": mode == "parallel"},
+                )
+                for mode in ("sequential", "parallel")
+            }
+            delay = options["db_latency_ms"] / 1000
+
+            def database_latency(sql, params, many, context, duration):
+                time.sleep(delay)
+
+            runs = {mode: [] for mode in cases}
+            with observe_queries(database_latency):
+                for mode in ("sequential", "parallel", "parallel", "sequential") * (
+                    options["rounds"]
+                ):
+                    runs[mode].append(
+                        run_case(
+                            cases[mode], user, options["iterations"], options["warmup"]
+                        )
+                    )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        self.stdout.write(
+            f"{len(calls)} reads per batch, {options['db_latency_ms']} ms per query"
+        )
+        self.stdout.write(f"{'mode':<12} {'mean':>8} {'p50':>8} {'p95':>8}")
+        for mode, results in runs.items():
+            stats = {
+                key: sum(run[key] for run in results) / len(results)
+                for key in ("mean_ms", "p50_ms", "p95_ms")
+            }
+            self.stdout.write(
+                f"{mode:<12} {stats['mean_ms']:>8.3f} {stats['p50_ms']:>8.3f} "
+                f"{stats['p95_ms']:>8.3f}"
+            )
@@ -0,0 +1,117 @@
+"""Management command that compares the stock and fast JSON codecs."""
+
+import io
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from apps.core.parsers import FastJSONParser
+from apps.core.renderers import FastJSONRenderer
+from apps.core.stats import summarize
+from apps.todos.models import Todo
+from apps.todos.serializers import TodoSerializer
+from apps.users.models import User
+
+PAGE_SIZES = (20, 100, 1000)
+
+
+def todo_page(size):
+    """Return serialized data shaped like a page of ``size`` to-dos."""
+    user = User(username="benchmark")
+    now = timezone.now()
+    todos = [
+        Todo(
+            id=i,
+            user=user,
+            title=f"Todo {i} – café",
+            description="Description of the to-do item. " * 4,
+            completed=bool(i % 3),
+            priority=Todo.Priority.values[i % len(Todo.Priority.values)],
+            due_date=now + timedelta(days=i) if i % 2 else None,
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(1, size + 1)
+    ]
+    return {
+        "count": size,
+        "next": None,
+        "previous": None,
+        "results": TodoSerializer(todos, many=True).data,
+    }
+
+
+def measure(function, iterations, warmup):
+    """Return the latency summary of calling ``function`` repeatedly."""
+    for _ in range(warmup):
+        function()
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        function()
+        latencies.append(time.perf_counter() - start)
+    return summarize(latencies)
+
+
+class Command(BaseCommand):
+    """
+    Time rendering and parsing of to-do pages with both JSON codecs.
+
+    Builds pages of 20, 100 and 1000 serialized to-dos without touching the
+    database, checks that ``FastJSONRenderer`` produces exactly the bytes of
+    DRF's ``JSONRenderer`` and that both parsers return the same data, and
+    reports the p50 latency of each codec and the speed-up.
+    """
+
+    help = "Benchmark the orjson-backed JSON renderer and parser."
+
+    def add_arguments(self, parser):
+        """Register command line arguments."""
+        parser.add_argument(
+            "--sizes",
+            type=int,
+            nargs="+",
+            default=PAGE_SIZES,
+            help="To-dos per page.",
+        )
+        parser.add_argument("--iterations", type=int, default=200)
+        parser.add_argument("--warmup", type=int, default=20)
+
+    def handle(self, *args, **options):
+        """Run the benchmark for every page size."""
+        self.stdout.write(
+            f"{'size':>6} {'op':<7} {'bytes':>9} {'stdlib':>9} {'fast':>9} "
+            f"{'speedup':>8}"
+        )
+        for size in options["sizes"]:
+            self.compare(todo_page(size), size, options)
+
+    def compare(self, data, size, options):
+        """Time both codecs on ``data`` and print the results."""
+        renderers = (JSONRenderer(), FastJSONRenderer())
+        body = renderers[0].render(data)
+        if renderers[1].render(data) != body:
+            raise CommandError(f"Rendered output differs for {size} to-dos.")
+        parsers = (JSONParser(), FastJSONParser())
+        if parsers[0].parse(io.BytesIO(body)) != parsers[1].parse(io.BytesIO(body)):
+            raise CommandError(f"Parsed output differs for {size} to-dos.")
+
+        runs = {
+            "render": [lambda r=r: r.render(data) for r in renderers],
+            "parse": [lambda p=p: p.parse(io.BytesIO(body)) for p in parsers],
+        }
+        for op, functions in runs.items():
+            stock, fast = (
+                measure(f, options["iterations"], options["warmup"])["p50_ms"]
+                for f in functions
+            )
+            speedup = f"{stock / fast:.1f}x" if fast else "-"
+            self.stdout.write(
+                f"{size:>6} {op:<7} {len(body):>9} {stock:>9.3f} {fast:>9.3f} "
+                f"{speedup:>8}"
+            )
@@ -0,0 +1,103 @@
+"""Management command that measures the cost of the browser middleware."""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.http import HttpResponse
+from django.test.utils import (
+    override_settings,
+    setup_test_environment,
+    teardown_test_environment,
+)
+from django.urls import path
+
+from apps.todos.benchmark import BenchmarkCase, build_cases, run_case
+from apps.todos.seeding import DatasetSpec, seed_dataset
+
+CASES = ("list?default", "toggle_complete")
+
+
+def noop(request):
+    """Return an empty response, so only the middleware is measured."""
+    return HttpResponse(b"{}", content_type="application/json")
+
+
+# URL configuration of the "noop" case.
+urlpatterns = [path("api/noop/", noop)]
+
+
+class Command(BaseCommand):
+    """
+    Compare API latency with and without the lean middleware routing.
+
+    Seeds a throwaway database and runs the to-do list and toggle-complete
+    requests through the test client with ``LEAN_MIDDLEWARE_PREFIXES``
+    disabled (full stack) and enabled (lean stack), plus a "noop" view
+    that isolates the cost of the middleware itself. The modes run in
+    repeated ABBA order so drift during the run affects both alike. The
+    command reports the mean and p50 latency per mode and the p50 time
+    saved per request.
+    """
+
+    help = "Measure the per-request overhead saved by lean API middleware."
+
+    def add_arguments(self, parser):
+        """Register command line arguments."""
+        parser.add_argument("--todos", type=int, default=200)
+        parser.add_argument(
+            "--iterations", type=int, default=200, help="Requests per run."
+        )
+        parser.add_argument("--warmup", type=int, default=20)
+        parser.add_argument(
+            "--rounds", type=int, default=5, help="ABBA rounds of runs per case."
+        )
+
+    def handle(self, *args, **options):
+        """Seed a throwaway database and benchmark both modes."""
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False
+        )
+        try:
+            user = seed_dataset(DatasetSpec(users=1, todos_per_user=options["todos"]))[
+                0
+            ]
+            cases = {
+                case.name: case
+                for case in build_cases(user, user.todos.order_by("id").first())
+            }
+            self.stdout.write(
+                f"{'case':<20} {'mode':<6} {'mean':>8} {'p50':>8} {'saved':>8}"
+            )
+            for name in CASES:
+                self.compare(cases[name], user, options)
+            with override_settings(ROOT_URLCONF=__name__):
+                self.compare(BenchmarkCase("noop", "get", "/api/noop/"), user, options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+    def compare(self, case, user, options):
+        """Run ``case`` in both modes and print the results."""
+        modes = {"full": (), "lean": settings.LEAN_MIDDLEWARE_PREFIXES or ("/api/",)}
+        runs = {mode: [] for mode in modes}
+        for mode in ("full", "lean", "lean", "full") * options["rounds"]:
+            with override_settings(LEAN_MIDDLEWARE_PREFIXES=modes[mode]):
+                runs[mode].append(
+                    run_case(case, user, options["iterations"], options["warmup"])
+                )
+        means = {
+            mode: {
+                key: sum(run[key] for run in results) / len(results)
+                for key in ("mean_ms", "p50_ms")
+            }
+            for mode, results in runs.items()
+        }
+        for mode, stats in means.items():
+            saved = ""
+            if mode == "lean":
+                saved = f"{means['full']['p50_ms'] - stats['p50_ms']:.3f}"
+            self.stdout.write(
+                f"{case.name:<20} {mode:<6} {stats['mean_ms']:>8.3f} "
+                f"{stats['p50_ms']:>8.3f} {saved:>8}"
+            )
@@ -0,0 +1,153 @@
+"""Management command that benchmarks mixed read/write load on SQLite."""
+
+import random
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connections
+
+from apps.core.stats import summarize
+from apps.todos.models import Todo
+
+BACKENDS = {
+    "default": "django.db.backends.sqlite3",
+    "tuned": "apps.core.db.backends.sqlite3",
+}
+
+
+class Command(BaseCommand):
+    """
+    Compare mixed read/write throughput of the default and tuned SQLite backends.
+
+    Each backend gets a fresh, migrated database file in a temporary
+    directory. Worker threads then list and write to-dos for a fixed time,
+    and the command reports operations per second, "database is locked"
+    errors and latency percentiles for reads and writes.
+    """
+
+    help = "Benchmark mixed read/write throughput of the SQLite backends."
+
+    def add_arguments(self, parser):
+        """Register command line arguments."""
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument("--duration", type=float, default=10.0, help="Seconds.")
+        parser.add_argument(
+            "--write-ratio",
+            type=float,
+            default=0.2,
+            help="Fraction of operations that write.",
+        )
+        parser.add_argument("--seed-todos", type=int, default=1000)
+        parser.add_argument(
+            "--backend",
+            choices=[*BACKENDS, "both"],
+            default="both",
+        )
+
+    def handle(self, *args, **options):
+        """Run the benchmark for the selected backends."""
+        backends = (
+            list(BACKENDS) if options["backend"] == "both" else [options["backend"]]
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            for backend in backends:
+                alias = f"sqlite_benchmark_{backend}"
+                self.add_database(alias, BACKENDS[backend], Path(directory) / alias)
+                try:
+                    result = self.run_backend(alias, options)
+                finally:
+                    connections[alias].close()
+                self.report(backend, result, options["duration"])
+
+    def add_database(self, alias, engine, path):
+        """Register and migrate a temporary database under ``alias``."""
+        database = {"ENGINE": engine, "NAME": str(path)}
+        connections.settings[alias] = connections.configure_settings(
+            {"default": database, alias: database}
+        )[alias]
+        call_command("migrate", database=alias, verbosity=0)
+
+    def run_backend(self, alias, options):
+        """Seed ``alias`` and run the mixed workload against it."""
+        user = (
+            get_user_model()
+            .objects.db_manager(alias)
+            .create_user(
+                username="sqlite-benchmark",
+                email="sqlite-benchmark@example.com",
+            )
+        )
+        Todo.objects.using(alias).bulk_create(
+            Todo(title=f"Todo {i}", user=user) for i in range(options["seed_todos"])
+        )
+
+        result = {"reads": [], "writes": [], "errors": 0}
+        lock = threading.Lock()
+        deadline = time.perf_counter() + options["duration"]
+        threads = [
+            threading.Thread(
+                target=self.worker,
+                args=(
+                    alias,
+                    user,
+                    options["write_ratio"],
+                    deadline,
+                    seed,
+                    result,
+                    lock,
+                ),
+            )
+            for seed in range(options["threads"])
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return result
+
+    def worker(self, alias, user, write_ratio, deadline, seed, result, lock):
+        """Run list and write operations until ``deadline``."""
+        rng = random.Random(seed)
+        reads, writes, errors = [], [], 0
+        todos = Todo.objects.using(alias).filter(user=user)
+        try:
+            while time.perf_counter() < deadline:
+                write = rng.random() < write_ratio
+                start = time.perf_counter()
+                try:
+                    if write:
+                        Todo.objects.using(alias).create(title="Benchmark", user=user)
+                    else:
+                        list(todos.order_by("-created_at")[:20])
+                except OperationalError:
+                    errors += 1
+                    continue
+                (writes if write else reads).append(time.perf_counter() - start)
+        finally:
+            connections[alias].close()
+        with lock:
+            result["reads"].extend(reads)
+            result["writes"].extend(writes)
+            result["errors"] += errors
+
+    def report(self, backend, result, duration):
+        """Print the throughput and latency of one backend."""
+        operations = len(result["reads"]) + len(result["writes"])
+        self.stdout.write(self.style.MIGRATE_HEADING(f"{backend} backend"))
+        self.stdout.write(
+            f"  throughput: {operations / duration:.1f} ops/s "
+            f"({len(result['reads']) / duration:.1f} reads/s, "
+            f"{len(result['writes']) / duration:.1f} writes/s)"
+        )
+        self.stdout.write(f"  locked errors: {result['errors']}")
+        for kind in ("reads", "writes"):
+            stats = summarize(result[kind])
+            self.stdout.write(
+                f"  {kind}: p50 {stats['p50_ms']} ms, p95 {stats['p95_ms']} ms, "
+                f"p99 {stats['p99_ms']} ms"
+            )
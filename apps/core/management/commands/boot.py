@@ -0,0 +1,141 @@
+"""Management command that prepares a container and starts the server."""
+
+import hashlib
+import json
+import os
+import time
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connections
+from django.db.migrations.loader import MigrationLoader
+
+from apps.core.schema import read_artifacts
+
+
+def plan_hash(migrations):
+    """Return a digest of a set of (app label, migration name) keys."""
+    digest = hashlib.sha256()
+    for app_label, name in sorted(migrations):
+        digest.update(f"{app_label}.{name}\n".encode())
+    return digest.hexdigest()
+
+
+def migration_state(connection):
+    """
+    Return the hashes of the migrations on disk and of those applied.
+
+    Only applied migrations that still exist on disk are counted, so
+    leftovers of removed migrations do not force a migrate.
+    """
+    loader = MigrationLoader(connection)
+    nodes = set(loader.graph.nodes)
+    return plan_hash(nodes), plan_hash(nodes & set(loader.applied_migrations))
+
+
+class Command(BaseCommand):
+    """
+    Start-up path for containers, run as a single Python process.
+
+    Phases, each timed and reported:
+
+    - ``database``: connect in-process, retrying with exponential backoff
+      until ``--db-timeout``;
+    - ``migrate``: skipped when the hash of the migrations on disk matches
+      the hash of the applied ones;
+    - ``static``: reuses the manifest written by ``collectstatic`` at image
+      build time and only collects when it is missing;
+    - ``schema``: builds the OpenAPI schema artifacts when missing.
+
+    Any arguments after ``--`` are then executed in place of this process,
+    e.g. ``manage.py boot -- gunicorn config.wsgi:application``.
+    """
+
+    help = "Wait for the database, migrate and collect static files if needed."
+
+    def add_arguments(self, parser):
+        """Register command line arguments."""
+        parser.add_argument("--database", default="default")
+        parser.add_argument("--db-timeout", type=float, default=60.0, help="Seconds.")
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Run migrate and collectstatic even if nothing changed.",
+        )
+        parser.add_argument("exec", nargs="*", help="Command to exec afterwards.")
+
+    def handle(self, *args, **options):
+        """Run the start-up phases, report their timing and exec the server."""
+        self.timings = {}
+        start = time.perf_counter()
+        connection = connections[options["database"]]
+        self.phase("database", self.wait_for_database, connection, options)
+        self.phase("migrate", self.migrate, connection, options)
+        self.phase("static", self.collect_static, options)
+        self.phase("schema", self.build_schema)
+        connection.close()
+        self.timings["total"] = {
+            "ms": round((time.perf_counter() - start) * 1000, 1),
+            "result": "done",
+        }
+        self.stdout.write(f"boot timings: {json.dumps(self.timings)}")
+
+        if options["exec"]:
+            self.stdout.flush()
+            os.execvp(options["exec"][0], options["exec"])
+
+    def phase(self, name, func, *args):
+        """Run ``func`` and record its duration and outcome under ``name``."""
+        start = time.perf_counter()
+        result = func(*args)
+        elapsed = (time.perf_counter() - start) * 1000
+        self.timings[name] = {"ms": round(elapsed, 1), "result": result}
+        self.stdout.write(f"{name}: {result} in {elapsed:.1f} ms")
+
+    def wait_for_database(self, connection, options):
+        """Connect to the database, backing off between attempts."""
+        deadline = time.monotonic() + options["db_timeout"]
+        delay, attempts = 0.05, 0
+        while True:
+            attempts += 1
+            try:
+                connection.ensure_connection()
+                return f"connected after {attempts} attempt(s)"
+            except OperationalError as exc:
+                if time.monotonic() + delay > deadline:
+                    raise CommandError(f"Database unavailable: {exc}")
+                time.sleep(delay)
+                delay = min(delay * 2, 2.0)
+
+    def migrate(self, connection, options):
+        """Apply migrations unless the applied plan is already current."""
+        on_disk, applied = migration_state(connection)
+        if on_disk == applied and not options["force"]:
+            return f"up to date ({on_disk[:12]})"
+        call_command(
+            "migrate", database=connection.alias, interactive=False, verbosity=0
+        )
+        return "migrated"
+
+    def collect_static(self, options):
+        """Collect static files unless the build-time manifest exists."""
+        manifest_name = getattr(staticfiles_storage, "manifest_name", None)
+        if (
+            manifest_name
+            and staticfiles_storage.exists(manifest_name)
+            and not options["force"]
+        ):
+            return "reused manifest"
+        call_command("collectstatic", interactive=False, verbosity=0)
+        return "collected"
+
+    def build_schema(self):
+        """Build the OpenAPI schema artifacts unless they exist."""
+        if settings.DEBUG or not settings.SCHEMA_CACHE_DIR:
+            return "skipped"
+        if read_artifacts(settings.SCHEMA_CACHE_DIR) is not None:
+            return "reused"
+        call_command("build_schema", stdout=self.stdout)
+        return "built"
@@ -0,0 +1,38 @@
+"""Management command that precomputes the OpenAPI schema."""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.schema import build_artifacts, write_artifacts
+
+
+class Command(BaseCommand):
+    """
+    Render the OpenAPI schema and its compressed variants to disk.
+
+    Run it next to ``collectstatic`` when building a release; the schema
+    view then serves the files instead of introspecting the API on the
+    first request of every worker.
+    """
+
+    help = "Precompute the OpenAPI schema served at /api/schema/."
+
+    def add_arguments(self, parser):
+        """Register command line arguments."""
+        parser.add_argument(
+            "--output",
+            default=settings.SCHEMA_CACHE_DIR,
+            help="Directory to write to (default: SCHEMA_CACHE_DIR).",
+        )
+
+    def handle(self, *args, **options):
+        """Build and store the schema artifacts."""
+        if not options["output"]:
+            raise CommandError("Set SCHEMA_CACHE_DIR or pass --output.")
+        artifacts = build_artifacts()
+        write_artifacts(artifacts, options["output"])
+        for artifact in artifacts.values():
+            self.stdout.write(
+                f"schema.{artifact.format}: {len(artifact.body)} bytes "
+                f"(br {len(artifact.br)}, gzip {len(artifact.gzip)})"
+            )
@@ -0,0 +1,55 @@
+"""Management command that reports the import time of the web process."""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.imports import by_package, measure_imports, total_us
+
+
+class Command(BaseCommand):
+    """
+    Measure what importing ``--module`` costs in a fresh interpreter.
+
+    Lists the modules with the highest cumulative import time (the time of
+    their first import, including what they imported) and the self time
+    per top-level package.
+    """
+
+    help = "Report per-module import time of the WSGI application."
+
+    def add_arguments(self, parser):
+        """Register command line arguments."""
+        parser.add_argument("--module", default="config.wsgi")
+        parser.add_argument("--limit", type=int, default=25)
+        parser.add_argument(
+            "--min-depth",
+            type=int,
+            default=1,
+            help="Hide modules imported at a shallower nesting level.",
+        )
+
+    def handle(self, *args, **options):
+        """Print the report."""
+        try:
+            timings = measure_imports(
+                options["module"], settings.SETTINGS_MODULE, cwd=settings.BASE_DIR
+            )
+        except RuntimeError as exc:
+            raise CommandError(str(exc))
+        total = total_us(timings, options["module"])
+        self.stdout.write(f"{options['module']}: {total / 1000:.1f} ms")
+
+        self.stdout.write(f"\n{'cumulative':>10} {'self':>8}  module")
+        ranked = sorted(
+            (t for t in timings if t.depth >= options["min_depth"]),
+            key=lambda timing: -timing.cumulative_us,
+        )
+        for timing in ranked[: options["limit"]]:
+            self.stdout.write(
+                f"{timing.cumulative_us / 1000:>8.1f}ms {timing.self_us / 1000:>6.1f}ms"
+                f"  {'  ' * (timing.depth - 1)}{timing.module}"
+            )
+
+        self.stdout.write(f"\n{'self':>10}  package")
+        for package, self_us in by_package(timings)[: options["limit"]]:
+            self.stdout.write(f"{self_us / 1000:>8.1f}ms  {package}")
@@ -0,0 +1,82 @@
+"""Management command that replays a captured traffic log."""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.replay import Replayer, load_log, report
+from apps.todos.seeding import PASSWORD, USER_PREFIX
+
+
+class Command(BaseCommand):
+    """
+    Replay a log written by ``TrafficCaptureMiddleware`` against a server.
+
+    User buckets are mapped onto users created by ``seed_todos``
+    (``<prefix><n>``), requests are paced by their recorded arrival times
+    divided by ``--speedup`` and sent from ``--workers`` threads. The
+    command reports throughput, error rate and per-route latency
+    percentiles. Deletes, logouts, registrations and profile updates are
+    skipped so a replay does not change the seeded dataset's users.
+    """
+
+    help = "Replay captured traffic against a running server."
+
+    def add_arguments(self, parser):
+        """Register command line arguments."""
+        parser.add_argument("log", help="Path of the capture log.")
+        parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+        parser.add_argument("--workers", type=int, default=8)
+        parser.add_argument(
+            "--speedup",
+            type=float,
+            default=1.0,
+            help="Replay speed relative to the capture; 0 disables pacing.",
+        )
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--user-prefix", default=USER_PREFIX)
+        parser.add_argument("--password", default=PASSWORD)
+        parser.add_argument("--limit", type=int, help="Replay the first N entries.")
+        parser.add_argument("--timeout", type=float, default=30.0, help="Seconds.")
+
+    def handle(self, *args, **options):
+        """Replay the log and print the report."""
+        try:
+            entries = load_log(options["log"], limit=options["limit"])
+        except OSError as exc:
+            raise CommandError(f"Cannot read {options['log']}: {exc}")
+        if not entries:
+            raise CommandError("The capture log is empty.")
+        users = [
+            (f"{options['user_prefix']}{index}", options["password"])
+            for index in range(options["users"])
+        ]
+        replayer = Replayer(
+            options["base_url"],
+            users,
+            workers=options["workers"],
+            speedup=options["speedup"],
+            timeout=options["timeout"],
+        )
+        try:
+            outcomes, skipped, elapsed = replayer.run(entries)
+        except (RuntimeError, OSError) as exc:
+            raise CommandError(str(exc))
+
+        errors = sum(
+            outcome.status >= 500 or outcome.status == 0 for outcome in outcomes
+        )
+        client_errors = sum(400 <= outcome.status < 500 for outcome in outcomes)
+        total = len(outcomes)
+        self.stdout.write(
+            f"{total} requests in {elapsed:.1f}s "
+            f"({total / elapsed if elapsed else 0:.1f} req/s), {skipped} skipped"
+        )
+        self.stdout.write(
+            f"errors: {errors} ({100 * errors / total if total else 0:.2f}%), "
+            f"client errors: {client_errors}"
+        )
+        for route, stats in report(outcomes).items():
+            self.stdout.write(
+                f"  {route}: {stats['count']} requests, p50 {stats['p50_ms']} ms, "
+                f"p95 {stats['p95_ms']} ms, p99 {stats['p99_ms']} ms, "
+                f"{stats['errors']} errors, {stats['client_errors']} client errors"
+            )
@@ -0,0 +1,61 @@
+"""Management command that reports the memory of gunicorn workers."""
+
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.resources import child_pids, process_memory
+
+MB = 1024 * 1024
+
+
+class Command(BaseCommand):
+    """
+    Print RSS, PSS, USS and shared memory of the gunicorn master and workers.
+
+    With a preloaded application most of each worker's RSS is shared with
+    the master, so USS is the memory every additional worker costs.
+    """
+
+    help = "Report per-worker RSS/PSS/USS of a running gunicorn."
+
+    def add_arguments(self, parser):
+        """Register command line arguments."""
+        parser.add_argument("--pid", type=int, help="Gunicorn master process id.")
+        parser.add_argument(
+            "--pidfile",
+            default="/tmp/gunicorn.pid",
+            help="Read the master process id from this file.",
+        )
+
+    def handle(self, *args, **options):
+        """Print the memory table."""
+        pid = options["pid"]
+        if pid is None:
+            try:
+                pid = int(Path(options["pidfile"]).read_text())
+            except (OSError, ValueError) as exc:
+                raise CommandError(f"Cannot read {options['pidfile']}: {exc}")
+        try:
+            processes = [("master", process_memory(pid))]
+            processes += [
+                ("worker", process_memory(child)) for child in child_pids(pid)
+            ]
+        except OSError as exc:
+            raise CommandError(f"Cannot read the memory of process {pid}: {exc}")
+
+        self.stdout.write(
+            f"{'role':<8} {'pid':>8} {'rss':>9} {'pss':>9} {'uss':>9} {'shared':>9}"
+        )
+        for role, usage in processes:
+            self.stdout.write(
+                f"{role:<8} {usage.pid:>8} {usage.rss / MB:>8.1f}M "
+                f"{usage.pss / MB:>8.1f}M {usage.uss / MB:>8.1f}M "
+                f"{usage.shared / MB:>8.1f}M"
+            )
+        total_pss = sum(usage.pss for _, usage in processes)
+        total_rss = sum(usage.rss for _, usage in processes)
+        self.stdout.write(
+            f"total: {total_pss / MB:.1f}M proportional "
+            f"({total_rss / MB:.1f}M if nothing were shared)"
+        )
@@ -0,0 +1,65 @@
+"""
+Route-aware versions of the browser-oriented middleware.
+
+The API authenticates with JWT only, so requests under
+``LEAN_MIDDLEWARE_PREFIXES`` do not need sessions, messages, CSRF
+protection, static file lookups or ``request.user`` from the session. The
+classes below subclass the stock middleware and pass such requests
+straight to the next layer; every other request (the admin, the API
+documentation assets) gets the stock behaviour. Subclassing keeps the
+admin's system checks, which look for these classes in ``MIDDLEWARE``,
+satisfied.
+
+On lean requests ``request.user`` is only set once DRF has authenticated
+the request, so middleware must not rely on it before the view runs.
+"""
+
+from django.conf import settings
+from django.contrib.auth import middleware as auth
+from django.contrib.messages import middleware as messages
+from django.contrib.sessions import middleware as sessions
+from django.middleware import csrf
+
+from whitenoise import middleware as whitenoise
+
+
+def is_lean_request(request):
+    """Return whether ``request`` bypasses the browser middleware."""
+    prefixes = settings.LEAN_MIDDLEWARE_PREFIXES
+    return bool(prefixes) and request.path_info.startswith(prefixes)
+
+
+class LeanRouteMixin:
+    """Skip the middleware for requests under ``LEAN_MIDDLEWARE_PREFIXES``."""
+
+    def __call__(self, request):
+        """Pass lean requests through, handle the others as usual."""
+        if is_lean_request(request):
+            return self.get_response(request)
+        return super().__call__(request)
+
+
+class WhiteNoiseMiddleware(LeanRouteMixin, whitenoise.WhiteNoiseMiddleware):
+    """WhiteNoise static file serving, skipped for API requests."""
+
+
+class SessionMiddleware(LeanRouteMixin, sessions.SessionMiddleware):
+    """Session middleware, skipped for API requests."""
+
+
+class CsrfViewMiddleware(LeanRouteMixin, csrf.CsrfViewMiddleware):
+    """CSRF protection, skipped for API requests."""
+
+    def process_view(self, request, callback, callback_args, callback_kwargs):
+        """Check the CSRF token unless the request is a lean one."""
+        if is_lean_request(request):
+            return None
+        return super().process_view(request, callback, callback_args, callback_kwargs)
+
+
+class AuthenticationMiddleware(LeanRouteMixin, auth.AuthenticationMiddleware):
+    """Session authentication, skipped for API requests."""
+
+
+class MessageMiddleware(LeanRouteMixin, messages.MessageMiddleware):
+    """Message storage, skipped for API requests."""
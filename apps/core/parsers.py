@@ -0,0 +1,55 @@
+"""
+Fast JSON and MessagePack parsing for the API.
+
+``FastJSONParser`` decodes UTF-8 request bodies with orjson when it is
+installed. Bodies orjson rejects are handed to DRF's ``JSONParser``, so
+valid JSON it cannot represent (integers over 64 bits) still parses and
+invalid JSON gets the usual "JSON parse error" response.
+
+``MessagePackParser`` accepts ``application/msgpack`` request bodies, with
+the compact values described in ``apps.core.fields``.
+"""
+
+import io
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser, get_encoding
+
+import msgpack
+
+from .renderers import FastJSONRenderer, MessagePackRenderer, orjson
+
+
+class FastJSONParser(JSONParser):
+    """JSONParser that decodes with orjson when it can."""
+
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        """Parse the JSON request body."""
+        encoding = get_encoding(parser_context or {})
+        if (
+            orjson is None
+            or not self.strict
+            or encoding.lower() not in ("utf-8", "utf8")
+        ):
+            return super().parse(stream, media_type, parser_context)
+        body = stream.read()
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            return super().parse(io.BytesIO(body), media_type, parser_context)
+
+
+class MessagePackParser(BaseParser):
+    """Parser for MessagePack request bodies."""
+
+    media_type = "application/msgpack"
+    renderer_class = MessagePackRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        """Parse the MessagePack request body."""
+        try:
+            return msgpack.unpackb(stream.read())
+        except (ValueError, msgpack.UnpackException) as exc:
+            raise ParseError(f"MessagePack parse error - {exc}")
@@ -0,0 +1,105 @@
+"""
+Fast JSON and MessagePack rendering for the API.
+
+``FastJSONRenderer`` encodes responses with orjson when it is installed
+and produces the same bytes as DRF's ``JSONRenderer``: compact separators,
+UTF-8 instead of ``\\u`` escapes, ``Z`` for UTC datetimes and escaped
+U+2028/U+2029. Decimals and the other types orjson does not know go
+through DRF's encoder. Pretty-printed output other than two-space indents,
+non-default ``UNICODE_JSON``/``COMPACT_JSON``/``STRICT_JSON`` settings and
+values orjson rejects (such as integers over 64 bits) fall back to
+``JSONRenderer``.
+
+Floats are the one known difference: orjson writes exponents as ``1e16``
+where the standard library writes ``1e+16``, and writes NaN and infinity
+as ``null`` instead of raising. The API has no float fields.
+
+``MessagePackRenderer`` encodes the same structures as MessagePack for
+clients that send ``Accept: application/msgpack`` (or ``?format=msgpack``).
+Serializers built with ``apps.core.fields`` switch to compact values for
+it: integer timestamps and choice positions.
+"""
+
+from datetime import datetime
+from datetime import timezone as dt_timezone
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+import msgpack
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised without orjson
+    orjson = None
+
+ORJSON_OPTIONS = (orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS) if orjson else 0
+LINE_SEPARATORS = ((b"\xe2\x80\xa8", b"\\u2028"), (b"\xe2\x80\xa9", b"\\u2029"))
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def epoch_milliseconds(value):
+    """Return the aware datetime ``value`` as milliseconds since the epoch."""
+    return (value - EPOCH) // datetime.resolution // 1000
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer that encodes with orjson when it can."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.default = JSONEncoder().default
+
+    def can_use_orjson(self, indent):
+        """Return whether orjson reproduces the configured output."""
+        return (
+            orjson is not None
+            and not self.ensure_ascii
+            and self.compact
+            and self.strict
+            and indent in (None, 2)
+        )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Render ``data`` into JSON bytes."""
+        if data is None:
+            return b""
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if not self.can_use_orjson(indent):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        option = ORJSON_OPTIONS | (orjson.OPT_INDENT_2 if indent else 0)
+        try:
+            ret = orjson.dumps(data, default=self.default, option=option)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        for raw, escaped in LINE_SEPARATORS:
+            if raw in ret:
+                ret = ret.replace(raw, escaped)
+        return ret
+
+
+class MessagePackRenderer(BaseRenderer):
+    """Renderer that encodes data as MessagePack."""
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+    # Tells apps.core.fields to use integer timestamps and choice positions.
+    compact_values = True
+
+    def __init__(self):
+        self.fallback = JSONEncoder().default
+
+    def default(self, obj):
+        """Return a MessagePack-serializable version of ``obj``."""
+        if isinstance(obj, datetime) and obj.tzinfo is not None:
+            return epoch_milliseconds(obj)
+        return self.fallback(obj)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Render ``data`` into MessagePack bytes."""
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=self.default)
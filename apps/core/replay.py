@@ -0,0 +1,297 @@
+"""
+Replay of captured traffic against a running instance.
+
+Reads logs written by ``apps.monitoring.traffic`` and sends the same mix
+of routes, query parameters and body sizes to a server, usually a local
+instance loaded with ``seed_todos``. Each user bucket of the log is
+mapped to one of the seeded users; URL arguments are filled with that
+user's to-do ids and request bodies are synthesized to the recorded size.
+Logins and token refreshes are captured without a bucket, since their
+views are anonymous; they are spread over the seeded users.
+"""
+
+import http.client
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from urllib.parse import urlencode, urlsplit
+
+from django.conf import settings
+from django.urls import reverse
+
+from .stats import summarize
+
+# Unsafe query parameters that still make sense with placeholder values.
+PLACEHOLDER_PARAMS = ("search",)
+
+# Requests that would change the replay's own state (or other users').
+SKIPPED = {
+    ("DELETE", "todos:todo-detail"),
+    ("POST", "users:logout"),
+    ("POST", "users:register"),
+    ("PUT", "users:profile"),
+    ("PATCH", "users:profile"),
+}
+
+# Anonymous views replayed on behalf of a seeded user.
+AUTH_VIEWS = ("users:login", "users:token-refresh")
+
+
+def load_log(path, limit=None):
+    """Return the entries of a capture log, oldest first."""
+    with open(path, encoding="utf-8") as log:
+        entries = [json.loads(line) for line in log if line.strip()]
+    entries.sort(key=lambda entry: entry["t"])
+    return entries[:limit] if limit else entries
+
+
+def route_name(entry):
+    """Return the report label of a log entry."""
+    return f"{entry['m']} {entry['v']}"
+
+
+@dataclass
+class UserState:
+    """Credentials and to-do ids of the user replaying one bucket."""
+
+    username: str
+    password: str
+    access: str = ""
+    refresh: str = ""
+    todo_ids: list = field(default_factory=list)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+@dataclass
+class Outcome:
+    """Result of one replayed request."""
+
+    route: str
+    status: int
+    latency: float
+    error: str = ""
+
+
+class Replayer:
+    """Replay log entries with a pool of worker threads."""
+
+    def __init__(self, base_url, users, workers=8, speedup=1.0, timeout=30.0):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port
+        self.secure = parts.scheme == "https"
+        self.prefix = parts.path.rstrip("/")
+        self.users = users
+        self.workers = workers
+        self.speedup = speedup
+        self.timeout = timeout
+        self.states = {}
+        self.local = threading.local()
+
+    def connection(self):
+        """Return this thread's keep-alive connection to the server."""
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            cls = (
+                http.client.HTTPSConnection
+                if self.secure
+                else http.client.HTTPConnection
+            )
+            conn = self.local.conn = cls(self.host, self.port, timeout=self.timeout)
+        return conn
+
+    def send(self, method, path, body=None, token=None):
+        """
+        Send one request and return (status, parsed JSON body or None).
+
+        The connection is reopened once if the server closed it.
+        """
+        headers = {"Accept": "application/json"}
+        payload = None
+        if body is not None:
+            payload = json.dumps(body)
+            headers["Content-Type"] = "application/json"
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        for attempt in range(2):
+            conn = self.connection()
+            try:
+                conn.request(method, self.prefix + path, payload, headers)
+                response = conn.getresponse()
+                data = response.read()
+                break
+            except (http.client.HTTPException, ConnectionError):
+                conn.close()
+                self.local.conn = None
+                if attempt:
+                    raise
+        try:
+            parsed = json.loads(data) if data else None
+        except ValueError:
+            parsed = None
+        return response.status, parsed
+
+    def bucket(self, entry):
+        """
+        Return the user bucket replaying ``entry``, or None if anonymous.
+
+        Logins and refreshes carry no bucket in the log; their timestamp
+        picks a seeded user, like it picks the to-do of a detail request.
+        """
+        if entry["u"] is None and entry["v"] in AUTH_VIEWS:
+            return int(entry["t"] * 1000) % len(self.users)
+        return entry["u"]
+
+    def state(self, bucket):
+        """Return the logged-in user state replaying ``bucket``."""
+        return self.states[bucket % len(self.users)]
+
+    def prepare(self, entries):
+        """Log in the users needed by ``entries`` and load their to-do ids."""
+        buckets = {self.bucket(entry) for entry in entries}
+        for bucket in buckets - {None}:
+            index = bucket % len(self.users)
+            if index in self.states:
+                continue
+            username, password = self.users[index]
+            state = UserState(username, password)
+            self.login(state)
+            status, data = self.send(
+                "GET", reverse("todos:todo-list"), token=state.access
+            )
+            if status == 200:
+                state.todo_ids = [item["id"] for item in data["results"]]
+            self.states[index] = state
+
+    def login(self, state):
+        """Obtain a fresh token pair for ``state``."""
+        status, data = self.send(
+            "POST",
+            reverse("users:login"),
+            {"username": state.username, "password": state.password},
+        )
+        if status != 200:
+            raise RuntimeError(f"Cannot log in as {state.username}: HTTP {status}")
+        state.access, state.refresh = data["access"], data["refresh"]
+
+    def todo_body(self, size):
+        """Return a to-do body of roughly ``size`` bytes."""
+        body = {"title": "Replayed to-do", "priority": "medium", "description": ""}
+        padding = size - len(json.dumps(body))
+        if padding > 0:
+            body["description"] = "x" * padding
+        return body
+
+    def build(self, entry, state):
+        """
+        Return (method, path, body, token) for ``entry``, or None to skip it.
+        """
+        method, view = entry["m"], entry["v"]
+        if (method, view) in SKIPPED:
+            return None
+        kwargs = {}
+        for name in entry["k"]:
+            if not state or not state.todo_ids:
+                return None
+            position = int(entry["t"] * 1000) % len(state.todo_ids)
+            kwargs[name] = state.todo_ids[position]
+        path = reverse(view, kwargs=kwargs)
+        keep = (*settings.TRAFFIC_CAPTURE_SAFE_PARAMS, *PLACEHOLDER_PARAMS)
+        params = {key: value for key, value in entry["q"].items() if key in keep}
+        if params:
+            path = f"{path}?{urlencode(params)}"
+
+        token = state.access if state else None
+        body = None
+        if view == "users:login":
+            if state is None:
+                return None
+            body, token = {"username": state.username, "password": state.password}, None
+        elif view == "users:token-refresh":
+            if state is None:
+                return None
+            body, token = {"refresh": state.refresh}, None
+        elif method in ("POST", "PUT", "PATCH") and view.startswith("todos:"):
+            if view in ("todos:todo-list", "todos:todo-detail"):
+                body = self.todo_body(entry["s"])
+        return method, path, body, token
+
+    def replay_one(self, entry):
+        """Replay a single entry and return its Outcome, or None if skipped."""
+        bucket = self.bucket(entry)
+        state = self.state(bucket) if bucket is not None else None
+        lock = state.lock if state and entry["v"] == "users:token-refresh" else None
+        if lock:
+            # Refresh tokens rotate, so refreshes of one user run in turn.
+            lock.acquire()
+        try:
+            request = self.build(entry, state)
+            if request is None:
+                return None
+            start = time.perf_counter()
+            try:
+                status, data = self.send(*request)
+            except Exception as exc:
+                return Outcome(
+                    route_name(entry), 0, time.perf_counter() - start, str(exc)
+                )
+            latency = time.perf_counter() - start
+            if status == 200 and entry["v"] in AUTH_VIEWS:
+                state.access = data.get("access", state.access)
+                state.refresh = data.get("refresh", state.refresh)
+            return Outcome(route_name(entry), status, latency)
+        finally:
+            if lock:
+                lock.release()
+
+    def run(self, entries):
+        """
+        Replay ``entries``, paced by their timestamps divided by ``speedup``.
+
+        A ``speedup`` of 0 sends requests as fast as the workers allow.
+
+        Returns:
+            Tuple of (outcomes, skipped count, elapsed seconds).
+        """
+        self.prepare(entries)
+        futures = []
+        start = time.perf_counter()
+        first = entries[0]["t"] if entries else 0
+        with ThreadPoolExecutor(self.workers) as pool:
+            for entry in entries:
+                if self.speedup > 0:
+                    delay = (
+                        start
+                        + (entry["t"] - first) / self.speedup
+                        - time.perf_counter()
+                    )
+                    if delay > 0:
+                        time.sleep(delay)
+                futures.append(pool.submit(self.replay_one, entry))
+        outcomes = [future.result() for future in futures]
+        elapsed = time.perf_counter() - start
+        done = [outcome for outcome in outcomes if outcome is not None]
+        return done, len(outcomes) - len(done), elapsed
+
+
+def report(outcomes):
+    """
+    Summarize outcomes per route.
+
+    Returns:
+        Dictionary mapping route to its request count, client and server
+        error counts, and latency percentiles.
+    """
+    routes = {}
+    for outcome in outcomes:
+        routes.setdefault(outcome.route, []).append(outcome)
+    summary = {}
+    for route, items in sorted(routes.items()):
+        summary[route] = {
+            **summarize([item.latency for item in items]),
+            "client_errors": sum(400 <= item.status < 500 for item in items),
+            "errors": sum(item.status >= 500 or item.status == 0 for item in items),
+        }
+    return summary
@@ -0,0 +1,131 @@
+"""
+Resource limits and per-process memory accounting.
+
+Used by ``config/gunicorn.py`` to size the worker pool and by the
+``worker_memory`` command to verify copy-on-write sharing. Everything
+reads ``/proc`` and the cgroup file system, so it is Linux only; the limit
+helpers fall back to the host's values elsewhere.
+
+RSS counts every page a process maps, including pages shared with the
+gunicorn master after ``fork``; USS (private pages) is what the process
+alone costs, and PSS splits shared pages evenly between their users.
+"""
+
+import math
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+# cgroup v1 reports "no limit" as a huge page-aligned number.
+UNLIMITED = 1 << 60
+
+
+def read_text(path):
+    """Return the stripped contents of ``path``, or None if unreadable."""
+    try:
+        return Path(path).read_text().strip()
+    except OSError:
+        return None
+
+
+def cpu_limit(root=CGROUP_ROOT):
+    """Return the number of CPUs this process may use, honouring quotas."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    quota = read_text(root / "cpu.max")
+    if quota:
+        limit, period = (quota.split() + ["100000"])[:2]
+    else:
+        limit = read_text(root / "cpu" / "cpu.cfs_quota_us")
+        period = read_text(root / "cpu" / "cpu.cfs_period_us")
+    if limit and period and limit not in ("max", "-1"):
+        cpus = min(cpus, max(1, math.ceil(int(limit) / int(period))))
+    return cpus
+
+
+def memory_limit(root=CGROUP_ROOT, meminfo="/proc/meminfo"):
+    """Return the memory available to this container in bytes."""
+    for path in (root / "memory.max", root / "memory" / "memory.limit_in_bytes"):
+        value = read_text(path)
+        if value and value != "max" and int(value) < UNLIMITED:
+            return int(value)
+    for line in (read_text(meminfo) or "").splitlines():
+        if line.startswith("MemAvailable:"):
+            return int(line.split()[1]) * 1024
+    return None
+
+
+def worker_count(cpus, memory, worker_memory):
+    """
+    Return the number of workers that fit the CPUs and memory.
+
+    ``2 * cpus + 1``, capped so that the workers plus the master each get
+    ``worker_memory`` bytes of ``memory`` (when known).
+    """
+    workers = 2 * cpus + 1
+    if memory:
+        workers = min(workers, memory // worker_memory - 1)
+    return max(1, workers)
+
+
+def write_queue_databases(databases):
+    """
+    Return the aliases of ``databases`` whose writes queue inside one process.
+
+    The write queue of ``apps.core.db.backends.sqlite3`` is a lock of the
+    process, so several workers would each have their own and SQLite would
+    fail their concurrent writes with "database is locked".
+    """
+    return [
+        alias
+        for alias, database in databases.items()
+        if database["ENGINE"] == "apps.core.db.backends.sqlite3"
+        and database.get("OPTIONS", {}).get("write_queue", True)
+    ]
+
+
+def thread_count(cpus, workers):
+    """Return the threads per worker needed for ``4 * cpus`` requests."""
+    return max(1, min(8, math.ceil(4 * cpus / workers)))
+
+
+@dataclass(frozen=True)
+class MemoryUsage:
+    """Memory of one process in bytes."""
+
+    pid: int
+    rss: int
+    pss: int
+    uss: int
+
+    @property
+    def shared(self):
+        """Return the resident bytes shared with other processes."""
+        return self.rss - self.uss
+
+
+def process_memory(pid="self", proc="/proc"):
+    """Return the MemoryUsage of ``pid`` from its ``smaps_rollup``."""
+    fields = {}
+    for line in Path(proc, str(pid), "smaps_rollup").read_text().splitlines()[1:]:
+        name, _, value = line.partition(":")
+        fields[name] = int(value.split()[0]) * 1024
+    return MemoryUsage(
+        pid=os.getpid() if pid == "self" else int(pid),
+        rss=fields.get("Rss", 0),
+        pss=fields.get("Pss", 0),
+        uss=fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0),
+    )
+
+
+def child_pids(pid, proc="/proc"):
+    """Return the ids of the direct children of ``pid``."""
+    children = []
+    for task in Path(proc, str(pid), "task").iterdir():
+        children += [
+            int(child) for child in (read_text(task / "children") or "").split()
+        ]
+    return sorted(children)
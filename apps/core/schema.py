@@ -0,0 +1,142 @@
+"""
+Precomputed OpenAPI schema.
+
+Generating the schema introspects every view and serializer, so it is done
+once per deploy instead of once per request: ``manage.py build_schema``
+renders the JSON and YAML documents together with their gzip and brotli
+variants into ``SCHEMA_CACHE_DIR`` at build time, and ``get_artifacts``
+loads them on first use. Without prebuilt files (and always when
+``DEBUG`` is on, so edits are never hidden behind a stale build) the
+schema is generated on the first request and kept in memory.
+
+drf-spectacular and brotli are only imported when the schema is built or
+compressed, so serving the API never loads them.
+"""
+
+import gzip
+import hashlib
+import threading
+from dataclasses import dataclass
+from functools import cached_property
+from pathlib import Path
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+# Format name mapped to (renderer class, content type).
+FORMATS = {
+    "json": (
+        "drf_spectacular.renderers.OpenApiJsonRenderer",
+        "application/vnd.oai.openapi+json",
+    ),
+    "yaml": (
+        "drf_spectacular.renderers.OpenApiYamlRenderer",
+        "application/vnd.oai.openapi",
+    ),
+}
+ENCODINGS = ("br", "gzip")
+
+_artifacts = None
+_artifacts_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class SchemaArtifact:
+    """One rendered schema document and its precompressed variants."""
+
+    format: str
+    body: bytes
+    br: bytes
+    gzip: bytes
+
+    @property
+    def content_type(self):
+        """Return the media type of the document."""
+        return FORMATS[self.format][1]
+
+    @cached_property
+    def etag(self):
+        """Return the strong ETag of the uncompressed document."""
+        return f'"{hashlib.sha256(self.body).hexdigest()[:32]}"'
+
+    def encoded(self, encoding):
+        """Return the body in ``encoding`` ("br", "gzip" or "identity")."""
+        return self.body if encoding == "identity" else getattr(self, encoding)
+
+
+def generate_schema():
+    """Return the OpenAPI schema of the public API as a dictionary."""
+    from drf_spectacular.settings import spectacular_settings
+
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS(
+        urlconf=spectacular_settings.SERVE_URLCONF
+    )
+    return generator.get_schema(request=None, public=True)
+
+
+def build_artifact(schema, fmt):
+    """Render ``schema`` in ``fmt`` and compress it."""
+    import brotli
+
+    renderer_class = import_string(FORMATS[fmt][0])
+    body = renderer_class().render(schema, renderer_context={})
+    return SchemaArtifact(
+        format=fmt,
+        body=body,
+        br=brotli.compress(body, quality=11),
+        gzip=gzip.compress(body, compresslevel=9, mtime=0),
+    )
+
+
+def build_artifacts():
+    """Generate the schema and return its artifacts keyed by format."""
+    schema = generate_schema()
+    return {fmt: build_artifact(schema, fmt) for fmt in FORMATS}
+
+
+def write_artifacts(artifacts, directory):
+    """Store ``artifacts`` as files in ``directory``."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    for artifact in artifacts.values():
+        path = directory / f"schema.{artifact.format}"
+        path.write_bytes(artifact.body)
+        for encoding, suffix in (("br", ".br"), ("gzip", ".gz")):
+            Path(f"{path}{suffix}").write_bytes(artifact.encoded(encoding))
+
+
+def read_artifacts(directory):
+    """Return the artifacts stored in ``directory``, or None if incomplete."""
+    artifacts = {}
+    for fmt in FORMATS:
+        path = Path(directory) / f"schema.{fmt}"
+        try:
+            artifacts[fmt] = SchemaArtifact(
+                format=fmt,
+                body=path.read_bytes(),
+                br=Path(f"{path}.br").read_bytes(),
+                gzip=Path(f"{path}.gz").read_bytes(),
+            )
+        except FileNotFoundError:
+            return None
+    return artifacts
+
+
+def get_artifacts():
+    """Return the schema artifacts, loading or generating them once."""
+    global _artifacts
+    if _artifacts is None:
+        with _artifacts_lock:
+            if _artifacts is None:
+                artifacts = None
+                if settings.SCHEMA_CACHE_DIR and not settings.DEBUG:
+                    artifacts = read_artifacts(settings.SCHEMA_CACHE_DIR)
+                _artifacts = artifacts or build_artifacts()
+    return _artifacts
+
+
+def clear_artifacts():
+    """Drop the in-memory artifacts, so the next request reloads them."""
+    global _artifacts
+    with _artifacts_lock:
+        _artifacts = None
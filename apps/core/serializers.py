@@ -0,0 +1,81 @@
+"""
+Serializers for the core app.
+
+This module contains the serializers of the request batching endpoint.
+"""
+
+from django.conf import settings
+
+from rest_framework import serializers
+
+METHODS = ("GET", "HEAD", "OPTIONS", "POST", "PUT", "PATCH", "DELETE")
+
+
+class SubRequestSerializer(serializers.Serializer):
+    """One API call of a batch."""
+
+    method = serializers.ChoiceField(choices=METHODS, default="GET")
+    path = serializers.RegexField(
+        r"^/api/",
+        max_length=2000,
+        error_messages={"invalid": "Only /api/ paths can be batched."},
+    )
+    body = serializers.JSONField(required=False, allow_null=True, default=None)
+
+    def to_internal_value(self, data):
+        """Accept methods in any case."""
+        if isinstance(data, dict) and isinstance(data.get("method"), str):
+            data = {**data, "method": data["method"].upper()}
+        return super().to_internal_value(data)
+
+
+class BatchRequestSerializer(serializers.Serializer):
+    """
+    A batch of API calls.
+
+    ``parallel`` runs consecutive read-only calls concurrently; ``atomic``
+    runs every call in one transaction that is rolled back when one fails.
+    """
+
+    requests = SubRequestSerializer(many=True, allow_empty=False)
+    parallel = serializers.BooleanField(default=False)
+    atomic = serializers.BooleanField(default=False)
+
+    def to_internal_value(self, data):
+        """Accept a bare array of calls as well."""
+        if isinstance(data, list):
+            data = {"requests": data}
+        return super().to_internal_value(data)
+
+    def validate_requests(self, value):
+        """Limit the number of calls per batch."""
+        if len(value) > settings.BATCH_MAX_REQUESTS:
+            raise serializers.ValidationError(
+                f"A batch holds at most {settings.BATCH_MAX_REQUESTS} requests."
+            )
+        return value
+
+    def validate(self, attrs):
+        """Reject parallel atomic batches."""
+        if attrs["parallel"] and attrs["atomic"]:
+            raise serializers.ValidationError(
+                "A batch cannot be both parallel and atomic."
+            )
+        return attrs
+
+
+class SubResponseSerializer(serializers.Serializer):
+    """The response to one call of a batch."""
+
+    status = serializers.IntegerField()
+    headers = serializers.DictField(child=serializers.CharField())
+    body = serializers.JSONField(allow_null=True)
+
+
+class BatchResponseSerializer(serializers.Serializer):
+    """The responses to a batch, in request order."""
+
+    responses = SubResponseSerializer(many=True)
+    committed = serializers.BooleanField(
+        help_text="False when an atomic batch was rolled back."
+    )
@@ -0,0 +1,178 @@
+"""
+Sparse fieldsets for API views.
+
+Clients pick the fields of a representation with ``?fields=id,title`` or
+drop some with ``?omit=description``. ``SparseFieldsetViewMixin`` passes
+the selection to serializers built with ``SparseFieldsetSerializerMixin``
+and loads only the columns those fields read, through ``QuerySet.only()``,
+so large text columns the client does not render are neither fetched nor
+sent.
+
+Unknown field names are rejected with a 400 response.
+"""
+
+from functools import cache, cached_property, lru_cache
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+
+from rest_framework.exceptions import ValidationError
+
+# Query parameters, also the keyword arguments of the serializers.
+PARAMS = ("fields", "omit")
+
+# Fieldsets whose column projection is cached per process.
+PROJECTION_CACHE_SIZE = 256
+
+
+def parse_names(value):
+    """Return the comma-separated field names of a query parameter."""
+    return tuple(name.strip() for name in value.split(",") if name.strip())
+
+
+def normalize_names(names):
+    """Return ``names`` sorted and without repeats, the cache key of a fieldset."""
+    return tuple(sorted(set(names)))
+
+
+@cache
+def field_names(serializer_class):
+    """Return the names of every field of ``serializer_class``."""
+    return frozenset(serializer_class().fields)
+
+
+def projection(serializer, model):
+    """
+    Return the ``only()`` names covering the fields of ``serializer``.
+
+    Returns None when a field reads something other than model fields
+    (the whole instance, a property or a method), so every column must be
+    loaded.
+    """
+    names = set()
+    for field in serializer.fields.values():
+        if field.source == "*":
+            return None
+        related = model
+        for attr in field.source_attrs:
+            try:
+                model_field = related._meta.get_field(attr)
+            except (AttributeError, FieldDoesNotExist):
+                return None
+            if not model_field.concrete:
+                return None
+            related = model_field.related_model
+        names.add("__".join(field.source_attrs))
+    return names
+
+
+@lru_cache(maxsize=PROJECTION_CACHE_SIZE)
+def serializer_projection(serializer_class, model, fields=None, omit=None):
+    """
+    Return the cached ``projection`` of a fieldset of ``serializer_class``.
+
+    Pass names through ``normalize_names`` so equivalent fieldsets share
+    one entry.
+    """
+    names = projection(serializer_class(fields=fields, omit=omit), model)
+    return None if names is None else frozenset(names)
+
+
+def project_queryset(queryset, names, required=()):
+    """
+    Return ``queryset`` loading only the ``names`` columns.
+
+    ``required`` lists model fields loaded regardless, such as those the
+    pagination or permissions read. Relations are joined with
+    ``select_related`` only when one of their fields is kept.
+    """
+    if names is None:
+        return queryset
+    names = {*names, *required, queryset.model._meta.pk.name}
+    queryset = queryset.select_related(None).only(*names)
+    related = {name.rsplit("__", 1)[0] for name in names if "__" in name}
+    # Without arguments, select_related() would follow every foreign key.
+    return queryset.select_related(*related) if related else queryset
+
+
+class SparseFieldsetSerializerMixin:
+    """Serializer that keeps only the ``fields`` or drops the ``omit`` fields."""
+
+    def __init__(self, *args, fields=None, omit=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.only_fields = fields
+        self.omit_fields = omit or ()
+
+    def get_fields(self):
+        """Return the selected fields."""
+        return {
+            name: field
+            for name, field in super().get_fields().items()
+            if (self.only_fields is None or name in self.only_fields)
+            and name not in self.omit_fields
+        }
+
+
+class SparseFieldsetViewMixin:
+    """
+    Apply ``?fields=``/``?omit=`` to the serializer and queryset of a viewset.
+
+    Only ``sparse_actions`` are affected. ``sparse_required_fields`` maps
+    actions to model fields that are always loaded. When a request to one
+    of ``sparse_default_omit_actions`` passes neither parameter, the fields
+    named by the ``sparse_default_omit_setting`` setting are omitted.
+    """
+
+    sparse_actions = ("list", "retrieve")
+    sparse_required_fields = {}
+    sparse_default_omit_actions = ("list",)
+    sparse_default_omit_setting = None
+
+    @cached_property
+    def fieldset(self):
+        """Return the ``fields``/``omit`` serializer arguments of the request."""
+        if self.action not in self.sparse_actions:
+            return {}
+        params = self.request.query_params
+        if not any(param in params for param in PARAMS):
+            return self.default_fieldset()
+
+        known = field_names(self.get_serializer_class())
+        fieldset, errors = {}, {}
+        for param in PARAMS:
+            names = parse_names(params.get(param, ""))
+            unknown = [name for name in names if name not in known]
+            if unknown:
+                errors[param] = [f"Unknown field: {name}." for name in unknown]
+            if names:
+                fieldset[param] = normalize_names(names)
+        if errors:
+            raise ValidationError(errors)
+        return fieldset
+
+    def default_fieldset(self):
+        """Return the serializer arguments of requests selecting no fields."""
+        if (
+            self.sparse_default_omit_setting is None
+            or self.action not in self.sparse_default_omit_actions
+        ):
+            return {}
+        omit = normalize_names(getattr(settings, self.sparse_default_omit_setting))
+        return {"omit": omit} if omit else {}
+
+    def get_serializer(self, *args, **kwargs):
+        """Return a serializer limited to the requested fields."""
+        return super().get_serializer(*args, **{**self.fieldset, **kwargs})
+
+    def project(self, queryset, serializer_class=None):
+        """Return ``queryset`` loading only the columns of the requested fields."""
+        if not self.fieldset:
+            return queryset
+        names = serializer_projection(
+            serializer_class or self.get_serializer_class(),
+            queryset.model,
+            **self.fieldset,
+        )
+        return project_queryset(
+            queryset, names, self.sparse_required_fields.get(self.action, ())
+        )
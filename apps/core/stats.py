@@ -0,0 +1,35 @@
+"""
+Statistics helpers shared by the benchmark and load-testing commands.
+"""
+
+import math
+
+
+def percentile(values, pct):
+    """
+    Return the ``pct`` percentile of ``values`` (nearest-rank method).
+
+    Returns 0.0 for an empty sequence.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(latencies):
+    """
+    Summarize a list of latencies given in seconds.
+
+    Returns:
+        Dictionary with count, mean and p50/p95/p99 in milliseconds.
+    """
+    count = len(latencies)
+    return {
+        "count": count,
+        "mean_ms": round(sum(latencies) / count * 1000, 3) if count else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+    }
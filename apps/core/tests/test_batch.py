@@ -0,0 +1,289 @@
+"""
+Tests for the request batching endpoint.
+
+This module contains tests for /api/batch/ and the in-process dispatch of
+its calls.
+"""
+
+import threading
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+import msgpack
+import pytest
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.core import batch
+from apps.todos.models import Todo
+
+User = get_user_model()
+
+URL = "/api/batch/"
+
+
+@pytest.fixture
+def user(db):
+    """Create and return a user."""
+    return User.objects.create_user(username="batcher", email="batcher@example.com")
+
+
+@pytest.fixture
+def api_client(user):
+    """Return an API client authenticated with a JWT."""
+    client = APIClient()
+    refresh = RefreshToken.for_user(user)
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+    return client
+
+
+@pytest.fixture
+def todo(user):
+    """Create and return an open to-do."""
+    return Todo.objects.create(user=user, title="Existing")
+
+
+def statuses(response):
+    """Return the status codes of the calls of a batch response."""
+    return [item["status"] for item in response.data["responses"]]
+
+
+@pytest.mark.django_db
+class TestBatchView:
+    """Tests for BatchView."""
+
+    def test_mixed_calls(self, api_client, todo):
+        """Test that reads and writes run in order with their responses."""
+        response = api_client.post(
+            URL,
+            {
+                "requests": [
+                    {"method": "get", "path": "/api/auth/profile/"},
+                    {"method": "POST", "path": "/api/todos/", "body": {"title": "New"}},
+                    {
+                        "path": f"/api/todos/{todo.pk}/toggle-complete/",
+                        "method": "POST",
+                    },
+                    {"path": "/api/todos/?completed=true&fields=title"},
+                ]
+            },
+            format="json",
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert statuses(response) == [200, 201, 200, 200]
+        profile, created, toggled, completed = response.data["responses"]
+        assert profile["body"]["username"] == "batcher"
+        assert created["body"]["title"] == "New"
+        assert toggled["body"]["completed"] is True
+        assert completed["body"]["results"] == [{"title": "Existing"}]
+        assert response.data["committed"] is True
+
+    def test_bare_array(self, api_client):
+        """Test that a bare array of calls is accepted."""
+        response = api_client.post(
+            URL, [{"method": "GET", "path": "/api/todos/"}], format="json"
+        )
+        assert statuses(response) == [200]
+
+    def test_authenticates_once(self, api_client, monkeypatch):
+        """Test that the calls reuse the authentication of the batch."""
+        calls = []
+        authenticate = JWTAuthentication.authenticate
+
+        def counting(self, request):
+            calls.append(request)
+            return authenticate(self, request)
+
+        monkeypatch.setattr(JWTAuthentication, "authenticate", counting)
+        response = api_client.post(
+            URL,
+            [{"path": "/api/todos/"}, {"path": "/api/auth/profile/"}],
+            format="json",
+        )
+        assert statuses(response) == [200, 200]
+        assert len(calls) == 1
+
+    def test_error_entries(self, api_client):
+        """Test that failing calls are reported without failing the batch."""
+        response = api_client.post(
+            URL,
+            [
+                {"path": "/api/missing/"},
+                {"path": "/api/todos/999/"},
+                {"path": URL, "method": "POST", "body": []},
+                {"path": "/api/todos/", "method": "POST", "body": {"title": " "}},
+            ],
+            format="json",
+        )
+        assert statuses(response) == [404, 404, 400, 400]
+        assert "title" in response.data["responses"][3]["body"]
+
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            [],
+            [{"path": "/admin/"}],
+            [{"path": "/api/todos/", "method": "TRACE"}],
+            {"requests": [{"path": "/api/todos/"}], "parallel": True, "atomic": True},
+            [{"path": "/api/todos/"}] * 21,
+        ],
+    )
+    def test_invalid_batches(self, api_client, payload):
+        """Test that malformed batches are rejected as a whole."""
+        response = api_client.post(URL, payload, format="json")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_requires_authentication(self):
+        """Test that anonymous batches are rejected."""
+        response = APIClient().post(URL, [{"path": "/api/todos/"}], format="json")
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_atomic_rollback(self, api_client):
+        """Test that a failing call rolls back an atomic batch."""
+        response = api_client.post(
+            URL,
+            {
+                "atomic": True,
+                "requests": [
+                    {"method": "POST", "path": "/api/todos/", "body": {"title": "A"}},
+                    {"method": "POST", "path": "/api/todos/", "body": {"title": ""}},
+                    {"method": "POST", "path": "/api/todos/", "body": {"title": "C"}},
+                ],
+            },
+            format="json",
+        )
+        assert statuses(response) == [201, 400, 424]
+        assert response.data["committed"] is False
+        assert not Todo.objects.exists()
+
+    def test_atomic_commit(self, api_client):
+        """Test that a successful atomic batch commits every write."""
+        response = api_client.post(
+            URL,
+            {
+                "atomic": True,
+                "requests": [
+                    {"method": "POST", "path": "/api/todos/", "body": {"title": "A"}},
+                    {"method": "POST", "path": "/api/todos/", "body": {"title": "B"}},
+                ],
+            },
+            format="json",
+        )
+        assert response.data["committed"] is True
+        assert Todo.objects.count() == 2
+
+    def test_negotiated_format(self, api_client, todo):
+        """Test that every view answers and compact values follow the batch."""
+        response = api_client.post(
+            URL,
+            [
+                {"path": f"/api/todos/{todo.pk}/"},
+                # A view without a MessagePack renderer.
+                {"path": "/api/auth/logout/", "method": "POST", "body": {}},
+            ],
+            format="json",
+            HTTP_ACCEPT="application/msgpack",
+        )
+        todo_entry, logout_entry = msgpack.unpackb(response.content)["responses"]
+        assert isinstance(todo_entry["body"]["created_at"], int)
+        assert logout_entry["status"] == status.HTTP_400_BAD_REQUEST
+
+    def test_compact_round_trip(self, api_client, todo):
+        """Test that compact values read in a batch can be written back."""
+        detail = f"/api/todos/{todo.pk}/"
+        headers = {"HTTP_ACCEPT": "application/msgpack"}
+        read = api_client.post(
+            URL,
+            msgpack.packb([{"path": detail}]),
+            content_type="application/msgpack",
+            **headers,
+        )
+        (entry,) = msgpack.unpackb(read.content)["responses"]
+        body = {key: entry["body"][key] for key in ("priority", "due_date")}
+        body["due_date"] = entry["body"]["created_at"]
+
+        written = api_client.post(
+            URL,
+            msgpack.packb([{"method": "PATCH", "path": detail, "body": body}]),
+            content_type="application/msgpack",
+            **headers,
+        )
+        (entry,) = msgpack.unpackb(written.content)["responses"]
+        assert entry["status"] == status.HTTP_200_OK, entry
+        assert entry["body"]["priority"] == body["priority"]
+        assert entry["body"]["due_date"] == body["due_date"]
+
+
+@pytest.mark.django_db(transaction=True)
+class TestParallelBatch:
+    """Tests for parallel batches."""
+
+    def test_reads_run_concurrently_between_writes(self, api_client, todo, monkeypatch):
+        """Test that consecutive reads use threads while writes stay ordered."""
+        threaded = []
+        dispatch_in_thread = batch.dispatch_in_thread
+
+        def recording(outer, call):
+            threaded.append(call["path"])
+            return dispatch_in_thread(outer, call)
+
+        monkeypatch.setattr(batch, "dispatch_in_thread", recording)
+        count = "/api/todos/?fields=id"
+        response = api_client.post(
+            URL,
+            {
+                "parallel": True,
+                "requests": [
+                    {"path": count},
+                    {"path": "/api/auth/profile/"},
+                    {"method": "POST", "path": "/api/todos/", "body": {"title": "B"}},
+                    {"path": count},
+                    {"path": reverse("todos:todo-detail", kwargs={"pk": todo.pk})},
+                ],
+            },
+            format="json",
+        )
+        assert statuses(response) == [200, 200, 201, 200, 200]
+        entries = response.data["responses"]
+        assert entries[0]["body"]["count"] == 1
+        assert entries[3]["body"]["count"] == 2
+        assert entries[4]["body"]["title"] == "Existing"
+        assert sorted(threaded) == sorted(
+            [count, "/api/auth/profile/", count, f"/api/todos/{todo.pk}/"]
+        )
+
+    def test_pool_threads_reused(self, api_client, todo, monkeypatch, settings):
+        """Test that batches share the bounded pool instead of new threads."""
+        threads = set()
+        dispatch_in_thread = batch.dispatch_in_thread
+
+        def recording(outer, call):
+            threads.add(threading.current_thread().name)
+            return dispatch_in_thread(outer, call)
+
+        monkeypatch.setattr(batch, "dispatch_in_thread", recording)
+        payload = {"parallel": True, "requests": [{"path": "/api/todos/"}] * 6}
+        for _ in range(3):
+            assert statuses(api_client.post(URL, payload, format="json")) == [200] * 6
+        assert all(name.startswith("batch") for name in threads)
+        assert len(threads) <= batch.get_executor()._max_workers
+
+    def test_threaded_queries_observed(self, api_client, todo):
+        """Test that the queries of pool threads reach Server-Timing."""
+        calls = [{"path": "/api/todos/"}, {"path": f"/api/todos/{todo.pk}/"}]
+        counts = {}
+        for parallel in (False, True):
+            response = api_client.post(
+                URL, {"parallel": parallel, "requests": calls}, format="json"
+            )
+            (db,) = [
+                metric
+                for metric in response["Server-Timing"].split(", ")
+                if metric.startswith("db;")
+            ]
+            counts[parallel] = db.split('desc="')[1]
+        assert counts[True] == counts[False]
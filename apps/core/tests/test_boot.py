@@ -0,0 +1,103 @@
+"""
+Tests for the boot command.
+
+This module contains tests for the container start-up phases.
+"""
+
+import json
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import OperationalError, connection
+
+import pytest
+
+from apps.core.management.commands import boot
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Record the commands run by boot instead of running them."""
+    recorded = []
+    monkeypatch.setattr(
+        boot, "call_command", lambda name, **kwargs: recorded.append(name)
+    )
+    return recorded
+
+
+@pytest.fixture
+def static_root(settings, tmp_path):
+    """Use an empty static root with a manifest storage."""
+    settings.STATIC_ROOT = str(tmp_path / "static")
+    return tmp_path / "static"
+
+
+def run_boot(*args):
+    """Run the boot command and return its timing report."""
+    out = StringIO()
+    call_command("boot", *args, stdout=out)
+    line = out.getvalue().splitlines()[-1]
+    return json.loads(line.removeprefix("boot timings: "))
+
+
+@pytest.mark.django_db
+class TestBoot:
+    """Tests for the boot command."""
+
+    def test_skips_work_when_current(self, calls, static_root, settings):
+        """Test that a migrated database and built assets are reused."""
+        static_root.mkdir()
+        (static_root / "staticfiles.json").write_text(
+            json.dumps({"version": "1.1", "paths": {}, "hash": ""})
+        )
+        settings.DEBUG = True
+        timings = run_boot()
+        assert calls == []
+        assert timings["migrate"]["result"].startswith("up to date")
+        assert timings["static"]["result"] == "reused manifest"
+        assert timings["schema"]["result"] == "skipped"
+        assert set(timings) == {"database", "migrate", "static", "schema", "total"}
+
+    def test_runs_missing_steps(self, calls, static_root, settings, monkeypatch):
+        """Test that pending migrations and missing assets are handled."""
+        monkeypatch.setattr(boot, "migration_state", lambda connection: ("a", "b"))
+        settings.DEBUG = False
+        settings.SCHEMA_CACHE_DIR = str(static_root / "openapi")
+        timings = run_boot()
+        assert calls == ["migrate", "collectstatic", "build_schema"]
+        assert timings["migrate"]["result"] == "migrated"
+
+    def test_waits_for_database(self, calls, static_root, monkeypatch):
+        """Test that connection errors are retried with backoff."""
+        attempts, sleeps = [], []
+        connect = connection.ensure_connection
+
+        def flaky_connect():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise OperationalError("connection refused")
+            connect()
+
+        monkeypatch.setattr(connection, "ensure_connection", flaky_connect)
+        monkeypatch.setattr(boot.time, "sleep", sleeps.append)
+        timings = run_boot()
+        assert timings["database"]["result"] == "connected after 3 attempt(s)"
+        assert sleeps == [0.05, 0.1]
+
+    def test_gives_up_after_timeout(self, monkeypatch):
+        """Test that an unreachable database fails the boot."""
+
+        def refuse():
+            raise OperationalError("connection refused")
+
+        monkeypatch.setattr(connection, "ensure_connection", refuse)
+        monkeypatch.setattr(boot.time, "sleep", lambda delay: None)
+        with pytest.raises(Exception, match="Database unavailable"):
+            call_command("boot", "--db-timeout", "0", stdout=StringIO())
+
+    def test_execs_command(self, calls, static_root, monkeypatch):
+        """Test that the arguments after -- replace the process."""
+        executed = []
+        monkeypatch.setattr(boot.os, "execvp", lambda *args: executed.append(args))
+        run_boot("--", "gunicorn", "--bind", "0.0.0.0:8000")
+        assert executed == [("gunicorn", ["gunicorn", "--bind", "0.0.0.0:8000"])]
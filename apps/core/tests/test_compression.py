@@ -0,0 +1,211 @@
+"""
+Tests for negotiated response compression.
+
+This module contains tests for the Accept-Encoding negotiation and the
+CompressionMiddleware in apps.core.
+"""
+
+import gzip
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.http import HttpResponse, JsonResponse
+from django.test import Client
+from django.urls import path
+
+from rest_framework.test import APIClient
+
+import brotli
+import pytest
+
+from apps.core import compression
+from apps.monitoring.metrics import COMPRESSION_SAVED_BYTES
+from apps.todos.models import Todo
+
+User = get_user_model()
+
+calls = []
+
+
+def repetitive(request):
+    """Return a compressible JSON response and count the call."""
+    calls.append(request)
+    return JsonResponse({"items": ["the same text over and over"] * 100})
+
+
+def small(request):
+    """Return a response below the size threshold."""
+    return HttpResponse(b'{"ok": true}', content_type="application/json")
+
+
+def page(request):
+    """Return a large HTML page."""
+    return HttpResponse("<p>the same text over and over</p>" * 100)
+
+
+def image(request):
+    """Return a large response of a type that is not compressed."""
+    return HttpResponse(b"\x89PNG" * 1000, content_type="image/png")
+
+
+# URL configuration of the middleware tests.
+urlpatterns = [
+    path("repetitive/", repetitive),
+    path("small/", small),
+    path("page/", page),
+    path("image/", image),
+]
+
+CACHED_MIDDLEWARE = [
+    "django.middleware.cache.UpdateCacheMiddleware",
+    "apps.core.compression.CompressionMiddleware",
+    "django.middleware.cache.FetchFromCacheMiddleware",
+]
+
+
+@pytest.fixture
+def local_urls(settings):
+    """Route requests to the views of this module."""
+    settings.ROOT_URLCONF = __name__
+    calls.clear()
+
+
+@pytest.fixture
+def api_client(db):
+    """Return an API client for a user with long to-do descriptions."""
+    user = User.objects.create_user(username="compress", password="testpass123")
+    Todo.objects.bulk_create(
+        Todo(user=user, title=f"Todo {i}", description="Pick up the laundry. " * 20)
+        for i in range(20)
+    )
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+class TestNegotiation:
+    """Tests for the Accept-Encoding negotiation."""
+
+    @pytest.mark.parametrize(
+        "header, expected",
+        [
+            ("gzip, br", "br"),
+            ("gzip;q=1.0, br;q=0.5", "gzip"),
+            ("br;q=0, gzip", "gzip"),
+            ("*", "br"),
+            ("*;q=0.1, br;q=0", "gzip"),
+            ("deflate", "identity"),
+            ("GZIP;Q=0.8", "gzip"),
+            ("gzip;q=bogus", "identity"),
+            ("", "identity"),
+        ],
+    )
+    def test_negotiate(self, header, expected):
+        """Test that q-values win and server order breaks ties."""
+        assert compression.negotiate_encoding(header, ("br", "gzip")) == expected
+
+    def test_uninstalled_codecs_skipped(self, settings, monkeypatch):
+        """Test that codings without an installed codec are not offered."""
+        settings.COMPRESSION_ENCODINGS = ("zstd", "br", "gzip", "deflate")
+        monkeypatch.setattr(
+            compression, "is_installed", lambda module: module != "zstandard"
+        )
+        assert compression.available_encodings() == ("br", "gzip")
+
+
+@pytest.mark.django_db
+class TestCompressionMiddleware:
+    """Tests for CompressionMiddleware."""
+
+    @pytest.mark.parametrize(
+        "header, encoding, decompress",
+        [
+            ("gzip, deflate, br", "br", brotli.decompress),
+            ("gzip", "gzip", gzip.decompress),
+        ],
+    )
+    def test_api_response_compressed(self, api_client, header, encoding, decompress):
+        """Test that API pages are compressed and decode to the same JSON."""
+        plain = api_client.get("/api/todos/")
+        response = api_client.get("/api/todos/", HTTP_ACCEPT_ENCODING=header)
+        assert response["Content-Encoding"] == encoding
+        assert "Accept-Encoding" in response["Vary"]
+        assert int(response["Content-Length"]) == len(response.content)
+        assert len(response.content) < len(plain.content) / 5
+        assert decompress(response.content) == plain.content
+
+    def test_saved_bytes_metric(self, api_client):
+        """Test that the bytes saved are counted per view and coding."""
+        labels = {"view": "TodoViewSet.list", "encoding": "gzip"}
+        key = COMPRESSION_SAVED_BYTES.key(labels)
+        before = COMPRESSION_SAVED_BYTES.values.get(key, 0)
+        plain = api_client.get("/api/todos/")
+        response = api_client.get("/api/todos/", HTTP_ACCEPT_ENCODING="gzip")
+        saved = COMPRESSION_SAVED_BYTES.values[key] - before
+        assert saved == len(plain.content) - len(response.content)
+
+    def test_identity_still_varies(self, local_urls):
+        """Test that uncompressed but compressible responses vary."""
+        response = Client().get("/repetitive/", HTTP_ACCEPT_ENCODING="identity")
+        assert not response.has_header("Content-Encoding")
+        assert response["Vary"] == "Accept-Encoding"
+
+    @pytest.mark.parametrize("url", ["/small/", "/page/", "/image/"])
+    def test_skipped_responses(self, local_urls, url):
+        """Test that small and non-API responses are left alone."""
+        response = Client().get(url, HTTP_ACCEPT_ENCODING="br")
+        assert not response.has_header("Content-Encoding")
+        assert not response.has_header("Vary")
+
+    def test_admin_html_uncompressed(self, settings):
+        """Test that HTML pages carrying a CSRF token are not compressed."""
+        settings.STORAGES = {
+            **settings.STORAGES,
+            "staticfiles": {
+                "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+            },
+        }
+        response = Client().get("/admin/login/", HTTP_ACCEPT_ENCODING="gzip, br")
+        assert response.status_code == 200
+        assert b"csrfmiddlewaretoken" in response.content
+        assert not response.has_header("Content-Encoding")
+
+    def test_min_size(self, local_urls, settings):
+        """Test the size threshold and that bodies never grow."""
+        settings.COMPRESSION_MIN_SIZE = 1
+        response = Client().get("/small/", HTTP_ACCEPT_ENCODING="gzip")
+        assert not response.has_header("Content-Encoding")
+        settings.COMPRESSION_MIN_SIZE = 100_000
+        response = Client().get("/repetitive/", HTTP_ACCEPT_ENCODING="gzip")
+        assert not response.has_header("Content-Encoding")
+
+    def test_weakens_etag(self, local_urls, settings):
+        """Test that a strong ETag becomes weak on compressed responses."""
+        settings.MIDDLEWARE = [
+            "apps.core.compression.CompressionMiddleware",
+            "django.middleware.http.ConditionalGetMiddleware",
+        ]
+        response = Client().get("/repetitive/", HTTP_ACCEPT_ENCODING="br")
+        assert response["ETag"].startswith('W/"')
+
+    def test_cache_stores_compressed(self, local_urls, settings):
+        """Test that a response cache stores one compressed body per coding."""
+        settings.MIDDLEWARE = CACHED_MIDDLEWARE
+        cache.clear()
+        client = Client()
+        first = client.get("/repetitive/", HTTP_ACCEPT_ENCODING="br")
+        cached = client.get("/repetitive/", HTTP_ACCEPT_ENCODING="br")
+        assert len(calls) == 1
+        assert cached["Content-Encoding"] == "br"
+        assert cached.content == first.content
+        other = client.get("/repetitive/", HTTP_ACCEPT_ENCODING="gzip")
+        assert len(calls) == 2
+        assert json.loads(gzip.decompress(other.content))["items"]
+        cache.clear()
+
+    def test_disabled(self, local_urls, settings):
+        """Test that RESPONSE_COMPRESSION turns the middleware off."""
+        settings.RESPONSE_COMPRESSION = False
+        response = Client().get("/repetitive/", HTTP_ACCEPT_ENCODING="br")
+        assert not response.has_header("Content-Encoding")
@@ -0,0 +1,137 @@
+"""
+Tests for the worker warm-up and health endpoints.
+
+This module contains tests for apps.core.health.
+"""
+
+import gc
+import importlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+from django.db import OperationalError, connection
+
+import pytest
+
+from apps.core import health
+
+
+@pytest.fixture(autouse=True)
+def cold_process():
+    """Start every test with a process that has not warmed up."""
+    health.reset()
+    yield
+    health.reset()
+
+
+class TestWarmUp:
+    """Tests for warm_up."""
+
+    def test_routes(self):
+        """Test that every URL pattern is visited."""
+        assert health.warm_routes() > 10
+
+    def test_without_database(self):
+        """Test that the master warm-up does not mark the process ready."""
+        timings = health.warm_up(database=False)
+        assert set(timings) == {"routes", "serializers"}
+        assert not health.is_warm()
+
+    @pytest.mark.django_db
+    def test_full(self):
+        """Test that a full warm-up opens the connection and marks ready."""
+        timings = health.warm_up()
+        assert set(timings) == {"routes", "serializers", "database"}
+        assert health.is_warm()
+
+
+class TestHealthEndpoints:
+    """Tests for HealthCheckMiddleware."""
+
+    def test_liveness(self, client):
+        """Test that liveness needs neither warm-up nor a valid host."""
+        response = client.get("/healthz", HTTP_HOST="10.0.0.7")
+        assert response.status_code == 200
+        assert response.json() == {"status": "alive"}
+
+    @pytest.mark.django_db
+    def test_readiness_warms_up(self, client):
+        """Test that the first readiness probe warms up the process."""
+        response = client.get("/readyz/")
+        assert response.status_code == 200
+        assert response.json()["status"] == "ready"
+        assert set(response.json()["warmup_ms"]) == {
+            "routes",
+            "serializers",
+            "database",
+        }
+        assert response["Cache-Control"] == "no-store"
+
+    @pytest.mark.django_db
+    def test_not_ready_without_database(self, client, monkeypatch):
+        """Test that readiness fails while the database is unreachable."""
+        health.warm_up()
+
+        def refuse(*args, **kwargs):
+            raise OperationalError("connection refused for user admin at db.internal")
+
+        monkeypatch.setattr(connection, "cursor", refuse)
+        response = client.get("/readyz")
+        assert response.status_code == 503
+        assert response.json() == {"status": "database unavailable"}
+
+    def test_not_ready_while_warming(self, client, monkeypatch):
+        """Test that a failed warm-up keeps the process out of rotation."""
+
+        def refuse():
+            raise OperationalError("connection refused")
+
+        monkeypatch.setattr(health, "check_databases", refuse)
+        response = client.get("/readyz")
+        assert response.status_code == 503
+        assert response.json() == {"status": "warming"}
+
+
+class TestGunicornHook:
+    """Tests for the post_worker_init hook of config/gunicorn.py."""
+
+    @pytest.fixture
+    def hooks(self):
+        """Import the gunicorn configuration, restoring the collector after."""
+        enabled = gc.isenabled()
+        try:
+            yield importlib.import_module("config.gunicorn")
+        finally:
+            if enabled:
+                gc.enable()
+
+    def test_warms_every_pool_thread(self, hooks, monkeypatch):
+        """Test that a threaded worker connects each thread of its pool."""
+        threads = []
+        monkeypatch.setattr(
+            health, "check_databases", lambda: threads.append(threading.get_ident())
+        )
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            worker = SimpleNamespace(
+                pid=1, log=Mock(), tpool=pool, cfg=SimpleNamespace(threads=3)
+            )
+            hooks.post_worker_init(worker)
+        # The worker's own thread, then each of the three pool threads.
+        assert len(threads) == 4
+        assert len(set(threads[1:])) == 3
+        assert threading.get_ident() not in threads[1:]
+        assert "pool" in worker.log.info.call_args.args[-1]
+
+    def test_boots_unready_without_database(self, hooks, monkeypatch):
+        """Test that a database outage does not fail the worker boot."""
+
+        def refuse():
+            raise OperationalError("connection refused")
+
+        monkeypatch.setattr(health, "check_databases", refuse)
+        worker = SimpleNamespace(pid=1, log=Mock())
+        hooks.post_worker_init(worker)
+        worker.log.exception.assert_called_once()
+        assert not health.is_warm()
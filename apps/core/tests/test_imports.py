@@ -0,0 +1,83 @@
+"""
+Tests for the import-time report and budget.
+
+This module contains tests for apps.core.imports and the import-time
+budget of the WSGI application.
+"""
+
+import os
+
+from django.conf import settings
+
+import pytest
+
+from apps.core.imports import by_package, measure_imports, parse_importtime, total_us
+
+# Generous enough for slow CI machines; regressions that matter show up as
+# one of the deferred modules below being imported again.
+IMPORT_BUDGET_MS = float(os.getenv("IMPORT_BUDGET_MS", "1500"))
+
+# Modules the web process must only import on first use.
+DEFERRED_MODULES = (
+    "dotenv",
+    "brotli",
+    "drf_spectacular.views",
+    "drf_spectacular.generators",
+    "rest_framework.serializers",
+    "apps.users.admin",
+    "apps.todos.admin",
+)
+
+SAMPLE = """\
+import time: self [us] | cumulative | imported package
+import time:       100 |        100 |     encodings.aliases
+import time:       200 |        300 |   encodings
+import time:        50 |         50 |   encodings.utf_8
+import time:      1000 |       1350 | config.wsgi
+"""
+
+
+class TestParse:
+    """Tests for the -X importtime parser."""
+
+    def test_parse(self):
+        """Test that modules, times and nesting are read."""
+        timings = parse_importtime(SAMPLE)
+        assert [(t.module, t.depth) for t in timings] == [
+            ("encodings.aliases", 2),
+            ("encodings", 1),
+            ("encodings.utf_8", 1),
+            ("config.wsgi", 0),
+        ]
+        assert total_us(timings, "config.wsgi") == 1350
+
+    def test_by_package(self):
+        """Test that self times are summed per top-level package."""
+        timings = parse_importtime(SAMPLE)
+        assert by_package(timings) == [("config", 1000), ("encodings", 350)]
+
+
+class TestImportBudget:
+    """Tests for the import cost of config.wsgi."""
+
+    @pytest.fixture(scope="class")
+    def timings(self):
+        """Import config.wsgi in a fresh interpreter, keeping the faster run."""
+        runs = [
+            measure_imports(
+                "config.wsgi", os.environ["DJANGO_SETTINGS_MODULE"], settings.BASE_DIR
+            )
+            for _ in range(2)
+        ]
+        return min(runs, key=lambda run: total_us(run, "config.wsgi"))
+
+    def test_deferred_modules_not_imported(self, timings):
+        """Test that rarely used modules stay out of the start-up path."""
+        imported = {timing.module for timing in timings}
+        assert imported.isdisjoint(DEFERRED_MODULES), sorted(
+            imported.intersection(DEFERRED_MODULES)
+        )
+
+    def test_budget(self, timings):
+        """Test that importing the WSGI application stays within budget."""
+        assert total_us(timings, "config.wsgi") / 1000 < IMPORT_BUDGET_MS
@@ -0,0 +1,129 @@
+"""
+Tests for the fast JSON renderer and parser.
+
+This module checks that the orjson-backed codecs are drop-in replacements
+for DRF's JSONRenderer and JSONParser, and the benchmark_json command.
+"""
+
+import io
+import uuid
+from datetime import date, datetime, time, timedelta
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+import pytest
+
+from apps.core.management.commands.benchmark_json import todo_page
+from apps.core.parsers import FastJSONParser
+from apps.core.renderers import FastJSONRenderer
+from apps.users.models import User
+
+MIXED = {
+    "text": 'naïve – 日本語 "quoted" \\ </script>',
+    "separators": "a\u2028b\u2029c",
+    "decimal": Decimal("12.50"),
+    "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    "aware": datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=dt_timezone.utc),
+    "offset": datetime(
+        2024, 5, 1, 12, 30, tzinfo=dt_timezone(timedelta(hours=5, minutes=30))
+    ),
+    "date": date(2024, 5, 1),
+    "time": time(8, 15),
+    "duration": timedelta(days=1, seconds=5),
+    "nested": [{"a": None, "b": True, "c": 1.5}, (1, 2), []],
+    1: "integer key",
+}
+
+
+class TestFastJSONRenderer:
+    """Tests for FastJSONRenderer."""
+
+    @pytest.mark.parametrize("size", [0, 20, 100])
+    def test_todo_pages_identical(self, size):
+        """Test that to-do pages render to the same bytes as JSONRenderer."""
+        data = todo_page(size)
+        assert FastJSONRenderer().render(data) == JSONRenderer().render(data)
+
+    @pytest.mark.parametrize("media_type", [None, "application/json; indent=2"])
+    def test_mixed_types_identical(self, media_type):
+        """Test that special types and indented output match JSONRenderer."""
+        expected = JSONRenderer().render(MIXED, media_type)
+        assert FastJSONRenderer().render(MIXED, media_type) == expected
+        assert b"\\u2028" in expected
+
+    def test_falls_back_for_big_integers(self):
+        """Test that values orjson rejects are rendered by JSONRenderer."""
+        data = {"big": 2**70}
+        assert FastJSONRenderer().render(data) == b'{"big":1180591620717411303424}'
+
+    def test_falls_back_for_other_indents(self):
+        """Test that indents orjson cannot produce match JSONRenderer."""
+        media_type = "application/json; indent=4"
+        expected = JSONRenderer().render(MIXED, media_type)
+        assert FastJSONRenderer().render(MIXED, media_type) == expected
+
+    def test_none_renders_empty(self):
+        """Test that no data renders an empty body."""
+        assert FastJSONRenderer().render(None) == b""
+
+
+class TestFastJSONParser:
+    """Tests for FastJSONParser."""
+
+    def test_matches_json_parser(self):
+        """Test that parsed data matches JSONParser."""
+        body = FastJSONRenderer().render(todo_page(20))
+        parsed = FastJSONParser().parse(io.BytesIO(body))
+        assert parsed == JSONParser().parse(io.BytesIO(body))
+
+    def test_big_integers(self):
+        """Test that integers over 64 bits still parse."""
+        body = io.BytesIO(b'{"big": 2361183241434822606848}')
+        assert FastJSONParser().parse(body) == {"big": 2**71}
+
+    @pytest.mark.parametrize("body", [b"{bad", b'{"value": NaN}', b""])
+    def test_invalid_json(self, body):
+        """Test that invalid or non-strict JSON raises ParseError."""
+        with pytest.raises(ParseError, match="JSON parse error"):
+            FastJSONParser().parse(io.BytesIO(body))
+
+
+@pytest.mark.django_db
+class TestAPI:
+    """Tests for the API using the fast codecs."""
+
+    def test_create_and_list(self):
+        """Test that the API parses requests and renders responses."""
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user(username="json"))
+        response = client.post(
+            "/api/todos/", {"title": "Café \u2028 run"}, format="json"
+        )
+        assert response.status_code == 201
+        assert isinstance(response.accepted_renderer, FastJSONRenderer)
+        listed = client.get("/api/todos/")
+        assert b"Caf\xc3\xa9 \\u2028 run" in listed.content
+        assert listed.json()["results"][0]["title"] == "Café \u2028 run"
+
+
+class TestBenchmarkJSON:
+    """Tests for the benchmark_json command."""
+
+    def test_reports_each_size(self):
+        """Test that the command checks and times every page size."""
+        out = StringIO()
+        call_command(
+            "benchmark_json", sizes=[5, 10], iterations=2, warmup=0, stdout=out
+        )
+        lines = out.getvalue().splitlines()
+        assert len(lines) == 5
+        assert lines[1].split()[:2] == ["5", "render"]
+        assert lines[4].split()[:2] == ["10", "parse"]
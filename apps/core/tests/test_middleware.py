@@ -0,0 +1,86 @@
+"""
+Tests for the lean API middleware routing.
+
+This module contains tests for the route-aware middleware in apps.core.
+"""
+
+from django.contrib.auth import get_user_model
+
+from rest_framework.test import APIClient
+
+import pytest
+from rest_framework_simplejwt.tokens import RefreshToken
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def static_storage(settings):
+    """Serve admin assets without a collected manifest."""
+    settings.STORAGES = {
+        **settings.STORAGES,
+        "staticfiles": {
+            "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+        },
+    }
+
+
+@pytest.fixture
+def user(db):
+    """Create and return a staff user."""
+    return User.objects.create_user(
+        username="staff",
+        email="staff@example.com",
+        password="testpass123",
+        is_staff=True,
+        is_superuser=True,
+    )
+
+
+@pytest.fixture
+def api_client(user):
+    """Return an API client authenticated with a JWT."""
+    client = APIClient()
+    refresh = RefreshToken.for_user(user)
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+    return client
+
+
+@pytest.mark.django_db
+class TestLeanMiddleware:
+    """Tests for the middleware bypass of API requests."""
+
+    def test_api_request_skips_browser_middleware(self, api_client, user):
+        """Test that API requests get no session, messages or CSRF handling."""
+        response = api_client.get("/api/todos/")
+        assert response.status_code == 200
+        request = response.wsgi_request
+        assert not hasattr(request, "session")
+        assert not hasattr(request, "_messages")
+        assert "CSRF_COOKIE" not in request.META
+        # DRF still sets the user it authenticated.
+        assert request.user == user
+
+    def test_api_unsafe_request_without_csrf(self, api_client):
+        """Test that API writes keep working without CSRF tokens."""
+        api_client.handler.enforce_csrf_checks = True
+        response = api_client.post("/api/todos/", {"title": "Lean"}, format="json")
+        assert response.status_code == 201
+
+    def test_admin_keeps_full_stack(self, client, user):
+        """Test that admin requests still get sessions and CSRF protection."""
+        client.force_login(user)
+        response = client.get("/admin/")
+        assert response.status_code == 200
+        assert hasattr(response.wsgi_request, "session")
+        assert response.wsgi_request.user == user
+
+        csrf_client = type(client)(enforce_csrf_checks=True)
+        response = csrf_client.post("/admin/login/", {"username": "staff"})
+        assert response.status_code == 403
+
+    def test_disabled(self, api_client, settings):
+        """Test that an empty prefix list restores the full stack."""
+        settings.LEAN_MIDDLEWARE_PREFIXES = ()
+        response = api_client.get("/api/todos/")
+        assert hasattr(response.wsgi_request, "session")
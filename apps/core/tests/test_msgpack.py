@@ -0,0 +1,156 @@
+"""
+Tests for the MessagePack response format.
+
+This module contains tests for the MessagePack renderer and parser and
+the compact field representations they negotiate.
+"""
+
+import io
+from datetime import datetime
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+
+from rest_framework.exceptions import ParseError
+from rest_framework.test import APIClient
+
+import msgpack
+import pytest
+
+from apps.core.parsers import MessagePackParser
+from apps.core.renderers import MessagePackRenderer, epoch_milliseconds
+from apps.todos.models import Todo
+
+User = get_user_model()
+
+MSGPACK = "application/msgpack"
+DUE = datetime(2030, 1, 2, 3, 4, 5, 678000, tzinfo=dt_timezone.utc)
+DUE_MS = 1893553445678
+
+
+@pytest.fixture
+def user(db):
+    """Create and return a user."""
+    return User.objects.create_user(username="mobile", email="mobile@example.com")
+
+
+@pytest.fixture
+def api_client(user):
+    """Return an API client authenticated as ``user``."""
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+@pytest.fixture
+def todo(user):
+    """Create and return a high priority to-do with a due date."""
+    return Todo.objects.create(
+        user=user, title="Call home", priority=Todo.Priority.HIGH, due_date=DUE
+    )
+
+
+def unpack(response):
+    """Return the decoded MessagePack body of ``response``."""
+    assert response["Content-Type"] == MSGPACK
+    return msgpack.unpackb(response.content)
+
+
+class TestRenderer:
+    """Tests for MessagePackRenderer and MessagePackParser."""
+
+    def test_round_trip(self):
+        """Test that rendered data parses back, with extra types encoded."""
+        data = {"due": DUE, "amount": Decimal("1.50"), "items": [1, None, "é"]}
+        body = MessagePackRenderer().render(data)
+        assert MessagePackParser().parse(io.BytesIO(body)) == {
+            "due": DUE_MS,
+            "amount": 1.5,
+            "items": [1, None, "é"],
+        }
+        assert epoch_milliseconds(DUE) == DUE_MS
+
+    @pytest.mark.parametrize("body", [b"\xc1", b"\x92\x01", b""])
+    def test_invalid_body(self, body):
+        """Test that malformed bodies raise ParseError."""
+        with pytest.raises(ParseError, match="MessagePack parse error"):
+            MessagePackParser().parse(io.BytesIO(body))
+
+
+@pytest.mark.django_db
+class TestMessagePackAPI:
+    """Tests for MessagePack negotiation on the API endpoints."""
+
+    def test_list_compact_values(self, api_client, todo):
+        """Test that lists use integer timestamps and choice positions."""
+        data = unpack(api_client.get("/api/todos/", HTTP_ACCEPT=MSGPACK))
+        item = data["results"][0]
+        assert item["due_date"] == DUE_MS
+        assert item["created_at"] == epoch_milliseconds(todo.created_at)
+        assert item["priority"] == 2
+        assert item["title"] == "Call home"
+        assert data["count"] == 1
+
+    def test_json_unchanged(self, api_client, todo):
+        """Test that JSON clients still get ISO timestamps and choice values."""
+        item = api_client.get("/api/todos/").json()["results"][0]
+        assert item["due_date"] == "2030-01-02T03:04:05.678000Z"
+        assert item["priority"] == "high"
+
+    def test_format_query_parameter(self, api_client, todo):
+        """Test that ?format=msgpack selects MessagePack too."""
+        response = api_client.get(f"/api/todos/{todo.pk}/", {"format": "msgpack"})
+        assert unpack(response)["id"] == todo.pk
+
+    def test_create(self, api_client):
+        """Test that MessagePack bodies with compact values are accepted."""
+        body = msgpack.packb({"title": "Mobile", "priority": 0, "due_date": DUE_MS})
+        response = api_client.post(
+            "/api/todos/", body, content_type=MSGPACK, HTTP_ACCEPT=MSGPACK
+        )
+        assert response.status_code == 201
+        assert unpack(response)["due_date"] == DUE_MS
+        todo = Todo.objects.get(title="Mobile")
+        assert todo.priority == Todo.Priority.LOW
+        assert todo.due_date == DUE
+
+    def test_create_accepts_iso_values(self, api_client):
+        """Test that MessagePack bodies may still use ISO strings and values."""
+        body = msgpack.packb(
+            {"title": "Mobile", "priority": "high", "due_date": DUE.isoformat()}
+        )
+        response = api_client.post("/api/todos/", body, content_type=MSGPACK)
+        assert response.status_code == 201
+        assert response.json()["priority"] == "high"
+
+    @pytest.mark.parametrize(
+        "field, value", [("priority", 3), ("priority", True), ("due_date", 2**62)]
+    )
+    def test_create_rejects_invalid(self, api_client, field, value):
+        """Test that out-of-range compact values fail validation."""
+        body = msgpack.packb({"title": "Mobile", field: value})
+        response = api_client.post(
+            "/api/todos/", body, content_type=MSGPACK, HTTP_ACCEPT=MSGPACK
+        )
+        assert response.status_code == 400
+        assert field in unpack(response)
+
+    def test_json_rejects_compact_values(self, api_client):
+        """Test that JSON bodies keep the strict representations."""
+        response = api_client.post(
+            "/api/todos/", {"title": "Web", "priority": 0}, format="json"
+        )
+        assert response.status_code == 400
+
+    def test_profile(self, api_client, user):
+        """Test that the profile endpoint speaks MessagePack."""
+        data = unpack(api_client.get("/api/auth/profile/", HTTP_ACCEPT=MSGPACK))
+        assert data["username"] == "mobile"
+        assert data["date_joined"] == epoch_milliseconds(user.date_joined)
+
+    def test_errors_rendered(self):
+        """Test that error responses are rendered as MessagePack too."""
+        response = APIClient().get("/api/todos/", HTTP_ACCEPT=MSGPACK)
+        assert response.status_code == 401
+        assert "detail" in unpack(response)
@@ -0,0 +1,134 @@
+"""
+Tests for the traffic replay.
+
+This module contains tests for the replay of captured traffic logs.
+"""
+
+import json
+from io import StringIO
+
+from django.core.management import call_command
+
+import pytest
+
+from apps.core.replay import Replayer, load_log, report
+from apps.todos.models import Todo
+from apps.todos.seeding import PASSWORD, seed_users
+
+
+def entry(t, method, view, kwargs=(), params=None, size=0, bucket=0):
+    """Return a capture log record."""
+    return {
+        "t": t,
+        "m": method,
+        "v": view,
+        "k": list(kwargs),
+        "q": params or {},
+        "s": size,
+        "u": bucket,
+        "st": 200,
+        "d": 1.0,
+    }
+
+
+@pytest.fixture
+def seeded(transactional_db):
+    """Create two users with a few todos each."""
+    users = seed_users(2, prefix="replay")
+    for user in users:
+        Todo.objects.bulk_create(Todo(title=f"Todo {i}", user=user) for i in range(3))
+    return users
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    """Write a small capture log and return its path."""
+    entries = [
+        entry(10.0, "GET", "todos:todo-list", params={"completed": "false"}),
+        entry(10.1, "GET", "todos:todo-list", params={"search": "qqq"}, bucket=3),
+        entry(10.2, "GET", "todos:todo-detail", kwargs=["pk"]),
+        entry(10.3, "POST", "todos:todo-list", size=200, bucket=1),
+        entry(10.4, "PATCH", "todos:todo-detail", kwargs=["pk"], size=30),
+        entry(10.5, "POST", "todos:todo-toggle-complete", kwargs=["pk"]),
+        entry(10.55, "POST", "users:login", size=60, bucket=None),
+        entry(10.6, "POST", "users:token-refresh", size=300, bucket=None),
+        entry(10.7, "DELETE", "todos:todo-detail", kwargs=["pk"]),
+        entry(10.8, "GET", "users:profile", bucket=1),
+    ]
+    path = tmp_path / "traffic.jsonl"
+    path.write_text("".join(json.dumps(item) + "\n" for item in reversed(entries)))
+    return path
+
+
+def test_load_log_sorts_entries(log_path):
+    """Test that log entries are replayed in arrival order."""
+    entries = load_log(log_path, limit=3)
+    assert [item["t"] for item in entries] == [10.0, 10.1, 10.2]
+
+
+def test_anonymous_auth_entries_get_a_user():
+    """Test that logins and refreshes without a bucket replay as a seeded user."""
+    replayer = Replayer("http://testserver", [("a", "pw"), ("b", "pw")])
+    login = entry(10.001, "POST", "users:login", bucket=None)
+    anonymous = entry(10.001, "GET", "todos:todo-list", bucket=None)
+    assert replayer.bucket(login) == 1
+    assert replayer.bucket(anonymous) is None
+
+
+def test_replay_against_live_server(seeded, live_server, log_path):
+    """Test that a log replays without errors and skips deletes."""
+    users = [(user.username, PASSWORD) for user in seeded]
+    replayer = Replayer(live_server.url, users, workers=2, speedup=0)
+    outcomes, skipped, elapsed = replayer.run(load_log(log_path))
+
+    assert skipped == 1
+    assert len(outcomes) == 9
+    assert all(200 <= outcome.status < 300 for outcome in outcomes), outcomes
+    summary = report(outcomes)
+    assert summary["POST users:login"]["count"] == 1
+    assert summary["POST users:token-refresh"]["count"] == 1
+    assert summary["GET todos:todo-list"]["count"] == 2
+    assert summary["POST todos:todo-list"]["errors"] == 0
+    assert Todo.objects.count() == 7
+
+
+def test_command_reports_routes(seeded, live_server, log_path):
+    """Test that the command prints throughput and per-route latency."""
+    out = StringIO()
+    call_command(
+        "replay_traffic",
+        str(log_path),
+        base_url=live_server.url,
+        users=2,
+        user_prefix="replay",
+        speedup=0,
+        stdout=out,
+    )
+    output = out.getvalue()
+    assert "9 requests" in output
+    assert "1 skipped" in output
+    assert "errors: 0 (0.00%)" in output
+    assert "GET todos:todo-detail" in output
+
+
+def test_replays_default_seed(transactional_db, live_server, log_path):
+    """Test that a capture replays against a dataset seeded with the defaults."""
+    call_command(
+        "seed_todos",
+        users=2,
+        todos_per_user=3,
+        workers=1,
+        keep_indexes=True,
+        stdout=StringIO(),
+    )
+    out = StringIO()
+    call_command(
+        "replay_traffic",
+        str(log_path),
+        base_url=live_server.url,
+        users=2,
+        workers=1,
+        speedup=0,
+        stdout=out,
+    )
+    assert "errors: 0 (0.00%)" in out.getvalue()
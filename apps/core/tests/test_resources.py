@@ -0,0 +1,148 @@
+"""
+Tests for the resource helpers.
+
+This module contains tests for the CPU and memory limits used to size
+gunicorn and for the per-process memory accounting.
+"""
+
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+
+import pytest
+
+from apps.core.resources import (
+    child_pids,
+    cpu_limit,
+    memory_limit,
+    process_memory,
+    thread_count,
+    worker_count,
+    write_queue_databases,
+)
+
+MB = 1024 * 1024
+linux_only = pytest.mark.skipif(
+    not os.path.exists("/proc/self/smaps_rollup"), reason="needs /proc"
+)
+
+
+@pytest.fixture
+def cgroup(tmp_path):
+    """Return an empty directory standing in for /sys/fs/cgroup."""
+    return tmp_path
+
+
+class TestLimits:
+    """Tests for the cgroup limit helpers."""
+
+    def test_cpu_quota_v2(self, cgroup):
+        """Test that a cgroup v2 quota caps the CPU count."""
+        (cgroup / "cpu.max").write_text("150000 100000\n")
+        assert cpu_limit(cgroup) == min(2, len(os.sched_getaffinity(0)))
+
+    def test_cpu_quota_v1(self, cgroup):
+        """Test that a cgroup v1 quota caps the CPU count."""
+        (cgroup / "cpu").mkdir()
+        (cgroup / "cpu" / "cpu.cfs_quota_us").write_text("50000")
+        (cgroup / "cpu" / "cpu.cfs_period_us").write_text("100000")
+        assert cpu_limit(cgroup) == 1
+
+    def test_cpu_unlimited(self, cgroup):
+        """Test that missing or unlimited quotas use the CPU affinity."""
+        (cgroup / "cpu.max").write_text("max 100000")
+        assert cpu_limit(cgroup) == len(os.sched_getaffinity(0))
+
+    def test_memory_limits(self, cgroup):
+        """Test the cgroup v2, cgroup v1 and meminfo fallbacks in turn."""
+        meminfo = cgroup / "meminfo"
+        meminfo.write_text("MemTotal: 4096 kB\nMemAvailable: 2048 kB\n")
+        assert memory_limit(cgroup, meminfo) == 2 * MB
+        (cgroup / "memory").mkdir()
+        (cgroup / "memory" / "memory.limit_in_bytes").write_text(str(1 << 62))
+        assert memory_limit(cgroup, meminfo) == 2 * MB
+        (cgroup / "memory" / "memory.limit_in_bytes").write_text(str(512 * MB))
+        assert memory_limit(cgroup, meminfo) == 512 * MB
+        (cgroup / "memory.max").write_text(str(256 * MB))
+        assert memory_limit(cgroup, meminfo) == 256 * MB
+
+    @pytest.mark.parametrize(
+        "cpus,memory,workers",
+        [(1, None, 3), (4, None, 9), (4, 512 * MB, 3), (2, 100 * MB, 1)],
+    )
+    def test_worker_count(self, cpus, memory, workers):
+        """Test that workers follow the CPUs unless memory is scarce."""
+        assert worker_count(cpus, memory, 120 * MB) == workers
+
+    def test_thread_count(self):
+        """Test that threads make up for memory-capped workers."""
+        assert thread_count(4, 9) == 2
+        assert thread_count(4, 3) == 6
+        assert thread_count(16, 1) == 8
+
+    def test_write_queue_databases(self):
+        """Test that only SQLite databases with the write queue are listed."""
+        databases = {
+            "default": {"ENGINE": "apps.core.db.backends.sqlite3"},
+            "off": {
+                "ENGINE": "apps.core.db.backends.sqlite3",
+                "OPTIONS": {"write_queue": False},
+            },
+            "stock": {"ENGINE": "django.db.backends.sqlite3"},
+        }
+        assert write_queue_databases(databases) == ["default"]
+
+
+def gunicorn_workers(**env):
+    """Return the workers of config/gunicorn.py, or its error, under ``env``."""
+    result = subprocess.run(
+        [sys.executable, "-c", "import config.gunicorn as g; print(g.workers)"],
+        cwd=settings.BASE_DIR,
+        env={
+            **os.environ,
+            "DJANGO_SETTINGS_MODULE": "config.settings.production_sqlite",
+            **env,
+        },
+        capture_output=True,
+        text=True,
+    )
+    return result.stdout.strip() or result.stderr
+
+
+class TestGunicornSqliteWorkers:
+    """Tests for the worker count of config/gunicorn.py with SQLite."""
+
+    def test_single_worker_by_default(self):
+        """Test that the SQLite write queue gets one worker."""
+        env = {"GUNICORN_WORKERS": ""}
+        assert gunicorn_workers(**env) == "1"
+
+    def test_more_workers_rejected(self):
+        """Test that asking for several workers fails at start-up."""
+        assert "GUNICORN_WORKERS=3 with the SQLite write queue" in gunicorn_workers(
+            GUNICORN_WORKERS="3"
+        )
+
+
+@linux_only
+class TestProcessMemory:
+    """Tests for the /proc based memory accounting."""
+
+    def test_self(self):
+        """Test that the current process reports consistent figures."""
+        usage = process_memory()
+        assert usage.pid == os.getpid()
+        assert 0 < usage.uss <= usage.pss <= usage.rss
+        assert usage.shared == usage.rss - usage.uss
+
+    def test_children(self):
+        """Test that child processes are listed."""
+        child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(5)"])
+        try:
+            assert child.pid in child_pids(os.getpid())
+            assert process_memory(child.pid).rss > 0
+        finally:
+            child.kill()
+            child.wait()
@@ -0,0 +1,109 @@
+"""
+Tests for the precomputed OpenAPI schema.
+
+This module contains tests for the schema artifacts, the view serving
+them and the build_schema command.
+"""
+
+import gzip
+import json
+from io import StringIO
+
+from django.core.management import call_command
+
+import brotli
+import pytest
+
+from apps.core import schema
+
+
+@pytest.fixture(autouse=True)
+def fresh_artifacts(settings, tmp_path):
+    """Start every test without cached artifacts."""
+    settings.SCHEMA_CACHE_DIR = str(tmp_path / "openapi")
+    schema.clear_artifacts()
+    yield
+    schema.clear_artifacts()
+
+
+@pytest.fixture
+def build_calls(monkeypatch):
+    """Count calls to schema generation."""
+    calls = []
+    build = schema.build_artifacts
+
+    def counting_build():
+        calls.append(1)
+        return build()
+
+    monkeypatch.setattr(schema, "build_artifacts", counting_build)
+    return calls
+
+
+class TestSchemaView:
+    """Tests for the schema view."""
+
+    def test_generated_once(self, client, build_calls):
+        """Test that the schema is generated on first use and then reused."""
+        first = client.get("/api/schema/", {"format": "json"})
+        second = client.get("/api/schema/", HTTP_ACCEPT="application/yaml")
+        assert first.status_code == second.status_code == 200
+        assert first["Content-Type"] == "application/vnd.oai.openapi+json"
+        assert "/api/todos/" in json.loads(first.content)["paths"]
+        assert second["Content-Type"] == "application/vnd.oai.openapi"
+        assert second.content.startswith(b"openapi:")
+        assert len(build_calls) == 1
+
+    def test_etag_revalidation(self, client):
+        """Test that a matching If-None-Match gets a 304."""
+        etag = client.get("/api/schema/")["ETag"]
+        response = client.get("/api/schema/", HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        assert response["ETag"] == etag
+
+    @pytest.mark.parametrize(
+        "encoding,decompress",
+        [("br", brotli.decompress), ("gzip", gzip.decompress)],
+    )
+    def test_precompressed(self, client, encoding, decompress):
+        """Test that compressed variants decode to the plain document."""
+        plain = client.get("/api/schema/?format=json")
+        response = client.get(
+            "/api/schema/?format=json", HTTP_ACCEPT_ENCODING=f"{encoding}, deflate"
+        )
+        assert response["Content-Encoding"] == encoding
+        assert decompress(response.content) == plain.content
+        assert response["ETag"] != plain["ETag"]
+        assert "Accept-Encoding" in response["Vary"]
+
+    def test_rejects_writes(self, client):
+        """Test that the schema is read-only."""
+        assert client.post("/api/schema/").status_code == 405
+
+
+class TestBuildSchema:
+    """Tests for prebuilt schema artifacts."""
+
+    def test_command_writes_artifacts(self, settings, client, build_calls):
+        """Test that prebuilt files are served without regenerating."""
+        call_command("build_schema", stdout=StringIO())
+        build_calls.clear()
+        settings.DEBUG = False
+        response = client.get("/api/schema/?format=json")
+        assert response.status_code == 200
+        assert build_calls == []
+
+        stored = schema.read_artifacts(settings.SCHEMA_CACHE_DIR)
+        assert response.content == stored["json"].body
+
+    def test_debug_ignores_prebuilt_files(self, settings, build_calls):
+        """Test that DEBUG always regenerates the schema."""
+        call_command("build_schema", stdout=StringIO())
+        build_calls.clear()
+        settings.DEBUG = True
+        schema.get_artifacts()
+        assert len(build_calls) == 1
+
+    def test_incomplete_directory(self, tmp_path):
+        """Test that missing files are treated as no prebuilt schema."""
+        assert schema.read_artifacts(tmp_path) is None
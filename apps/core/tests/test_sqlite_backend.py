@@ -0,0 +1,104 @@
+"""
+Tests for the tuned SQLite backend.
+
+This module contains tests for the connection pragmas and the write queue.
+"""
+
+import threading
+
+from django.db import transaction
+from django.db.utils import ConnectionHandler
+
+import pytest
+
+from apps.core.db.backends.sqlite3.base import get_write_lock, is_write
+
+
+@pytest.fixture
+def sqlite_connections(tmp_path, django_db_blocker, monkeypatch):
+    """Return a connection handler for a temporary tuned SQLite database."""
+    handler = ConnectionHandler(
+        {
+            "default": {
+                "ENGINE": "apps.core.db.backends.sqlite3",
+                "NAME": str(tmp_path / "tuned.sqlite3"),
+                "OPTIONS": {"pragmas": {"busy_timeout": 2000}},
+            }
+        }
+    )
+    # Let transaction.atomic() operate on the temporary connections.
+    monkeypatch.setattr(transaction, "connections", handler)
+    with django_db_blocker.unblock():
+        yield handler
+        handler.close_all()
+
+
+def fetch_one(connection, query):
+    """Execute ``query`` and return the first column of the first row."""
+    with connection.cursor() as cursor:
+        cursor.execute(query)
+        return cursor.fetchone()[0]
+
+
+class TestTunedSQLiteBackend:
+    """Test cases for the tuned SQLite backend."""
+
+    def test_pragmas_applied(self, sqlite_connections):
+        """Test that every connection gets the configured pragmas."""
+        connection = sqlite_connections["default"]
+
+        assert fetch_one(connection, "PRAGMA journal_mode") == "wal"
+        assert fetch_one(connection, "PRAGMA busy_timeout") == 2000
+        assert fetch_one(connection, "PRAGMA synchronous") == 1
+        assert fetch_one(connection, "PRAGMA cache_size") == -64 * 1024
+
+    def test_is_write(self):
+        """Test the write statement detection."""
+        assert is_write("  insert into t values (1)")
+        assert is_write("UPDATE t SET a = 1")
+        assert is_write("REPLACE INTO t VALUES (1)")
+        assert not is_write("SELECT * FROM t")
+        assert not is_write("BEGIN")
+
+    def test_transaction_holds_write_lock(self, sqlite_connections):
+        """Test that a transaction holds the write lock until it commits."""
+        connection = sqlite_connections["default"]
+        lock = get_write_lock(connection.settings_dict["NAME"])
+
+        with transaction.atomic(using=connection.alias):
+            connection.ensure_connection()
+            assert connection.holds_write_lock
+            assert lock.locked()
+        assert not connection.holds_write_lock
+        assert not lock.locked()
+
+    def test_concurrent_writers_do_not_fail(self, sqlite_connections):
+        """Test that concurrent threads writing never hit a locked database."""
+        with sqlite_connections["default"].cursor() as cursor:
+            cursor.execute("CREATE TABLE counter (value INTEGER)")
+
+        errors = []
+
+        def write():
+            connection = sqlite_connections["default"]
+            try:
+                for i in range(25):
+                    with transaction.atomic(using=connection.alias):
+                        with connection.cursor() as cursor:
+                            cursor.execute("INSERT INTO counter VALUES (%s)", [i])
+                    with connection.cursor() as cursor:
+                        cursor.execute("UPDATE counter SET value = value + 1")
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=write) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        count = fetch_one(sqlite_connections["default"], "SELECT COUNT(*) FROM counter")
+        assert count == 150
@@ -0,0 +1,122 @@
+"""
+Views for the core app.
+
+This module contains the view serving the precomputed OpenAPI schema, the
+request batching endpoint and a helper that defers importing rarely used
+views until their first use.
+"""
+
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+from django.utils.module_loading import import_string
+from django.views.decorators.http import require_safe
+
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.views import APIView
+
+from drf_spectacular.utils import extend_schema
+
+from apps.monitoring.mixins import TimedViewMixin
+
+from . import compression
+from .batch import run_batch
+from .parsers import MessagePackParser
+from .renderers import MessagePackRenderer
+from .schema import ENCODINGS, get_artifacts
+from .serializers import BatchRequestSerializer, BatchResponseSerializer
+
+
+def lazy_view(path, **initkwargs):
+    """
+    Return a view that imports the class-based view ``path`` on first use.
+
+    ``initkwargs`` are passed to ``as_view``. Use it for views such as the
+    API documentation whose modules are expensive to import and rarely
+    requested.
+    """
+    view = None
+
+    def lazy(request, *args, **kwargs):
+        nonlocal view
+        if view is None:
+            view = import_string(path).as_view(**initkwargs)
+        return view(request, *args, **kwargs)
+
+    lazy.__name__ = path.rsplit(".", 1)[1]
+    lazy.csrf_exempt = True
+    return lazy
+
+
+def negotiate_format(request):
+    """Return the schema format requested by ``?format=`` or ``Accept``."""
+    fmt = request.GET.get("format", "")
+    if fmt in ("json", "yaml"):
+        return fmt
+    return "json" if "json" in request.headers.get("Accept", "") else "yaml"
+
+
+def negotiate_encoding(request):
+    """Return the best precompressed coding the client accepts."""
+    return compression.negotiate_encoding(
+        request.headers.get("Accept-Encoding", ""), ENCODINGS
+    )
+
+
+@require_safe
+def schema(request):
+    """
+    Return the OpenAPI schema from the precomputed artifacts.
+
+    The format follows ``?format=json|yaml`` or the ``Accept`` header (YAML
+    by default, like ``SpectacularAPIView``); the body is sent brotli or
+    gzip compressed when the client accepts it. Every variant has its own
+    strong ETag, and matching ``If-None-Match`` requests get a 304.
+    """
+    artifact = get_artifacts()[negotiate_format(request)]
+    encoding = negotiate_encoding(request)
+    etag = artifact.etag
+    if encoding != "identity":
+        etag = f'{etag[:-1]}-{encoding}"'
+
+    if etag in parse_etags(request.headers.get("If-None-Match", "")):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(
+            artifact.encoded(encoding), content_type=artifact.content_type
+        )
+        response["Content-Disposition"] = f'inline; filename="schema.{artifact.format}"'
+        if encoding != "identity":
+            response["Content-Encoding"] = encoding
+    response["ETag"] = etag
+    response["Cache-Control"] = "no-cache"
+    patch_vary_headers(response, ("Accept", "Accept-Encoding"))
+    return response
+
+
+@extend_schema(
+    tags=["Batch"],
+    summary="Run several API requests at once",
+    description="Dispatch up to `BATCH_MAX_REQUESTS` API requests (method, "
+    "path and JSON body) in one round trip and return their responses in "
+    "order. `parallel` runs consecutive read-only requests concurrently; "
+    "`atomic` runs them in one transaction that is rolled back, skipping the "
+    "rest, when one fails. A bare array of requests is accepted too.",
+    request=BatchRequestSerializer,
+    responses=BatchResponseSerializer,
+)
+class BatchView(TimedViewMixin, APIView):
+    """Run batched API calls in-process (see ``apps.core.batch``)."""
+
+    permission_classes = (IsAuthenticated,)
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, MessagePackRenderer]
+    parser_classes = [*api_settings.DEFAULT_PARSER_CLASSES, MessagePackParser]
+
+    def post(self, request):
+        """Run the calls of the batch and return their responses."""
+        serializer = BatchRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        responses, committed = run_batch(request, **serializer.validated_data)
+        return Response({"responses": responses, "committed": committed})
@@ -0,0 +1,11 @@
+"""App configuration for the monitoring app."""
+
+from django.apps import AppConfig
+
+
+class MonitoringConfig(AppConfig):
+    """Configuration class for the monitoring application."""
+
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "apps.monitoring"
+    verbose_name = "Monitoring"
@@ -0,0 +1,54 @@
+"""
+Cache backends that record hit and miss metrics.
+
+Use these classes as ``CACHES[...]["BACKEND"]`` in place of Django's own
+backends. Lookups are counted in ``cache_requests_total`` under the name
+given by the optional ``METRICS_NAME`` key of the cache settings.
+"""
+
+from django.core.cache.backends import locmem, redis
+
+from .metrics import CACHE_REQUESTS
+
+_missing = object()
+
+
+class InstrumentedCacheMixin:
+    """Count the hits and misses of ``get``."""
+
+    def __init__(self, location, params):
+        super().__init__(location, params)
+        self.metrics_name = params.get("METRICS_NAME", "default")
+
+    def record_lookups(self, hits, misses):
+        """Add ``hits`` and ``misses`` to the cache metrics."""
+        if hits:
+            CACHE_REQUESTS.inc(hits, cache=self.metrics_name, result="hit")
+        if misses:
+            CACHE_REQUESTS.inc(misses, cache=self.metrics_name, result="miss")
+
+    def get(self, key, default=None, version=None):
+        """Return the cached value of ``key`` and record a hit or miss."""
+        value = super().get(key, _missing, version=version)
+        hit = value is not _missing
+        self.record_lookups(int(hit), int(not hit))
+        return value if hit else default
+
+
+class LocMemCache(InstrumentedCacheMixin, locmem.LocMemCache):
+    """
+    Local-memory cache that records hit and miss metrics.
+
+    ``get_many`` is implemented with ``get``, so it is counted as well.
+    """
+
+
+class RedisCache(InstrumentedCacheMixin, redis.RedisCache):
+    """Redis cache that records hit and miss metrics."""
+
+    def get_many(self, keys, version=None):
+        """Return the cached values of ``keys`` and record hits and misses."""
+        keys = list(keys)
+        values = super().get_many(keys, version=version)
+        self.record_lookups(len(values), len(keys) - len(values))
+        return values
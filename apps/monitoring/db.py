@@ -0,0 +1,88 @@
+"""
+Database instrumentation for the monitoring app.
+
+This module installs execute wrappers on every configured connection, so
+the queries of a request can be timed, counted and inspected.
+
+The always-on consumers (Server-Timing, request metrics and slow-query
+capture) share one wrapper, ``observe_query``: it times each statement
+once and passes the duration to every observer registered for the current
+context with ``observe_queries``.
+"""
+
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+
+from django.db import connections
+
+from .timing import current_timer
+
+_observers = ContextVar("query_observers", default=())
+
+
+@contextmanager
+def instrument_queries(wrapper):
+    """Run the block with ``wrapper`` installed on every database connection."""
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(wrapper))
+        yield
+
+
+def observe_query(execute, sql, params, many, context):
+    """Execute wrapper that times the query once for every observer."""
+    observers = _observers.get()
+    if not observers:
+        return execute(sql, params, many, context)
+    start = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = perf_counter() - start
+        for observer in observers:
+            observer(sql, params, many, context, duration)
+
+
+@contextmanager
+def observed_connections():
+    """
+    Run the block with ``observe_query`` installed on this thread's connections.
+
+    Connections belong to threads: code running queries on another thread
+    for the current request (see ``apps.core.batch``) calls this there,
+    within a copy of the request's context, to keep its queries observed.
+    """
+    if not _observers.get():
+        yield
+        return
+    with instrument_queries(observe_query):
+        yield
+
+
+@contextmanager
+def observe_queries(observer):
+    """
+    Call ``observer(sql, params, many, context, duration)`` after every query
+    executed in the block.
+
+    The outermost block installs ``observe_query``; nested blocks only add
+    their observer to the current context.
+    """
+    outermost = not _observers.get()
+    token = _observers.set((*_observers.get(), observer))
+    try:
+        if outermost:
+            with instrument_queries(observe_query):
+                yield
+        else:
+            yield
+    finally:
+        _observers.reset(token)
+
+
+def time_query(sql, params, many, context, duration):
+    """Query observer that adds the query's duration to the ``db`` phase."""
+    timer = current_timer()
+    if timer is not None:
+        timer.add("db", duration)
@@ -0,0 +1,23 @@
+"""
+Request labelling helpers for the monitoring app.
+"""
+
+
+def view_label(request):
+    """
+    Return a short label for the view that handled ``request``.
+
+    Viewset actions are labelled ``<ViewSet>.<action>`` (for example
+    ``TodoViewSet.list`` or ``TodoViewSet.toggle_complete``), class-based
+    views by their class name and function views by their function name.
+    """
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "unmatched"
+    func = match.func
+    cls = getattr(func, "cls", None) or getattr(func, "view_class", None)
+    if cls is None:
+        return getattr(func, "__name__", match.view_name or "unknown")
+    actions = getattr(func, "actions", None) or {}
+    action = actions.get(request.method.lower())
+    return f"{cls.__name__}.{action}" if action else cls.__name__
@@ -0,0 +1,46 @@
+"""Management command that compares two stored profiles."""
+
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.monitoring.profiling import diff_profiles, get_profile, parse_collapsed
+
+
+class Command(BaseCommand):
+    """
+    Compare two collapsed-stack profiles, for example of ``TodoViewSet.list``
+    before and after a change.
+
+    Profiles are given by their name in ``PROFILER_DIR`` or by path. For
+    every frame the command prints the change in its share of samples spent
+    in the frame itself (self) and in the frame or its callees (total).
+    """
+
+    help = "Compare two stored profiles frame by frame."
+
+    def add_arguments(self, parser):
+        """Register command line arguments."""
+        parser.add_argument("before", help="Profile name or path.")
+        parser.add_argument("after", help="Profile name or path.")
+        parser.add_argument("--limit", type=int, default=25)
+
+    def load(self, name):
+        """Return the samples of the profile ``name``."""
+        profile = get_profile(name)
+        if profile is not None:
+            return profile.read()
+        path = Path(name)
+        if not path.is_file():
+            raise CommandError(f"Profile not found: {name}")
+        return parse_collapsed(path.read_text())
+
+    def handle(self, *args, **options):
+        """Print the frames whose share of samples changed the most."""
+        before, after = self.load(options["before"]), self.load(options["after"])
+        self.stdout.write(
+            f"{'self':>8} {'total':>8}  frame  "
+            f"({sum(before.values())} -> {sum(after.values())} samples)"
+        )
+        for frame, own, total in diff_profiles(before, after)[: options["limit"]]:
+            self.stdout.write(f"{own * 100:+7.2f}% {total * 100:+7.2f}%  {frame}")
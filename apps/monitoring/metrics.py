@@ -0,0 +1,354 @@
+"""
+In-process metrics exported in the Prometheus text format.
+
+Every process keeps its own counters and histograms in ``registry``. When
+``METRICS_DIR`` is set, each process also writes a snapshot of its values
+to ``<METRICS_DIR>/<pid>-<boot id>.json`` (at most every
+``METRICS_FLUSH_INTERVAL`` seconds and at exit), and the scrape endpoint
+merges the snapshots of all processes, so one scrape covers every gunicorn
+worker. The boot id is drawn by each process, so a recycled worker that
+reuses a process ID does not overwrite its predecessor's counters. When a
+worker exits, gunicorn's ``child_exit`` hook (see ``config.gunicorn``)
+folds its snapshots into ``retired.json`` and deletes them, so recycled
+workers neither fill the directory nor slow down scrapes. Point
+``METRICS_DIR`` at a directory that is emptied on deploy.
+"""
+
+import atexit
+import fcntl
+import json
+import os
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# Snapshot holding the merged values of every exited process.
+RETIRED_SNAPSHOT = "retired.json"
+
+
+class Metric:
+    """Base class of the metrics kept in a Registry."""
+
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def key(self, labels):
+        """Return the values of ``labels`` in label name order."""
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def snapshot(self):
+        """Return the current values as JSON-serializable pairs."""
+        with self.lock:
+            return [[list(key), self.copy(value)] for key, value in self.values.items()]
+
+    def copy(self, value):
+        """Return a copy of one stored value."""
+        return value
+
+
+class Counter(Metric):
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        """Increment the counter for ``labels`` by ``amount``."""
+        key = self.key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    @staticmethod
+    def merge(value, other):
+        """Return the sum of two values of the counter."""
+        return value + other
+
+    def samples(self, key, value):
+        """Yield the exposition samples of one value."""
+        yield self.name, dict(zip(self.labelnames, key)), value
+
+
+class Histogram(Metric):
+    """Distribution of observed values over fixed buckets."""
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        """Record one observation of ``value`` for ``labels``."""
+        key = self.key(labels)
+        index = bisect_left(self.buckets, value)
+        with self.lock:
+            data = self.values.get(key)
+            if data is None:
+                data = self.values[key] = {
+                    "buckets": [0] * (len(self.buckets) + 1),
+                    "sum": 0.0,
+                }
+            data["buckets"][index] += 1
+            data["sum"] += value
+
+    def copy(self, value):
+        """Return a copy of one stored value."""
+        return {"buckets": list(value["buckets"]), "sum": value["sum"]}
+
+    @staticmethod
+    def merge(value, other):
+        """Return the sum of two values of the histogram."""
+        return {
+            "buckets": [a + b for a, b in zip(value["buckets"], other["buckets"])],
+            "sum": value["sum"] + other["sum"],
+        }
+
+    def samples(self, key, value):
+        """Yield the exposition samples of one value."""
+        labels = dict(zip(self.labelnames, key))
+        cumulative = 0
+        for bound, count in zip((*self.buckets, "+Inf"), value["buckets"]):
+            cumulative += count
+            yield f"{self.name}_bucket", {**labels, "le": str(bound)}, cumulative
+        yield f"{self.name}_sum", labels, value["sum"]
+        yield f"{self.name}_count", labels, cumulative
+
+
+def escape_label(value):
+    """Escape a label value for the Prometheus text format."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_sample(name, labels, value):
+    """Return one line of the Prometheus text format."""
+    if labels:
+        pairs = ",".join(f'{k}="{escape_label(v)}"' for k, v in labels.items())
+        name = f"{name}{{{pairs}}}"
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return f"{name} {value}"
+
+
+class Registry:
+    """Collection of metrics that can be snapshotted, merged and exported."""
+
+    def __init__(self):
+        self.metrics = {}
+        self.last_flush = None
+        self.flush_lock = threading.Lock()
+        self.snapshot_owner = None
+        self.snapshot_name = None
+
+    def counter(self, name, documentation, labelnames=()):
+        """Register and return a Counter."""
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), **kwargs):
+        """Register and return a Histogram."""
+        return self.register(Histogram(name, documentation, labelnames, **kwargs))
+
+    def register(self, metric):
+        """Add ``metric`` to the registry and return it."""
+        self.metrics[metric.name] = metric
+        return metric
+
+    def snapshot(self):
+        """Return the values of every metric of this process."""
+        return {name: metric.snapshot() for name, metric in self.metrics.items()}
+
+    def flush(self, directory=None):
+        """Write this process's snapshot to the metrics directory."""
+        directory = directory or settings.METRICS_DIR
+        if not directory:
+            return
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / self.get_snapshot_name()
+        temporary = path.with_suffix(".tmp")
+        temporary.write_text(json.dumps(self.snapshot()))
+        os.replace(temporary, path)
+        self.last_flush = time.monotonic()
+
+    def get_snapshot_name(self):
+        """
+        Return the snapshot file name of this process.
+
+        Drawn again after ``fork``: workers forked from a preloading master
+        must not share its name, nor the name of an earlier worker with the
+        same process ID.
+        """
+        if self.snapshot_owner != os.getpid():
+            self.snapshot_owner = os.getpid()
+            self.snapshot_name = f"{os.getpid()}-{uuid.uuid4().hex[:12]}.json"
+        return self.snapshot_name
+
+    def maybe_flush(self):
+        """Flush if ``METRICS_FLUSH_INTERVAL`` has passed since the last flush."""
+        if not settings.METRICS_DIR:
+            return
+        last_flush = self.last_flush
+        if (
+            last_flush is not None
+            and time.monotonic() - last_flush < settings.METRICS_FLUSH_INTERVAL
+        ):
+            return
+        if self.flush_lock.acquire(blocking=False):
+            try:
+                self.flush()
+            finally:
+                self.flush_lock.release()
+
+    @contextmanager
+    def locked(self, directory, exclusive=False):
+        """
+        Hold the lock of the metrics directory for the block.
+
+        Scrapes share it; retiring snapshots takes it exclusively, so no
+        scrape counts a snapshot both on its own and in ``retired.json``.
+        """
+        directory.mkdir(parents=True, exist_ok=True)
+        with open(directory / ".lock", "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def read_snapshots(self, paths):
+        """Return the snapshots stored at ``paths``, skipping unreadable ones."""
+        snapshots = []
+        for path in paths:
+            try:
+                snapshots.append(json.loads(path.read_text()))
+            except (OSError, ValueError):
+                continue
+        return snapshots
+
+    def merge(self, snapshots):
+        """Return the values of ``snapshots`` summed per metric and labels."""
+        merged = {name: {} for name in self.metrics}
+        for snapshot in snapshots:
+            for name, values in snapshot.items():
+                metric = self.metrics.get(name)
+                if metric is None:
+                    continue
+                for key, value in values:
+                    key = tuple(key)
+                    current = merged[name].get(key)
+                    merged[name][key] = (
+                        value if current is None else metric.merge(current, value)
+                    )
+        return merged
+
+    def collect(self, directory=None):
+        """
+        Return the merged values of every process.
+
+        Without a metrics directory only this process's values are returned.
+        """
+        directory = directory or settings.METRICS_DIR
+        if not directory:
+            return self.merge([self.snapshot()])
+        self.flush(directory)
+        directory = Path(directory)
+        with self.locked(directory):
+            snapshots = self.read_snapshots(sorted(directory.glob("*.json")))
+        return self.merge(snapshots)
+
+    def retire(self, pid, directory=None):
+        """
+        Fold the snapshots of the exited process ``pid`` into ``retired.json``.
+
+        Returns the number of snapshot files folded and deleted.
+        """
+        directory = directory or settings.METRICS_DIR
+        if not directory:
+            return 0
+        directory = Path(directory)
+        with self.locked(directory, exclusive=True):
+            paths = list(directory.glob(f"{pid}-*.json"))
+            if not paths:
+                return 0
+            retired = directory / RETIRED_SNAPSHOT
+            merged = self.merge(self.read_snapshots([retired, *paths]))
+            snapshot = {
+                name: [[list(key), value] for key, value in values.items()]
+                for name, values in merged.items()
+            }
+            temporary = retired.with_suffix(".tmp")
+            temporary.write_text(json.dumps(snapshot))
+            os.replace(temporary, retired)
+            for path in paths:
+                path.unlink(missing_ok=True)
+        return len(paths)
+
+    def render(self, directory=None):
+        """Return the merged metrics in the Prometheus text format."""
+        lines = []
+        for name, values in self.collect(directory).items():
+            metric = self.metrics[name]
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            for key in sorted(values):
+                for sample in metric.samples(key, values[key]):
+                    lines.append(format_sample(*sample))
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+REQUEST_LATENCY = registry.histogram(
+    "http_request_duration_seconds",
+    "Time spent handling requests.",
+    ("view", "method", "status"),
+)
+RESPONSE_SIZE = registry.histogram(
+    "http_response_size_bytes",
+    "Size of response bodies.",
+    ("view",),
+    buckets=SIZE_BUCKETS,
+)
+DB_QUERIES = registry.histogram(
+    "db_queries_per_request",
+    "Number of database queries per request.",
+    ("view",),
+    buckets=COUNT_BUCKETS,
+)
+DB_QUERY_DURATION = registry.histogram(
+    "db_query_duration_seconds",
+    "Time spent in individual database queries.",
+    ("view",),
+)
+CACHE_REQUESTS = registry.counter(
+    "cache_requests_total",
+    "Cache lookups by result.",
+    ("cache", "result"),
+)
+COMPRESSION_SAVED_BYTES = registry.counter(
+    "http_compression_saved_bytes_total",
+    "Response bytes saved by compression.",
+    ("view", "encoding"),
+)
+
+
+@atexit.register
+def _flush_at_exit():
+    """Write the final snapshot of this process."""
+    try:
+        registry.flush()
+    except Exception:
+        pass
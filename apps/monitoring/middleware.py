@@ -0,0 +1,132 @@
+"""
+Middleware for the monitoring app.
+
+This module contains the middleware that times sampled requests and
+reports the result as a ``Server-Timing`` header and a structured log line,
+and the middleware that records request metrics.
+"""
+
+import json
+import logging
+import random
+from time import perf_counter
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from .db import observe_queries, time_query
+from .labels import view_label
+from .metrics import (
+    DB_QUERIES,
+    DB_QUERY_DURATION,
+    REQUEST_LATENCY,
+    RESPONSE_SIZE,
+    registry,
+)
+from .timing import current_timer, start_timer, stop_timer
+
+logger = logging.getLogger(__name__)
+
+
+class ServerTimingMiddleware:
+    """
+    Time the phases of a sampled fraction of requests.
+
+    ``SERVER_TIMING_SAMPLE_RATE`` (0.0 to 1.0) selects the fraction of
+    requests that are timed; the others pass through untouched. Phases are
+    recorded by ``apps.monitoring.mixins`` (auth, perm, filter, serialize),
+    by a query observer (db) and by this middleware (render, total). The
+    ``db`` phase overlaps with the phases its queries were issued from.
+
+    Keep this middleware first in ``MIDDLEWARE`` (after the health checks)
+    so ``total`` covers the whole middleware stack and ``render`` is
+    measured right before the response is rendered.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def sampled(self):
+        """Return whether the current request should be timed."""
+        rate = getattr(settings, "SERVER_TIMING_SAMPLE_RATE", 1.0)
+        return rate >= 1 or random.random() < rate
+
+    def __call__(self, request):
+        """Handle the request, timing it if it is sampled."""
+        if not self.sampled():
+            return self.get_response(request)
+
+        timer, token = start_timer()
+        try:
+            with observe_queries(time_query):
+                response = self.get_response(request)
+        finally:
+            stop_timer(token)
+        timer.finish()
+
+        response["Server-Timing"] = timer.server_timing()
+        logger.info(
+            json.dumps(
+                {
+                    "event": "request_timing",
+                    "method": request.method,
+                    "path": request.path,
+                    "view": view_label(request),
+                    "status": response.status_code,
+                    "queries": timer.counts.get("db", 0),
+                    "timings_ms": timer.as_dict(),
+                }
+            )
+        )
+        return response
+
+    def process_template_response(self, request, response):
+        """Time the rendering of DRF and template responses."""
+        timer = current_timer()
+        if timer is not None:
+            start = perf_counter()
+
+            def record_render(rendered):
+                timer.add("render", perf_counter() - start)
+
+            response.add_post_render_callback(record_render)
+        return response
+
+
+class MetricsMiddleware:
+    """
+    Record latency, response size and database metrics of every request.
+
+    Metrics are labelled with ``view_label`` so their cardinality is bounded
+    by the number of routes; see ``apps.monitoring.metrics``. Disabled by
+    ``REQUEST_METRICS``.
+    """
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_METRICS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        """Handle the request and record its metrics."""
+        query_durations = []
+
+        def record_query(sql, params, many, context, duration):
+            query_durations.append(duration)
+
+        start = perf_counter()
+        with observe_queries(record_query):
+            response = self.get_response(request)
+        duration = perf_counter() - start
+
+        view = view_label(request)
+        REQUEST_LATENCY.observe(
+            duration, view=view, method=request.method, status=response.status_code
+        )
+        if not response.streaming:
+            RESPONSE_SIZE.observe(len(response.content), view=view)
+        DB_QUERIES.observe(len(query_durations), view=view)
+        for query_duration in query_durations:
+            DB_QUERY_DURATION.observe(query_duration, view=view)
+        registry.maybe_flush()
+        return response
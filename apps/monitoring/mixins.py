@@ -0,0 +1,42 @@
+"""
+DRF mixins that report request phases to the monitoring app.
+
+Views and serializers that use these mixins attribute their time to the
+``auth``, ``perm``, ``filter`` and ``serialize`` phases of the current
+``RequestTimer`` (see ``apps.monitoring.timing``).
+"""
+
+from .timing import phase
+
+
+class TimedViewMixin:
+    """Time authentication, permission checks and filter backends."""
+
+    def perform_authentication(self, request):
+        """Authenticate the request inside the ``auth`` phase."""
+        with phase("auth"):
+            super().perform_authentication(request)
+
+    def check_permissions(self, request):
+        """Check view permissions inside the ``perm`` phase."""
+        with phase("perm"):
+            super().check_permissions(request)
+
+    def check_object_permissions(self, request, obj):
+        """Check object permissions inside the ``perm`` phase."""
+        with phase("perm"):
+            super().check_object_permissions(request, obj)
+
+    def filter_queryset(self, queryset):
+        """Apply the filter backends inside the ``filter`` phase."""
+        with phase("filter"):
+            return super().filter_queryset(queryset)
+
+
+class TimedSerializerMixin:
+    """Time the conversion of instances to primitive data."""
+
+    def to_representation(self, instance):
+        """Serialize ``instance`` inside the ``serialize`` phase."""
+        with phase("serialize"):
+            return super().to_representation(instance)
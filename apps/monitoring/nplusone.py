@@ -0,0 +1,133 @@
+"""
+N+1 query detection.
+
+``detect_queries()`` records the statements executed inside a block and
+groups them by normalized shape. A shape executed ``repeat_threshold``
+times or more is reported as a probable N+1 pattern, together with the
+stack of the call that crossed the threshold.
+
+The detector backs the ``query_budget`` pytest marker and fixture (see
+``apps.monitoring.pytest_plugin``) and ``NPlusOneMiddleware``, which logs
+offending requests in staging.
+"""
+
+import json
+import logging
+import traceback
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from .db import instrument_queries
+from .labels import view_label
+from .sql import normalize_sql
+
+logger = logging.getLogger(__name__)
+
+# Number of innermost stack frames kept for each repeated shape.
+STACK_DEPTH = 20
+
+# Transaction control is repeated by design and never an N+1 pattern.
+IGNORED_PREFIXES = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+
+
+@dataclass
+class RepeatedShape:
+    """A statement shape executed at least ``repeat_threshold`` times."""
+
+    shape: str
+    count: int
+    stack: list = field(default_factory=list)
+
+    def describe(self):
+        """Return a multi-line description including the offending stack."""
+        lines = [f"{self.count}x {self.shape}"]
+        lines.extend(f"    {line.rstrip()}" for line in self.stack)
+        return "\n".join(lines)
+
+
+class QueryRecorder:
+    """Execute wrapper counting statements by normalized shape."""
+
+    def __init__(self, repeat_threshold):
+        self.repeat_threshold = repeat_threshold
+        self.total = 0
+        self.counts = {}
+        self.stacks = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        """Count ``sql`` and execute it."""
+        self.total += 1
+        if not sql.lstrip().upper().startswith(IGNORED_PREFIXES):
+            shape = normalize_sql(sql)
+            count = self.counts[shape] = self.counts.get(shape, 0) + 1
+            if count == self.repeat_threshold:
+                self.stacks[shape] = traceback.format_stack()[-STACK_DEPTH - 1 : -1]
+        return execute(sql, params, many, context)
+
+    def repeated(self):
+        """Return the shapes executed at least ``repeat_threshold`` times."""
+        return [
+            RepeatedShape(shape, count, self.stacks.get(shape, []))
+            for shape, count in self.counts.items()
+            if count >= self.repeat_threshold
+        ]
+
+
+@contextmanager
+def detect_queries(repeat_threshold=None):
+    """Record the statements executed in the block; yields a QueryRecorder."""
+    recorder = QueryRecorder(repeat_threshold or settings.NPLUSONE_REPEAT_THRESHOLD)
+    with instrument_queries(recorder):
+        yield recorder
+
+
+def budget_violations(recorder, max_queries=None):
+    """
+    Return human readable violations of a query budget.
+
+    A budget is exceeded when more than ``max_queries`` statements ran or
+    when any shape was repeated ``repeat_threshold`` times or more.
+    """
+    violations = []
+    if max_queries is not None and recorder.total > max_queries:
+        violations.append(f"{recorder.total} queries executed, budget is {max_queries}")
+    for repeated in recorder.repeated():
+        violations.append(f"probable N+1 query:\n{repeated.describe()}")
+    return violations
+
+
+class NPlusOneMiddleware:
+    """
+    Log requests that repeat a statement shape ``NPLUSONE_REPEAT_THRESHOLD``
+    times or more, with the stack of the offending call.
+
+    Only active when ``NPLUSONE_LOG`` is enabled (the staging default).
+    """
+
+    def __init__(self, get_response):
+        if not settings.NPLUSONE_LOG:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        """Handle the request and log any repeated statement shape."""
+        with detect_queries() as recorder:
+            response = self.get_response(request)
+        for repeated in recorder.repeated():
+            logger.warning(
+                json.dumps(
+                    {
+                        "event": "n_plus_one",
+                        "method": request.method,
+                        "path": request.path,
+                        "view": view_label(request),
+                        "count": repeated.count,
+                        "sql": repeated.shape,
+                        "stack": [line.rstrip() for line in repeated.stack],
+                    }
+                )
+            )
+        return response
@@ -0,0 +1,302 @@
+"""
+On-demand sampling profiler for live requests.
+
+``ProfilingMiddleware`` profiles a request when it carries a valid
+``X-Profile-Token`` header (a token signed for a staff user, generated on
+the admin profiles page) or when its view is listed in ``PROFILER_VIEWS``
+and it falls within that view's sample rate. While the view runs, a
+background thread samples the request thread's stack every
+``PROFILER_INTERVAL_MS`` milliseconds.
+
+Profiles are written to ``PROFILER_DIR`` in the collapsed-stack format
+(``frame;frame;frame count`` per line), which speedscope and flamegraph
+tools import directly. Each write prunes the directory down to the newest
+``PROFILER_MAX_FILES`` profiles younger than ``PROFILER_MAX_AGE`` seconds; ``to_speedscope`` converts them to speedscope's
+own JSON format and ``diff_profiles`` compares two of them.
+"""
+
+import os
+import random
+import sys
+import threading
+from dataclasses import dataclass
+from datetime import timedelta
+from pathlib import Path
+from time import perf_counter
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.utils import timezone
+
+from .labels import view_label
+
+TOKEN_HEADER = "X-Profile-Token"
+TOKEN_SALT = "apps.monitoring.profiling"
+EXTENSION = ".collapsed"
+SEPARATOR = "--"
+# Format of the capture time in profile names; sorts chronologically.
+TIME_FORMAT = "%Y%m%dT%H%M%S%f"
+
+
+def frame_name(code):
+    """Return the collapsed-stack name of a code object."""
+    path = Path(code.co_filename)
+    for root in (Path(settings.BASE_DIR), *map(Path, sys.path)):
+        if root.name and path.is_relative_to(root):
+            path = path.relative_to(root)
+            break
+    return f"{code.co_name} ({path}:{code.co_firstlineno})".replace(";", ":")
+
+
+class Sampler(threading.Thread):
+    """Thread collecting stack samples of another thread."""
+
+    def __init__(self, thread_id, interval):
+        super().__init__(name="profiler-sampler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = {}
+        self.stopped = threading.Event()
+        self.names = {}
+
+    def run(self):
+        """Sample until ``stop`` is called."""
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                name = self.names.get(code)
+                if name is None:
+                    name = self.names[code] = frame_name(code)
+                stack.append(name)
+                frame = frame.f_back
+            key = ";".join(reversed(stack))
+            self.samples[key] = self.samples.get(key, 0) + 1
+
+    def stop(self):
+        """Stop sampling and wait for the thread to finish."""
+        self.stopped.set()
+        self.join()
+
+
+@dataclass(frozen=True)
+class Profile:
+    """A stored profile and the metadata encoded in its file name."""
+
+    path: Path
+    view: str
+    captured_at: str
+    duration_ms: int
+    pid: int
+
+    @property
+    def name(self):
+        """Return the file name identifying the profile."""
+        return self.path.name
+
+    @classmethod
+    def from_path(cls, path):
+        """Return the Profile stored at ``path``, or None if it is not one."""
+        try:
+            captured_at, view, duration, pid = path.stem.split(SEPARATOR)
+            return cls(path, view, captured_at, int(duration[:-2]), int(pid))
+        except ValueError:
+            return None
+
+    def read(self):
+        """Return the samples of the profile keyed by collapsed stack."""
+        return parse_collapsed(self.path.read_text())
+
+
+def profile_dir():
+    """Return the directory profiles are stored in."""
+    return Path(settings.PROFILER_DIR)
+
+
+def write_profile(samples, view, duration):
+    """Store ``samples`` and return the resulting Profile."""
+    directory = profile_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    captured_at = timezone.now().strftime(TIME_FORMAT)
+    parts = (captured_at, view, f"{round(duration * 1000)}ms", str(os.getpid()))
+    path = directory / (SEPARATOR.join(parts) + EXTENSION)
+    path.write_text(
+        "".join(f"{stack} {count}\n" for stack, count in sorted(samples.items()))
+    )
+    prune_profiles()
+    return Profile.from_path(path)
+
+
+def prune_profiles():
+    """
+    Delete the profiles beyond ``PROFILER_MAX_FILES`` or ``PROFILER_MAX_AGE``.
+
+    Returns:
+        Number of deleted profiles.
+    """
+    profiles = list_profiles()
+    expired = profiles[settings.PROFILER_MAX_FILES :]
+    if settings.PROFILER_MAX_AGE:
+        cutoff = timezone.now() - timedelta(seconds=settings.PROFILER_MAX_AGE)
+        cutoff = cutoff.strftime(TIME_FORMAT)
+        expired += [
+            profile
+            for profile in profiles[: settings.PROFILER_MAX_FILES]
+            if profile.captured_at < cutoff
+        ]
+    for profile in expired:
+        # Another worker may be pruning the same directory.
+        profile.path.unlink(missing_ok=True)
+    return len(expired)
+
+
+def list_profiles():
+    """Return the stored profiles, newest first."""
+    paths = profile_dir().glob(f"*{EXTENSION}")
+    profiles = filter(None, map(Profile.from_path, paths))
+    return sorted(profiles, key=lambda profile: profile.captured_at, reverse=True)
+
+
+def get_profile(name):
+    """Return the stored profile called ``name``, or None."""
+    if Path(name).name != name or not name.endswith(EXTENSION):
+        return None
+    path = profile_dir() / name
+    return Profile.from_path(path) if path.is_file() else None
+
+
+def parse_collapsed(text):
+    """Return the samples of a collapsed-stack profile keyed by stack."""
+    samples = {}
+    for line in text.splitlines():
+        stack, _, count = line.rpartition(" ")
+        if stack:
+            samples[stack] = samples.get(stack, 0) + int(count)
+    return samples
+
+
+def to_speedscope(samples, name):
+    """Return ``samples`` as a speedscope file (a JSON-serializable dict)."""
+    frames, index = [], {}
+    stacks, weights = [], []
+    for stack, count in samples.items():
+        indices = []
+        for frame in stack.split(";"):
+            if frame not in index:
+                index[frame] = len(frames)
+                frames.append({"name": frame})
+            indices.append(index[frame])
+        stacks.append(indices)
+        weights.append(count)
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "name": name,
+        "exporter": "apps.monitoring.profiling",
+        "shared": {"frames": frames},
+        "profiles": [
+            {
+                "type": "sampled",
+                "name": name,
+                "unit": "none",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": stacks,
+                "weights": weights,
+            }
+        ],
+    }
+
+
+def function_shares(samples):
+    """
+    Return the self and total share of samples of every frame.
+
+    Returns:
+        Dictionary mapping frame name to (self share, total share).
+    """
+    total = sum(samples.values()) or 1
+    own, inclusive = {}, {}
+    for stack, count in samples.items():
+        frames = stack.split(";")
+        own[frames[-1]] = own.get(frames[-1], 0) + count
+        for frame in set(frames):
+            inclusive[frame] = inclusive.get(frame, 0) + count
+    return {
+        frame: (own.get(frame, 0) / total, inclusive[frame] / total)
+        for frame in inclusive
+    }
+
+
+def diff_profiles(before, after):
+    """
+    Compare the samples of two profiles.
+
+    Returns:
+        List of (frame, self share delta, total share delta) tuples, the
+        largest absolute change in self share first.
+    """
+    old, new = function_shares(before), function_shares(after)
+    rows = []
+    for frame in old.keys() | new.keys():
+        old_self, old_total = old.get(frame, (0.0, 0.0))
+        new_self, new_total = new.get(frame, (0.0, 0.0))
+        rows.append((frame, new_self - old_self, new_total - old_total))
+    return sorted(rows, key=lambda row: (-abs(row[1]), -abs(row[2]), row[0]))
+
+
+def make_token(user):
+    """Return a profiling token for the staff member ``user``."""
+    return signing.TimestampSigner(salt=TOKEN_SALT).sign(str(user.pk))
+
+
+def token_is_valid(token):
+    """Return whether ``token`` was issued recently for a staff user."""
+    try:
+        pk = signing.TimestampSigner(salt=TOKEN_SALT).unsign(
+            token, max_age=settings.PROFILER_TOKEN_MAX_AGE
+        )
+    except signing.BadSignature:
+        return False
+    return (
+        get_user_model().objects.filter(pk=pk, is_staff=True, is_active=True).exists()
+    )
+
+
+class ProfilingMiddleware:
+    """Profile requests selected by a signed header or per-view sampling."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        """Handle the request and store its profile if it was sampled."""
+        response = self.get_response(request)
+        sampler = getattr(request, "_profiler_sampler", None)
+        if sampler is not None:
+            sampler.stop()
+            duration = perf_counter() - request._profiler_started
+            profile = write_profile(sampler.samples, view_label(request), duration)
+            response["X-Profile-Id"] = profile.name
+        return response
+
+    def selected(self, request):
+        """Return whether ``request`` should be profiled."""
+        token = request.headers.get(TOKEN_HEADER)
+        if token:
+            return token_is_valid(token)
+        rate = settings.PROFILER_VIEWS.get(view_label(request))
+        return rate is not None and random.random() < rate
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        """Start sampling right before the view runs."""
+        if self.selected(request):
+            sampler = Sampler(
+                threading.get_ident(), settings.PROFILER_INTERVAL_MS / 1000
+            )
+            request._profiler_started = perf_counter()
+            request._profiler_sampler = sampler
+            sampler.start()
@@ -0,0 +1,63 @@
+"""
+Pytest plugin that guards tests against query explosions.
+
+Loaded by the project's root ``conftest.py``. It provides:
+
+- the ``query_budget`` marker, failing a test whose body runs more than
+  ``max_queries`` statements or repeats one statement shape
+  ``repeat_threshold`` times or more::
+
+      @pytest.mark.query_budget(max_queries=3)
+      def test_list(authenticated_client, todo_list): ...
+
+- the ``query_budget`` fixture, a context manager applying the same checks
+  to a block::
+
+      with query_budget(max_queries=3):
+          authenticated_client.get("/api/todos/")
+
+Fixture setup is not counted by the marker; only the test call is.
+"""
+
+from contextlib import contextmanager
+
+import pytest
+
+DEFAULT_REPEAT_THRESHOLD = 3
+
+
+def pytest_configure(config):
+    """Register the ``query_budget`` marker."""
+    config.addinivalue_line(
+        "markers",
+        "query_budget(max_queries=None, repeat_threshold=3): fail the test on "
+        "query-budget overruns or N+1 query patterns",
+    )
+
+
+@contextmanager
+def _check_budget(max_queries=None, repeat_threshold=DEFAULT_REPEAT_THRESHOLD):
+    """Fail the current test if the block exceeds its query budget."""
+    from .nplusone import budget_violations, detect_queries
+
+    with detect_queries(repeat_threshold) as recorder:
+        yield recorder
+    violations = budget_violations(recorder, max_queries)
+    if violations:
+        pytest.fail("Query budget exceeded:\n" + "\n".join(violations), pytrace=False)
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    """Apply the ``query_budget`` marker to the test call."""
+    marker = item.get_closest_marker("query_budget")
+    if marker is None:
+        return (yield)
+    with _check_budget(*marker.args, **marker.kwargs):
+        return (yield)
+
+
+@pytest.fixture
+def query_budget():
+    """Return a context manager failing the test on query-budget overruns."""
+    return _check_budget
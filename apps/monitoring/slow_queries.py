@@ -0,0 +1,211 @@
+"""
+Slow-query capture.
+
+``SlowQueryMiddleware`` observes the queries of every request with
+``capture_slow_queries`` (see ``apps.monitoring.db``). Statements slower than
+``SLOW_QUERY_THRESHOLD_MS`` are logged and kept in a bounded ring buffer
+of this worker process together with their normalized shape, originating
+view and call site. The ``EXPLAIN`` plan of each ``SELECT`` shape is
+captured once, the first time it is slow. ``SLOW_QUERY_LOG`` disables the
+capture.
+"""
+
+import json
+import logging
+import threading
+import traceback
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DatabaseError
+from django.utils import timezone
+
+from .db import observe_queries
+from .labels import view_label
+from .sql import normalize_sql, shape_id
+
+logger = logging.getLogger(__name__)
+
+_current_request = ContextVar("slow_query_request", default=None)
+_explaining = ContextVar("slow_query_explaining", default=False)
+
+MONITORING_DIR = Path(__file__).resolve().parent
+
+
+@dataclass
+class SlowQuery:
+    """One statement that exceeded the slow-query threshold."""
+
+    shape_id: str
+    shape: str
+    sql: str
+    duration: float
+    view: str
+    call_site: str
+    captured_at: object
+
+    @property
+    def duration_ms(self):
+        """Return the duration in milliseconds."""
+        return round(self.duration * 1000, 3)
+
+
+class SlowQueryLog:
+    """Bounded buffer of slow queries and the plans of their shapes."""
+
+    def __init__(self, maxlen):
+        self.entries = deque(maxlen=maxlen)
+        self.plans = {}
+        self.lock = threading.Lock()
+
+    def record(self, entry, plan=None):
+        """Add ``entry`` and, if given, the plan of its shape."""
+        with self.lock:
+            self.entries.append(entry)
+            if plan is not None:
+                self.plans[entry.shape_id] = plan
+            if len(self.plans) > self.entries.maxlen:
+                # Forget the plans of shapes that left the buffer.
+                kept = {item.shape_id for item in self.entries}
+                self.plans = {k: v for k, v in self.plans.items() if k in kept}
+
+    def has_plan(self, shape):
+        """Return whether the plan of ``shape`` was already captured."""
+        return shape in self.plans
+
+    def recent(self):
+        """Return the buffered entries, newest first."""
+        with self.lock:
+            return list(reversed(self.entries))
+
+    def shapes(self):
+        """
+        Return the buffered entries grouped by shape.
+
+        Returns:
+            List of dictionaries sorted by total time spent, slowest first.
+        """
+        groups = {}
+        for entry in self.recent():
+            group = groups.setdefault(
+                entry.shape_id,
+                {
+                    "shape_id": entry.shape_id,
+                    "shape": entry.shape,
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "views": set(),
+                    "call_sites": set(),
+                    "last_seen": entry.captured_at,
+                    "plan": self.plans.get(entry.shape_id),
+                },
+            )
+            group["count"] += 1
+            group["total_ms"] += entry.duration_ms
+            group["max_ms"] = max(group["max_ms"], entry.duration_ms)
+            group["views"].add(entry.view)
+            group["call_sites"].add(entry.call_site)
+        for group in groups.values():
+            group["total_ms"] = round(group["total_ms"], 3)
+            group["mean_ms"] = round(group["total_ms"] / group["count"], 3)
+        return sorted(groups.values(), key=lambda group: -group["total_ms"])
+
+    def clear(self):
+        """Forget every buffered entry and plan."""
+        with self.lock:
+            self.entries.clear()
+            self.plans.clear()
+
+
+slow_query_log = SlowQueryLog(settings.SLOW_QUERY_BUFFER_SIZE)
+
+
+def find_call_site():
+    """Return ``path:line in function`` of the innermost project frame."""
+    project_dir = Path(settings.BASE_DIR) / "apps"
+    for frame in reversed(traceback.extract_stack()):
+        path = Path(frame.filename)
+        if path.is_relative_to(project_dir) and not path.is_relative_to(MONITORING_DIR):
+            location = path.relative_to(settings.BASE_DIR)
+            return f"{location}:{frame.lineno} in {frame.name}"
+    return "unknown"
+
+
+def explain(connection, sql, params):
+    """
+    Return the plan of a ``SELECT`` statement, or None for other statements.
+    """
+    if not sql.lstrip()[:6].upper().startswith(("SELECT", "WITH")):
+        return None
+    token = _explaining.set(True)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f"{connection.ops.explain_query_prefix()} {sql}", params)
+            return "\n".join(str(row[-1]) for row in cursor.fetchall())
+    except DatabaseError as exc:
+        return f"EXPLAIN failed: {exc}"
+    finally:
+        _explaining.reset(token)
+
+
+def record_slow_query(sql, params, many, connection, duration):
+    """Store and log one slow statement."""
+    shape = normalize_sql(sql)
+    entry = SlowQuery(
+        shape_id=shape_id(shape),
+        shape=shape,
+        sql=sql,
+        duration=duration,
+        view=view_label(_current_request.get()),
+        call_site=find_call_site(),
+        captured_at=timezone.now(),
+    )
+    plan = None
+    if (
+        settings.SLOW_QUERY_EXPLAIN
+        and not many
+        and not slow_query_log.has_plan(entry.shape_id)
+    ):
+        plan = explain(connection, sql, params)
+    slow_query_log.record(entry, plan)
+    logger.warning(
+        json.dumps(
+            {
+                "event": "slow_query",
+                "shape_id": entry.shape_id,
+                "duration_ms": entry.duration_ms,
+                "view": entry.view,
+                "call_site": entry.call_site,
+                "sql": entry.shape,
+            }
+        )
+    )
+
+
+def capture_slow_queries(sql, params, many, context, duration):
+    """Query observer that records statements over the threshold."""
+    if duration * 1000 >= settings.SLOW_QUERY_THRESHOLD_MS and not _explaining.get():
+        record_slow_query(sql, params, many, context["connection"], duration)
+
+
+class SlowQueryMiddleware:
+    """Capture the slow queries issued while handling a request."""
+
+    def __init__(self, get_response):
+        if not settings.SLOW_QUERY_LOG:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        """Handle the request with slow-query capture installed."""
+        token = _current_request.set(request)
+        try:
+            with observe_queries(capture_slow_queries):
+                return self.get_response(request)
+        finally:
+            _current_request.reset(token)
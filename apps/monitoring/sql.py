@@ -0,0 +1,31 @@
+"""
+SQL helpers for the monitoring app.
+"""
+
+import hashlib
+import re
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_sql(sql):
+    """
+    Return the shape of ``sql``.
+
+    Placeholders, string and numeric literals become ``?`` and lists of
+    placeholders (``IN (%s, %s, ...)``) become ``(...)``, so statements that
+    only differ in their parameters share one shape.
+    """
+    sql = sql.replace("%s", "?")
+    sql = _STRING.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _PLACEHOLDER_LIST.sub("(...)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+def shape_id(shape):
+    """Return a short, stable identifier for a normalized SQL shape."""
+    return hashlib.sha1(shape.encode()).hexdigest()[:12]
@@ -0,0 +1,48 @@
+"""
+Pytest fixtures for the monitoring app tests.
+
+This module contains shared fixtures used across test modules.
+"""
+
+from django.contrib.auth import get_user_model
+
+from rest_framework.test import APIClient
+
+import pytest
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.todos.models import Todo
+
+User = get_user_model()
+
+
+@pytest.fixture
+def user(db):
+    """Create and return a test user."""
+    return User.objects.create_user(
+        username="testuser",
+        email="testuser@example.com",
+        password="testpass123",
+    )
+
+
+@pytest.fixture
+def api_client():
+    """Return an API client instance."""
+    return APIClient()
+
+
+@pytest.fixture
+def authenticated_client(api_client, user):
+    """Return an authenticated API client."""
+    refresh = RefreshToken.for_user(user)
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+    return api_client
+
+
+@pytest.fixture
+def user_todos(user):
+    """Create and return a batch of todos owned by the test user."""
+    return Todo.objects.bulk_create(
+        Todo(title=f"Todo {i}", user=user) for i in range(5)
+    )
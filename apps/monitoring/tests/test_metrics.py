@@ -0,0 +1,165 @@
+"""
+Tests for the metrics registry and the scrape endpoint.
+
+This module contains tests for metric export, cross-process merging and
+the cache hit/miss instrumentation.
+"""
+
+import json
+import os
+
+import pytest
+
+from apps.monitoring.cache import LocMemCache
+from apps.monitoring.metrics import CACHE_REQUESTS, Registry
+
+
+@pytest.fixture
+def registry():
+    """Return an empty registry with one counter and one histogram."""
+    registry = Registry()
+    registry.counter("jobs_total", "Jobs run.", ("queue",))
+    registry.histogram("job_seconds", "Job duration.", ("queue",), buckets=(0.1, 1))
+    return registry
+
+
+class TestRegistry:
+    """Tests for Registry."""
+
+    def test_render_prometheus_text(self, registry):
+        """Test the exposition format of counters and histograms."""
+        registry.metrics["jobs_total"].inc(queue="mail")
+        registry.metrics["jobs_total"].inc(2, queue="mail")
+        registry.metrics["job_seconds"].observe(0.05, queue="mail")
+        registry.metrics["job_seconds"].observe(0.5, queue="mail")
+        text = registry.render(directory="")
+
+        assert "# TYPE jobs_total counter" in text
+        assert 'jobs_total{queue="mail"} 3' in text
+        assert 'job_seconds_bucket{queue="mail",le="0.1"} 1' in text
+        assert 'job_seconds_bucket{queue="mail",le="1"} 2' in text
+        assert 'job_seconds_bucket{queue="mail",le="+Inf"} 2' in text
+        assert 'job_seconds_count{queue="mail"} 2' in text
+        assert 'job_seconds_sum{queue="mail"} 0.55' in text
+
+    def test_label_values_escaped(self, registry):
+        """Test that quotes in label values are escaped."""
+        registry.metrics["jobs_total"].inc(queue='say "hi"')
+        assert 'queue="say \\"hi\\""' in registry.render(directory="")
+
+    def test_merges_worker_snapshots(self, registry, tmp_path):
+        """Test that the snapshots of all workers are summed on scrape."""
+        registry.metrics["jobs_total"].inc(queue="mail")
+        other_worker = {
+            "jobs_total": [[["mail"], 4]],
+            "job_seconds": [[["mail"], {"buckets": [0, 1, 0], "sum": 0.3}]],
+        }
+        (tmp_path / "99999.json").write_text(json.dumps(other_worker))
+        text = registry.render(directory=tmp_path)
+
+        assert 'jobs_total{queue="mail"} 5' in text
+        assert 'job_seconds_count{queue="mail"} 1' in text
+        assert len(list(tmp_path.glob("*.json"))) == 2
+
+    def test_maybe_flush_respects_interval(self, registry, tmp_path, settings):
+        """Test that snapshots are written at most once per interval."""
+        settings.METRICS_DIR = str(tmp_path)
+        settings.METRICS_FLUSH_INTERVAL = 3600
+        registry.maybe_flush()
+        first = registry.last_flush
+        registry.maybe_flush()
+        assert registry.last_flush == first
+        assert len(list(tmp_path.glob("*.json"))) == 1
+
+    def test_snapshot_name_unique_per_boot(self, registry, tmp_path, monkeypatch):
+        """Test that a new process reusing a PID writes its own snapshot."""
+        registry.flush(tmp_path)
+        fresh = Registry()
+        fresh.counter("jobs_total", "Jobs run.", ("queue",))
+        fresh.flush(tmp_path)
+        assert len(list(tmp_path.glob("*.json"))) == 2
+        assert fresh.get_snapshot_name() != registry.get_snapshot_name()
+
+        name = registry.get_snapshot_name()
+        monkeypatch.setattr(os, "getpid", lambda: 1)
+        assert registry.get_snapshot_name() != name
+
+    def test_retire_folds_exited_worker(self, registry, tmp_path):
+        """Test that an exited worker's snapshots are folded and deleted."""
+        registry.metrics["jobs_total"].inc(queue="mail")
+        for boot, count in (("aaaa", 2), ("bbbb", 3)):
+            snapshot = {
+                "jobs_total": [[["mail"], count]],
+                "job_seconds": [[["mail"], {"buckets": [1, 0, 0], "sum": 0.05}]],
+            }
+            (tmp_path / f"99999-{boot}.json").write_text(json.dumps(snapshot))
+        before = registry.render(directory=tmp_path)
+
+        assert registry.retire(99999, tmp_path) == 2
+        assert registry.retire(99999, tmp_path) == 0
+        assert not list(tmp_path.glob("99999-*.json"))
+        assert (tmp_path / "retired.json").exists()
+        assert registry.render(directory=tmp_path) == before
+        assert 'jobs_total{queue="mail"} 6' in before
+        assert 'job_seconds_count{queue="mail"} 2' in before
+
+        (tmp_path / "99998-cccc.json").write_text(
+            json.dumps({"jobs_total": [[["mail"], 4]]})
+        )
+        registry.retire(99998, tmp_path)
+        assert 'jobs_total{queue="mail"} 10' in registry.render(directory=tmp_path)
+        assert len(list(tmp_path.glob("*.json"))) == 2
+
+
+@pytest.mark.django_db
+class TestMetricsEndpoint:
+    """Tests for the /metrics/ endpoint."""
+
+    def test_request_metrics_exported(self, authenticated_client, user_todos, settings):
+        """Test that API requests show up labelled by view and action."""
+        settings.DEBUG = True
+        authenticated_client.get("/api/todos/")
+        response = authenticated_client.get("/metrics/")
+        text = response.content.decode()
+
+        assert response.status_code == 200
+        assert response["Content-Type"].startswith("text/plain; version=0.0.4")
+        assert (
+            'http_request_duration_seconds_count{view="TodoViewSet.list",'
+            'method="GET",status="200"}' in text
+        )
+        assert 'db_queries_per_request_count{view="TodoViewSet.list"}' in text
+        assert 'http_response_size_bytes_count{view="TodoViewSet.list"}' in text
+
+    def test_token_required_when_configured(self, api_client, settings):
+        """Test that the endpoint checks METRICS_AUTH_TOKEN."""
+        settings.METRICS_AUTH_TOKEN = "s3cret"
+        assert api_client.get("/metrics/").status_code == 401
+        response = api_client.get("/metrics/", HTTP_AUTHORIZATION="Bearer s3cret")
+        assert response.status_code == 200
+
+    def test_closed_without_token_unless_debug(self, api_client, settings):
+        """Test that production never serves metrics without a token."""
+        settings.METRICS_AUTH_TOKEN = ""
+        settings.DEBUG = False
+        assert api_client.get("/metrics/").status_code == 403
+        settings.DEBUG = True
+        assert api_client.get("/metrics/").status_code == 200
+
+
+class TestInstrumentedCache:
+    """Tests for the instrumented cache backends."""
+
+    def test_counts_hits_and_misses(self):
+        """Test that get and get_many record hits and misses."""
+        cache = LocMemCache("metrics-test", {"METRICS_NAME": "test"})
+        hits = CACHE_REQUESTS.values.get(("test", "hit"), 0)
+        misses = CACHE_REQUESTS.values.get(("test", "miss"), 0)
+
+        cache.set("present", 1)
+        assert cache.get("present") == 1
+        assert cache.get("absent", "fallback") == "fallback"
+        assert cache.get_many(["present", "absent"]) == {"present": 1}
+
+        assert CACHE_REQUESTS.values[("test", "hit")] == hits + 2
+        assert CACHE_REQUESTS.values[("test", "miss")] == misses + 2
@@ -0,0 +1,96 @@
+"""
+Tests for the N+1 query detector.
+
+This module contains tests for the recorder, the pytest integration and
+the staging middleware.
+"""
+
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+
+import pytest
+
+from apps.monitoring.nplusone import (
+    NPlusOneMiddleware,
+    budget_violations,
+    detect_queries,
+)
+from apps.todos.models import Todo
+
+User = get_user_model()
+
+
+def load_owners(todos):
+    """Read the owner of every todo, one query per row without a join."""
+    return [todo.user.username for todo in todos]
+
+
+@pytest.mark.django_db
+class TestDetectQueries:
+    """Tests for detect_queries and budget_violations."""
+
+    def test_repeated_shape_reported(self, user_todos):
+        """Test that a query per row is reported with its stack."""
+        with detect_queries(repeat_threshold=3) as recorder:
+            load_owners(Todo.objects.all())
+
+        repeated = recorder.repeated()
+        assert len(repeated) == 1
+        assert repeated[0].count == len(user_todos)
+        assert '"users_user"' in repeated[0].shape
+        assert any("load_owners" in line for line in repeated[0].stack)
+
+    def test_joined_queryset_clean(self, user_todos):
+        """Test that select_related removes the repeated shape."""
+        with detect_queries(repeat_threshold=3) as recorder:
+            load_owners(Todo.objects.select_related("user"))
+
+        assert recorder.total == 1
+        assert budget_violations(recorder, max_queries=1) == []
+
+    def test_budget_overrun(self, user_todos):
+        """Test that exceeding max_queries is a violation."""
+        with detect_queries(repeat_threshold=10) as recorder:
+            Todo.objects.count()
+            User.objects.count()
+
+        assert budget_violations(recorder, max_queries=1) == [
+            "2 queries executed, budget is 1"
+        ]
+
+    def test_query_budget_fixture_fails(self, user_todos, query_budget):
+        """Test that the fixture fails the test on an N+1 pattern."""
+        with pytest.raises(pytest.fail.Exception, match="probable N\\+1 query"):
+            with query_budget():
+                load_owners(Todo.objects.all())
+
+
+@pytest.mark.django_db
+class TestNPlusOneMiddleware:
+    """Tests for NPlusOneMiddleware."""
+
+    def test_disabled_by_default(self, settings):
+        """Test that the middleware removes itself unless enabled."""
+        settings.NPLUSONE_LOG = False
+        with pytest.raises(MiddlewareNotUsed):
+            NPlusOneMiddleware(lambda request: HttpResponse())
+
+    def test_logs_offenders(self, rf, settings, user_todos, caplog):
+        """Test that repeated shapes are logged with a stack trace."""
+        settings.NPLUSONE_LOG = True
+        settings.NPLUSONE_REPEAT_THRESHOLD = 3
+
+        def view(request):
+            load_owners(Todo.objects.all())
+            return HttpResponse()
+
+        with caplog.at_level("WARNING", logger="apps.monitoring.nplusone"):
+            NPlusOneMiddleware(view)(rf.get("/api/todos/"))
+
+        record = json.loads(caplog.records[-1].getMessage())
+        assert record["event"] == "n_plus_one"
+        assert record["count"] == len(user_todos)
+        assert any("load_owners" in line for line in record["stack"])
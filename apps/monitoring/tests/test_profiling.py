@@ -0,0 +1,228 @@
+"""
+Tests for the sampling profiler.
+
+This module contains tests for the sampler, the profile formats, the
+profiling middleware, the admin pages and the diff_profiles command.
+"""
+
+import json
+import threading
+import time
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+
+import pytest
+
+from apps.monitoring.profiling import (
+    EXTENSION,
+    Sampler,
+    diff_profiles,
+    list_profiles,
+    make_token,
+    parse_collapsed,
+    to_speedscope,
+    write_profile,
+)
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def profile_dir(settings, tmp_path):
+    """Store profiles in a temporary directory."""
+    settings.PROFILER_DIR = str(tmp_path)
+    settings.PROFILER_INTERVAL_MS = 1
+    settings.PROFILER_VIEWS = {}
+    return tmp_path
+
+
+@pytest.fixture
+def staff_user(db):
+    """Create and return a staff user."""
+    return User.objects.create_superuser(
+        username="admin", email="admin@example.com", password="adminpass123"
+    )
+
+
+def busy_loop(seconds):
+    """Keep the CPU busy for ``seconds``."""
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+class TestSampler:
+    """Tests for Sampler."""
+
+    def test_samples_target_thread(self):
+        """Test that samples contain the frames of the sampled thread."""
+        sampler = Sampler(threading.get_ident(), interval=0.001)
+        sampler.start()
+        busy_loop(0.1)
+        sampler.stop()
+
+        assert sum(sampler.samples.values()) > 5
+        assert any("busy_loop (" in stack for stack in sampler.samples)
+        stack = next(stack for stack in sampler.samples if "busy_loop" in stack)
+        assert stack.split(";")[-1].startswith("busy_loop (apps/monitoring/tests/")
+
+
+class TestProfileFormats:
+    """Tests for the collapsed, speedscope and diff helpers."""
+
+    samples = {"main;handler;query": 6, "main;handler;render": 4}
+
+    def test_collapsed_round_trip(self):
+        """Test that stored profiles read back the same samples."""
+        profile = write_profile(self.samples, "TodoViewSet.toggle_complete", 0.0123)
+
+        assert profile.view == "TodoViewSet.toggle_complete"
+        assert profile.duration_ms == 12
+        assert profile.read() == self.samples
+        assert list_profiles() == [profile]
+
+    def test_retention_by_age(self, profile_dir):
+        """Test that writing a profile deletes profiles past PROFILER_MAX_AGE."""
+        stale = (
+            profile_dir / f"20000101T000000000000--TodoViewSet.list--5ms--1{EXTENSION}"
+        )
+        stale.write_text("a 1\n")
+        profile = write_profile(self.samples, "TodoViewSet.list", 0.01)
+
+        assert not stale.exists()
+        assert list_profiles() == [profile]
+
+    def test_retention_by_count(self, settings):
+        """Test that only the newest PROFILER_MAX_FILES profiles are kept."""
+        settings.PROFILER_MAX_FILES = 2
+        profiles = [
+            write_profile(self.samples, "TodoViewSet.list", 0.01) for _ in range(3)
+        ]
+
+        assert list_profiles() == profiles[:0:-1]
+
+    def test_speedscope(self):
+        """Test the speedscope sampled-profile structure."""
+        document = to_speedscope(self.samples, "list")
+        frames = [frame["name"] for frame in document["shared"]["frames"]]
+        profile = document["profiles"][0]
+
+        assert frames == ["main", "handler", "query", "render"]
+        assert profile["samples"] == [[0, 1, 2], [0, 1, 3]]
+        assert profile["weights"] == [6, 4]
+        assert profile["endValue"] == 10
+
+    def test_diff(self):
+        """Test that frames are ranked by the change of their self share."""
+        after = {"main;handler;query": 2, "main;handler;render": 8}
+        rows = {
+            frame: (own, total)
+            for frame, own, total in diff_profiles(self.samples, after)
+        }
+
+        assert rows["query"] == pytest.approx((-0.4, -0.4))
+        assert rows["render"] == pytest.approx((0.4, 0.4))
+        assert rows["main"] == pytest.approx((0.0, 0.0))
+        assert diff_profiles(self.samples, after)[0][0] in ("query", "render")
+
+    def test_parse_ignores_blank_lines(self):
+        """Test that empty lines are skipped."""
+        assert parse_collapsed("a;b 2\n\na;b 1\n") == {"a;b": 3}
+
+
+@pytest.mark.django_db
+class TestProfilingMiddleware:
+    """Tests for ProfilingMiddleware."""
+
+    def test_signed_header_profiles_request(
+        self, authenticated_client, user_todos, staff_user
+    ):
+        """Test that a staff token profiles the request."""
+        response = authenticated_client.get(
+            "/api/todos/", HTTP_X_PROFILE_TOKEN=make_token(staff_user)
+        )
+        profiles = list_profiles()
+
+        assert response.status_code == 200
+        assert [profile.name for profile in profiles] == [response["X-Profile-Id"]]
+        assert profiles[0].view == "TodoViewSet.list"
+
+    def test_invalid_token_ignored(self, authenticated_client, user_todos, user):
+        """Test that forged tokens and non-staff tokens are ignored."""
+        for token in ("forged", make_token(user)):
+            response = authenticated_client.get(
+                "/api/todos/", HTTP_X_PROFILE_TOKEN=token
+            )
+            assert "X-Profile-Id" not in response
+        assert list_profiles() == []
+
+    def test_view_sampling(self, authenticated_client, user_todos, settings):
+        """Test that views in PROFILER_VIEWS are profiled at their rate."""
+        settings.PROFILER_VIEWS = {"TodoViewSet.list": 1.0}
+        authenticated_client.get("/api/todos/")
+        authenticated_client.get(f"/api/todos/{user_todos[0].id}/")
+
+        assert [profile.view for profile in list_profiles()] == ["TodoViewSet.list"]
+
+
+@pytest.mark.django_db
+class TestProfileAdmin:
+    """Tests for the profile admin pages and the diff command."""
+
+    @pytest.fixture(autouse=True)
+    def plain_static_storage(self, settings):
+        """Render admin pages without the collected static manifest."""
+        settings.STORAGES = {
+            **settings.STORAGES,
+            "staticfiles": {
+                "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+            },
+        }
+
+    def test_list_token_and_diff(self, client, staff_user):
+        """Test listing, token generation and comparing profiles."""
+        before = write_profile({"a;b": 3, "a;c": 1}, "TodoViewSet.list", 0.01)
+        after = write_profile({"a;b": 1, "a;c": 3}, "TodoViewSet.list", 0.02)
+        client.force_login(staff_user)
+
+        response = client.get(reverse("profiles"))
+        assert response.status_code == 200
+        assert before.name in response.content.decode()
+
+        response = client.post(reverse("profiles"))
+        assert response.context["token"].startswith(f"{staff_user.pk}:")
+
+        response = client.get(
+            reverse("profiles"), {"before": before.name, "after": after.name}
+        )
+        assert response.context["diff"]["rows"][0][1] in (50.0, -50.0)
+
+    def test_download_speedscope(self, client, staff_user):
+        """Test downloading a profile in the speedscope format."""
+        profile = write_profile({"a;b": 3}, "TodoViewSet.list", 0.01)
+        client.force_login(staff_user)
+
+        response = client.get(
+            reverse("profile-download", args=[profile.name]), {"format": "speedscope"}
+        )
+        assert response.status_code == 200
+        assert json.loads(response.content)["profiles"][0]["weights"] == [3]
+        assert (
+            client.get(
+                reverse("profile-download", args=["missing.collapsed"])
+            ).status_code
+            == 404
+        )
+
+    def test_diff_command(self):
+        """Test the diff_profiles management command."""
+        before = write_profile({"a;b": 3, "a;c": 1}, "TodoViewSet.list", 0.01)
+        after = write_profile({"a;b": 1, "a;c": 3}, "TodoViewSet.list", 0.02)
+        out = StringIO()
+        call_command("diff_profiles", before.name, after.name, stdout=out)
+
+        assert "+50.00%" in out.getvalue()
+        assert "-50.00%" in out.getvalue()
@@ -0,0 +1,141 @@
+"""
+Tests for the request phase timing.
+
+This module contains tests for ServerTimingMiddleware and the timing helpers.
+"""
+
+import json
+
+from django.db import connection
+from django.urls import resolve
+
+import pytest
+
+from apps.monitoring.db import observe_queries
+from apps.monitoring.labels import view_label
+from apps.monitoring.timing import current_timer, phase, start_timer, stop_timer
+
+
+def parse_server_timing(header):
+    """Return the metrics of a Server-Timing header keyed by name."""
+    metrics = {}
+    for metric in header.split(", "):
+        name, *params = metric.split(";")
+        metrics[name] = dict(param.split("=", 1) for param in params)
+    return metrics
+
+
+class TestPhase:
+    """Tests for the phase context manager."""
+
+    def test_noop_without_timer(self):
+        """Test that phases outside a timed request are ignored."""
+        assert current_timer() is None
+        with phase("auth"):
+            pass
+
+    def test_nested_phase_counted_once(self):
+        """Test that nested blocks of one phase are only counted once."""
+        timer, token = start_timer()
+        try:
+            with phase("serialize"):
+                with phase("serialize"):
+                    pass
+            with phase("auth"):
+                pass
+        finally:
+            stop_timer(token)
+        assert timer.counts == {"serialize": 1, "auth": 1}
+
+
+@pytest.mark.django_db
+class TestObserveQueries:
+    """Tests for the shared query observer wrapper."""
+
+    def test_one_wrapper_for_every_observer(self):
+        """Test that nested observers share one wrapper and one timing."""
+        seen = []
+        wrappers = []
+        with observe_queries(lambda *args: seen.append(("outer", args[-1]))):
+            with observe_queries(lambda *args: seen.append(("inner", args[-1]))):
+                wrappers.extend(connection.execute_wrappers)
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+        assert len(wrappers) == 1
+        assert [name for name, _ in seen] == ["outer", "inner"]
+        assert seen[0][1] == seen[1][1]
+        assert connection.execute_wrappers == []
+
+    def test_request_installs_one_wrapper(self, authenticated_client, monkeypatch):
+        """Test that the monitoring middleware times each query once."""
+        counts = []
+        execute = connection.cursor
+
+        def counting_cursor(*args, **kwargs):
+            counts.append(len(connection.execute_wrappers))
+            return execute(*args, **kwargs)
+
+        monkeypatch.setattr(connection, "cursor", counting_cursor)
+        authenticated_client.get("/api/todos/")
+        assert counts and set(counts) == {1}
+
+
+@pytest.mark.django_db
+class TestServerTimingMiddleware:
+    """Tests for ServerTimingMiddleware."""
+
+    def test_list_reports_phases(self, authenticated_client, user_todos):
+        """Test that a todo list response carries every phase."""
+        response = authenticated_client.get("/api/todos/")
+        metrics = parse_server_timing(response["Server-Timing"])
+        for name in ("auth", "perm", "filter", "db", "serialize", "render", "total"):
+            assert float(metrics[name]["dur"]) >= 0
+        assert metrics["db"]["desc"].endswith('queries"')
+
+    def test_object_permission_timed(self, authenticated_client, user_todos):
+        """Test that object permission checks count as ``perm``."""
+        response = authenticated_client.post(
+            f"/api/todos/{user_todos[0].id}/toggle-complete/"
+        )
+        metrics = parse_server_timing(response["Server-Timing"])
+        assert "perm" in metrics
+        assert "filter" in metrics
+
+    def test_structured_log_line(self, authenticated_client, user_todos, caplog):
+        """Test that timed requests are logged as JSON."""
+        with caplog.at_level("INFO", logger="apps.monitoring.middleware"):
+            authenticated_client.get("/api/todos/")
+        record = json.loads(caplog.records[-1].getMessage())
+        assert record["event"] == "request_timing"
+        assert record["view"] == "TodoViewSet.list"
+        assert record["status"] == 200
+        assert record["queries"] >= 2
+        assert "total" in record["timings_ms"]
+
+    def test_unsampled_requests_untouched(
+        self, authenticated_client, user_todos, settings
+    ):
+        """Test that a sample rate of zero disables timing."""
+        settings.SERVER_TIMING_SAMPLE_RATE = 0.0
+        response = authenticated_client.get("/api/todos/")
+        assert "Server-Timing" not in response
+
+
+class TestViewLabel:
+    """Tests for view_label."""
+
+    def test_viewset_action(self, rf):
+        """Test that viewset routes are labelled with their action."""
+        request = rf.post("/api/todos/1/toggle-complete/")
+        request.resolver_match = resolve(request.path)
+        assert view_label(request) == "TodoViewSet.toggle_complete"
+
+    def test_class_based_view(self, rf):
+        """Test that class-based views are labelled with their class."""
+        request = rf.post("/api/auth/login/")
+        request.resolver_match = resolve(request.path)
+        assert view_label(request) == "TokenObtainPairView"
+
+    def test_unmatched(self, rf):
+        """Test that unresolved requests get a fixed label."""
+        assert view_label(rf.get("/missing/")) == "unmatched"
@@ -0,0 +1,189 @@
+"""
+Tests for the slow-query capture.
+
+This module contains tests for SQL normalization, the slow-query buffer,
+the capture middleware and the admin page.
+"""
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import MiddlewareNotUsed
+from django.urls import reverse
+from django.utils import timezone
+
+import pytest
+
+from apps.monitoring import slow_queries
+from apps.monitoring.slow_queries import SlowQuery, SlowQueryLog, slow_query_log
+from apps.monitoring.sql import normalize_sql
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def empty_log():
+    """Start and finish every test with an empty slow-query buffer."""
+    slow_query_log.clear()
+    yield
+    slow_query_log.clear()
+
+
+@pytest.fixture
+def capture_everything(settings):
+    """Treat every statement as slow."""
+    settings.SLOW_QUERY_THRESHOLD_MS = 0
+
+
+def make_entry(shape_id, duration=0.5):
+    """Return a SlowQuery for the buffer tests."""
+    return SlowQuery(
+        shape_id=shape_id,
+        shape="SELECT ?",
+        sql="SELECT 1",
+        duration=duration,
+        view="TodoViewSet.list",
+        call_site="apps/todos/views.py:1 in list",
+        captured_at=timezone.now(),
+    )
+
+
+class TestNormalizeSql:
+    """Tests for normalize_sql."""
+
+    def test_literals_and_placeholders(self):
+        """Test that parameters and literals do not change the shape."""
+        assert normalize_sql(
+            "SELECT * FROM t WHERE a = %s AND b = 'x''y' LIMIT 21"
+        ) == ("SELECT * FROM t WHERE a = ? AND b = ? LIMIT ?")
+
+    def test_in_lists_collapsed(self):
+        """Test that IN lists of any length share one shape."""
+        assert normalize_sql("SELECT 1 FROM t WHERE id IN (%s, %s)") == normalize_sql(
+            "SELECT 1 FROM t WHERE id IN (%s,\n %s, %s)"
+        )
+
+    def test_identifiers_kept(self):
+        """Test that digits inside identifiers are preserved."""
+        assert normalize_sql('SELECT "t1"."col2" FROM t1') == (
+            'SELECT "t1"."col2" FROM t1'
+        )
+
+
+class TestSlowQueryLog:
+    """Tests for SlowQueryLog."""
+
+    def test_buffer_is_bounded(self):
+        """Test that the oldest entries and their plans are dropped."""
+        log = SlowQueryLog(maxlen=2)
+        for shape in ("a", "b", "c"):
+            log.record(make_entry(shape), plan=f"plan {shape}")
+        assert [entry.shape_id for entry in log.recent()] == ["c", "b"]
+        assert set(log.plans) == {"b", "c"}
+
+    def test_shapes_grouped(self):
+        """Test that entries are grouped by shape, slowest total first."""
+        log = SlowQueryLog(maxlen=10)
+        log.record(make_entry("a", 0.1))
+        log.record(make_entry("b", 0.3))
+        log.record(make_entry("a", 0.3))
+        shapes = log.shapes()
+        assert [shape["shape_id"] for shape in shapes] == ["a", "b"]
+        assert shapes[0]["count"] == 2
+        assert shapes[0]["max_ms"] == 300.0
+
+
+@pytest.mark.django_db
+class TestSlowQueryMiddleware:
+    """Tests for SlowQueryMiddleware."""
+
+    def test_captures_view_and_call_site(
+        self, authenticated_client, user_todos, capture_everything
+    ):
+        """Test that slow statements record their view and call site."""
+        authenticated_client.get("/api/todos/")
+        todo_queries = [
+            entry for entry in slow_query_log.recent() if "todos_todo" in entry.shape
+        ]
+        assert todo_queries
+        assert {entry.view for entry in todo_queries} == {"TodoViewSet.list"}
+        assert all(
+            entry.call_site.startswith("apps/todos/views.py:") for entry in todo_queries
+        )
+
+    def test_plan_captured_once_per_shape(
+        self, authenticated_client, user_todos, capture_everything, monkeypatch
+    ):
+        """Test that EXPLAIN runs only the first time a shape is slow."""
+        calls = []
+        explain = slow_queries.explain
+
+        def counting_explain(connection, sql, params):
+            calls.append(sql)
+            return explain(connection, sql, params)
+
+        monkeypatch.setattr(slow_queries, "explain", counting_explain)
+        authenticated_client.get("/api/todos/")
+        first = len(calls)
+        authenticated_client.get("/api/todos/")
+
+        assert first > 0
+        assert len(calls) == first
+        plans = [
+            shape["plan"]
+            for shape in slow_query_log.shapes()
+            if "todos_todo" in shape["shape"] and "COUNT" not in shape["shape"]
+        ]
+        assert any("todos_todo" in plan for plan in plans)
+
+    def test_fast_queries_ignored(self, authenticated_client, user_todos, settings):
+        """Test that statements under the threshold are not recorded."""
+        settings.SLOW_QUERY_THRESHOLD_MS = 60_000
+        authenticated_client.get("/api/todos/")
+        assert slow_query_log.recent() == []
+
+    def test_disabled(self, settings):
+        """Test that the middleware is left out when disabled."""
+        settings.SLOW_QUERY_LOG = False
+        with pytest.raises(MiddlewareNotUsed):
+            slow_queries.SlowQueryMiddleware(lambda request: None)
+
+
+@pytest.mark.django_db
+class TestSlowQueryAdmin:
+    """Tests for the slow-query admin page."""
+
+    @pytest.fixture(autouse=True)
+    def plain_static_storage(self, settings):
+        """Render admin pages without the collected static manifest."""
+        settings.STORAGES = {
+            **settings.STORAGES,
+            "staticfiles": {
+                "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+            },
+        }
+
+    def test_staff_only(self, client, user):
+        """Test that non-staff users are sent to the admin login."""
+        client.force_login(user)
+        response = client.get(reverse("slow-queries"))
+        assert response.status_code == 302
+        assert "/admin/login/" in response["Location"]
+
+    def test_lists_shapes_and_plan(self, client, capture_everything):
+        """Test that staff users can browse shapes and their plans."""
+        admin = User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="adminpass123"
+        )
+        client.force_login(admin)
+        client.get(reverse("admin:index"))
+        shape = slow_query_log.shapes()[0]
+
+        response = client.get(reverse("slow-queries"))
+        assert response.status_code == 200
+        assert shape["shape_id"] in response.content.decode()
+
+        response = client.get(reverse("slow-queries"), {"shape": shape["shape_id"]})
+        assert response.status_code == 200
+        assert response.context["selected"]["shape_id"] == shape["shape_id"]
+
+        response = client.get(reverse("slow-queries"), {"shape": "missing"})
+        assert response.status_code == 404
@@ -0,0 +1,83 @@
+"""
+Tests for the traffic capture.
+
+This module contains tests for TrafficCaptureMiddleware and its helpers.
+"""
+
+import json
+
+from django.http import QueryDict
+
+import pytest
+
+from apps.monitoring.traffic import anonymize_params, user_bucket
+
+
+@pytest.fixture
+def capture_path(settings, tmp_path):
+    """Enable the capture middleware and return the log path."""
+    path = tmp_path / "traffic.jsonl"
+    settings.TRAFFIC_CAPTURE_PATH = str(path)
+    settings.TRAFFIC_CAPTURE_SAMPLE_RATE = 1.0
+    return path
+
+
+def read_log(path):
+    """Return the records of a capture log."""
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+class TestAnonymization:
+    """Tests for the anonymization helpers."""
+
+    def test_unsafe_values_replaced(self, settings):
+        """Test that only allow-listed parameter values are kept."""
+        settings.TRAFFIC_CAPTURE_SAFE_PARAMS = ("completed",)
+        params = anonymize_params(QueryDict("completed=true&search=" + "x" * 40))
+        assert params == {"completed": "true", "search": "q" * 32}
+
+    @pytest.mark.django_db
+    def test_user_bucket_is_stable(self, user, settings):
+        """Test that buckets are stable and bounded."""
+        settings.TRAFFIC_CAPTURE_USER_BUCKETS = 1000
+        bucket = user_bucket(user)
+        assert bucket == user_bucket(user)
+        assert 0 <= bucket < 1000
+        assert user_bucket(None) is None
+
+
+@pytest.mark.django_db
+class TestTrafficCaptureMiddleware:
+    """Tests for TrafficCaptureMiddleware."""
+
+    def test_records_request_shape(
+        self, authenticated_client, user_todos, capture_path
+    ):
+        """Test that API requests are recorded without their content."""
+        authenticated_client.get("/api/todos/", {"completed": "true", "search": "tax"})
+        authenticated_client.patch(
+            f"/api/todos/{user_todos[0].pk}/",
+            {"title": "Private title"},
+            format="json",
+        )
+        list_record, patch_record = read_log(capture_path)
+        assert list_record["m"] == "GET"
+        assert list_record["v"] == "todos:todo-list"
+        assert list_record["q"] == {"completed": "true", "search": "qqq"}
+        assert list_record["st"] == 200
+        assert patch_record["v"] == "todos:todo-detail"
+        assert patch_record["k"] == ["pk"]
+        assert patch_record["s"] > 0
+        assert patch_record["u"] == list_record["u"] is not None
+        assert "Private" not in capture_path.read_text()
+
+    def test_skips_other_paths(self, client, capture_path):
+        """Test that requests outside the prefixes are not recorded."""
+        client.get("/metrics/")
+        assert not capture_path.exists()
+
+    def test_disabled_without_path(self, authenticated_client, settings, tmp_path):
+        """Test that nothing is written when no path is configured."""
+        settings.TRAFFIC_CAPTURE_PATH = ""
+        assert authenticated_client.get("/api/todos/").status_code == 200
+        assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,95 @@
+"""
+Per-request phase timing.
+
+A ``RequestTimer`` is bound to the request being handled through a context
+variable. Code anywhere in the request can attribute time to a named phase
+with ``phase(name)``; when the request is not sampled this costs a single
+context variable lookup.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+
+_current_timer = ContextVar("request_timer", default=None)
+
+
+class RequestTimer:
+    """Accumulated durations of the phases of one request."""
+
+    def __init__(self):
+        self.started = perf_counter()
+        self.total = None
+        self.durations = {}
+        self.counts = {}
+        self.active = set()
+
+    def add(self, name, duration):
+        """Attribute ``duration`` seconds to the phase ``name``."""
+        self.durations[name] = self.durations.get(name, 0.0) + duration
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    def finish(self):
+        """Stop the clock for the whole request."""
+        self.total = perf_counter() - self.started
+
+    def as_dict(self):
+        """Return the phase durations in milliseconds."""
+        phases = {
+            name: round(value * 1000, 3) for name, value in self.durations.items()
+        }
+        if self.total is not None:
+            phases["total"] = round(self.total * 1000, 3)
+        return phases
+
+    def server_timing(self):
+        """Return the value of the ``Server-Timing`` header."""
+        metrics = []
+        for name, duration in self.as_dict().items():
+            metric = f"{name};dur={duration}"
+            if name == "db":
+                metric += f';desc="{self.counts[name]} queries"'
+            metrics.append(metric)
+        return ", ".join(metrics)
+
+
+def start_timer():
+    """
+    Bind a new RequestTimer to the current context.
+
+    Returns:
+        Tuple of (timer, token); pass the token to ``stop_timer``.
+    """
+    timer = RequestTimer()
+    return timer, _current_timer.set(timer)
+
+
+def stop_timer(token):
+    """Unbind the timer bound by ``start_timer``."""
+    _current_timer.reset(token)
+
+
+def current_timer():
+    """Return the timer of the current request, or None if it is not timed."""
+    return _current_timer.get()
+
+
+@contextmanager
+def phase(name):
+    """
+    Attribute the time spent in the block to the phase ``name``.
+
+    Nested blocks of the same phase (for example a serializer rendering
+    each item of a list) are only counted once, by the outermost block.
+    """
+    timer = _current_timer.get()
+    if timer is None or name in timer.active:
+        yield
+        return
+    timer.active.add(name)
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        timer.add(name, perf_counter() - start)
+        timer.active.discard(name)
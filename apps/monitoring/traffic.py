@@ -0,0 +1,117 @@
+"""
+Anonymized traffic capture.
+
+``TrafficCaptureMiddleware`` appends one JSON line per sampled request to
+``TRAFFIC_CAPTURE_PATH``. Lines record the shape of the request, not its
+content, so a log can be kept and replayed (see the ``replay_traffic``
+command) without holding personal data:
+
+- ``t``: arrival time (seconds since the epoch);
+- ``m``: method; ``v``: URL name; ``k``: names of the URL arguments;
+- ``q``: query parameters; values of parameters outside
+  ``TRAFFIC_CAPTURE_SAFE_PARAMS`` are replaced by a same-length
+  placeholder (truncated to 32 characters);
+- ``s``: request body size in bytes;
+- ``u``: user bucket, a keyed hash of the user id modulo
+  ``TRAFFIC_CAPTURE_USER_BUCKETS`` (null for anonymous requests);
+- ``st``: response status; ``d``: handling time in milliseconds.
+"""
+
+import hashlib
+import hmac
+import json
+import random
+import threading
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+PLACEHOLDER_MAX_LENGTH = 32
+
+
+def user_bucket(user):
+    """Return the anonymized bucket of ``user``, or None if anonymous."""
+    if user is None or not user.is_authenticated:
+        return None
+    digest = hmac.new(
+        settings.SECRET_KEY.encode(), str(user.pk).encode(), hashlib.sha256
+    ).digest()
+    return int.from_bytes(digest[:8], "big") % settings.TRAFFIC_CAPTURE_USER_BUCKETS
+
+
+def anonymize_params(query_dict):
+    """Return the query parameters with unsafe values replaced."""
+    safe = settings.TRAFFIC_CAPTURE_SAFE_PARAMS
+    params = {}
+    for key in query_dict:
+        value = query_dict.get(key)
+        if key not in safe:
+            value = "q" * min(len(value), PLACEHOLDER_MAX_LENGTH)
+        params[key] = value
+    return params
+
+
+def body_size(request):
+    """Return the size of the request body from its Content-Length."""
+    try:
+        return int(request.META.get("CONTENT_LENGTH") or 0)
+    except ValueError:
+        return 0
+
+
+def request_shape(request, response, duration):
+    """Return the capture record of a handled request."""
+    match = request.resolver_match
+    return {
+        "t": round(time.time(), 3),
+        "m": request.method,
+        "v": match.view_name,
+        "k": sorted(match.kwargs),
+        "q": anonymize_params(request.GET),
+        "s": body_size(request),
+        "u": user_bucket(getattr(request, "user", None)),
+        "st": response.status_code,
+        "d": round(duration * 1000, 3),
+    }
+
+
+class TrafficCaptureMiddleware:
+    """
+    Record the shape of sampled requests under ``TRAFFIC_CAPTURE_PREFIXES``.
+
+    Only active when ``TRAFFIC_CAPTURE_PATH`` is set. Lines are appended
+    with a single ``write`` to a file opened in append mode, so several
+    worker processes can share one log.
+    """
+
+    def __init__(self, get_response):
+        if not settings.TRAFFIC_CAPTURE_PATH:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.lock = threading.Lock()
+
+    def __call__(self, request):
+        """Handle the request and record its shape if it is sampled."""
+        start = time.perf_counter()
+        response = self.get_response(request)
+        if self.sampled(request):
+            shape = request_shape(request, response, time.perf_counter() - start)
+            self.write(shape)
+        return response
+
+    def sampled(self, request):
+        """Return whether the request should be recorded."""
+        if request.resolver_match is None or not request.resolver_match.view_name:
+            return False
+        if not request.path.startswith(settings.TRAFFIC_CAPTURE_PREFIXES):
+            return False
+        rate = settings.TRAFFIC_CAPTURE_SAMPLE_RATE
+        return rate >= 1 or random.random() < rate
+
+    def write(self, shape):
+        """Append one record to the capture log."""
+        line = json.dumps(shape, separators=(",", ":")) + "\n"
+        with self.lock:
+            with open(settings.TRAFFIC_CAPTURE_PATH, "a", encoding="utf-8") as log:
+                log.write(line)
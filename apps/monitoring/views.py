@@ -0,0 +1,134 @@
+"""
+Views for the monitoring app.
+
+This module contains the Prometheus scrape endpoint and the admin pages
+listing slow queries and stored profiles.
+"""
+
+import json
+import os
+
+from django.conf import settings
+from django.contrib import admin
+from django.http import Http404, HttpResponse
+from django.template.response import TemplateResponse
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.http import require_GET
+
+from .metrics import registry
+from .profiling import (
+    TOKEN_HEADER,
+    diff_profiles,
+    get_profile,
+    list_profiles,
+    make_token,
+    to_speedscope,
+)
+from .slow_queries import slow_query_log
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@require_GET
+def metrics(request):
+    """
+    Return the metrics of every worker in the Prometheus text format.
+
+    Scrapers must send ``METRICS_AUTH_TOKEN`` as a bearer token. Without a
+    token the endpoint is only open while ``DEBUG`` is on.
+    """
+    token = settings.METRICS_AUTH_TOKEN
+    if token:
+        header = request.headers.get("Authorization", "")
+        if not constant_time_compare(header, f"Bearer {token}"):
+            return HttpResponse(status=401)
+    elif not settings.DEBUG:
+        return HttpResponse(status=403)
+    return HttpResponse(registry.render(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+
+def slow_queries(request):
+    """
+    List the slow queries captured by this worker, grouped by shape.
+
+    ``?shape=<id>`` shows the plan and every buffered occurrence of one
+    shape. Mounted behind ``admin.site.admin_view``, so only staff users
+    can open it.
+    """
+    context = {
+        **admin.site.each_context(request),
+        "title": "Slow queries",
+        "threshold_ms": settings.SLOW_QUERY_THRESHOLD_MS,
+        "buffer_size": settings.SLOW_QUERY_BUFFER_SIZE,
+        "pid": os.getpid(),
+    }
+    selected = request.GET.get("shape")
+    shapes = slow_query_log.shapes()
+    if selected:
+        context["selected"] = next(
+            (shape for shape in shapes if shape["shape_id"] == selected), None
+        )
+        if context["selected"] is None:
+            raise Http404("Unknown query shape.")
+        context["entries"] = [
+            entry for entry in slow_query_log.recent() if entry.shape_id == selected
+        ]
+    else:
+        context["shapes"] = shapes
+    return TemplateResponse(request, "monitoring/slow_queries.html", context)
+
+
+def profiles(request):
+    """
+    List stored profiles and issue profiling tokens.
+
+    POSTing the form returns a token to send as the ``X-Profile-Token``
+    header; ``?before=<name>&after=<name>`` compares two profiles. Mounted
+    behind ``admin.site.admin_view``, so only staff users can open it.
+    """
+    context = {
+        **admin.site.each_context(request),
+        "title": "Profiles",
+        "profiles": list_profiles(),
+        "token_header": TOKEN_HEADER,
+        "token_max_age": settings.PROFILER_TOKEN_MAX_AGE,
+        "sampled_views": sorted(settings.PROFILER_VIEWS.items()),
+    }
+    if request.method == "POST":
+        context["token"] = make_token(request.user)
+
+    before, after = request.GET.get("before"), request.GET.get("after")
+    if before and after:
+        before, after = get_profile(before), get_profile(after)
+        if before is None or after is None:
+            raise Http404("Unknown profile.")
+        context["diff"] = {
+            "before": before,
+            "after": after,
+            "rows": [
+                (frame, round(own * 100, 2), round(total * 100, 2))
+                for frame, own, total in diff_profiles(before.read(), after.read())[:50]
+            ],
+        }
+    return TemplateResponse(request, "monitoring/profiles.html", context)
+
+
+def profile_download(request, name):
+    """
+    Return a stored profile as collapsed stacks, or as speedscope JSON with
+    ``?format=speedscope``.
+    """
+    profile = get_profile(name)
+    if profile is None:
+        raise Http404("Unknown profile.")
+    if request.GET.get("format") == "speedscope":
+        response = HttpResponse(
+            json.dumps(to_speedscope(profile.read(), profile.name)),
+            content_type="application/json",
+        )
+        filename = profile.path.with_suffix(".speedscope.json").name
+    else:
+        response = HttpResponse(profile.path.read_text(), content_type="text/plain")
+        filename = profile.name
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
@@ -2,7 +2,7 @@
 
 from django.contrib import admin
 
-from .models import Todo
+from .models import ArchivedTodo, Todo
 
 
 @admin.register(Todo)
@@ -28,3 +28,29 @@ class TodoAdmin(admin.ModelAdmin):
         ("Status", {"fields": ("completed", "priority", "due_date")}),
         ("Timestamps", {"fields": ("created_at", "updated_at")}),
     )
+
+
+@admin.register(ArchivedTodo)
+class ArchivedTodoAdmin(admin.ModelAdmin):
+    """Read-only admin configuration for the ArchivedTodo model."""
+
+    list_display = (
+        "title",
+        "user",
+        "priority",
+        "due_date",
+        "created_at",
+        "archived_at",
+    )
+    list_filter = ("priority", "archived_at")
+    search_fields = ("title", "user__username")
+    ordering = ("-archived_at",)
+    list_select_related = ("user",)
+
+    def has_add_permission(self, request):
+        """Archived to-dos are only created by the archive mover."""
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        """Archived to-dos are read-only."""
+        return False
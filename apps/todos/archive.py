@@ -0,0 +1,105 @@
+"""
+Archive tier for the todos app.
+
+This module moves old completed to-dos from ``todos_todo`` into
+``todos_archivedtodo`` in bounded batches.
+"""
+
+from dataclasses import dataclass
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import ArchivedTodo, Todo
+
+# Columns copied verbatim from the hot table into the archive table.
+ARCHIVED_COLUMNS = (
+    "id",
+    "title",
+    "description",
+    "completed",
+    "priority",
+    "due_date",
+    "created_at",
+    "updated_at",
+    "user_id",
+)
+
+
+@dataclass
+class ArchiveBatch:
+    """Result of moving a single batch of to-dos into the archive."""
+
+    moved: int
+    last_id: int
+
+
+def archivable_todos(older_than):
+    """Return completed to-dos last updated before ``older_than``."""
+    return Todo.objects.filter(completed=True, updated_at__lt=older_than)
+
+
+def archive_batch(older_than, batch_size=1000, after_id=0):
+    """
+    Move one batch of archivable to-dos into the archive table.
+
+    The batch is selected by ascending primary key starting after
+    ``after_id`` and moved with a single ``INSERT ... SELECT`` followed by a
+    ``DELETE`` inside one transaction, so an interrupted run never leaves a
+    to-do in both tiers and can simply be restarted. The selected rows are
+    locked where the database supports it, and both statements repeat the
+    archivable conditions, so a to-do reopened or edited in the meantime
+    stays in the hot table.
+
+    Returns:
+        ArchiveBatch, or None when there is nothing left to move.
+    """
+    with transaction.atomic():
+        ids = list(
+            archivable_todos(older_than)
+            .select_for_update()
+            .filter(id__gt=after_id)
+            .order_by("id")
+            .values_list("id", flat=True)[:batch_size]
+        )
+        if not ids:
+            return None
+
+        quote = connection.ops.quote_name
+        columns = ", ".join(quote(column) for column in ARCHIVED_COLUMNS)
+        placeholders = ", ".join(["%s"] * len(ids))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {quote(ArchivedTodo._meta.db_table)} "
+                f"({columns}, {quote('archived_at')}) "
+                f"SELECT {columns}, %s FROM {quote(Todo._meta.db_table)} "
+                f"WHERE {quote('id')} IN ({placeholders}) "
+                f"AND {quote('completed')} AND {quote('updated_at')} < %s",
+                [
+                    timezone.now(),
+                    *ids,
+                    connection.ops.adapt_datetimefield_value(older_than),
+                ],
+            )
+            moved = cursor.rowcount
+        archivable_todos(older_than).filter(id__in=ids).delete()
+
+    return ArchiveBatch(moved=moved, last_id=ids[-1])
+
+
+def archive_completed_todos(older_than, batch_size=1000, max_batches=None):
+    """
+    Move all archivable to-dos into the archive table, batch by batch.
+
+    Yields an ArchiveBatch after each committed batch so callers can report
+    progress or stop early.
+    """
+    last_id = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        batch = archive_batch(older_than, batch_size=batch_size, after_id=last_id)
+        if batch is None:
+            return
+        last_id = batch.last_id
+        batches += 1
+        yield batch
@@ -0,0 +1,202 @@
+"""
+API benchmark suite.
+
+Runs every endpoint of the API through Django's test client against a
+seeded dataset (see ``apps.todos.seeding``) and records latency
+percentiles and queries per request. Results are plain dictionaries that
+can be stored as JSON and compared with a stored baseline.
+"""
+
+import platform
+from dataclasses import dataclass
+from time import perf_counter
+from urllib.parse import urlencode
+
+import django
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework.test import APIClient
+
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.core.stats import summarize
+from apps.monitoring.db import instrument_queries
+
+from .explain import query_shapes
+from .seeding import PASSWORD
+
+
+class BenchmarkError(Exception):
+    """Raised when a benchmarked request does not succeed."""
+
+
+@dataclass(frozen=True)
+class BenchmarkCase:
+    """One request of the suite, repeated for every iteration."""
+
+    name: str
+    method: str
+    path: str
+    payload: object = None
+    authenticated: bool = True
+
+    def data(self):
+        """Return the request body, calling ``payload`` if it is callable."""
+        return self.payload() if callable(self.payload) else self.payload
+
+
+def build_cases(user, todo):
+    """
+    Return the benchmark cases for ``user``, using ``todo`` for detail routes.
+
+    The to-do list is benchmarked with every combination of filters,
+    search and ordering checked by ``apps.todos.explain``.
+    """
+    list_url = reverse("todos:todo-list")
+    detail_url = reverse("todos:todo-detail", args=[todo.pk])
+    todo_data = {
+        "title": "Benchmark to-do",
+        "description": "Created by the benchmark suite.",
+        "priority": "high",
+        "completed": False,
+    }
+    cases = [
+        BenchmarkCase(
+            f"list?{shape.name}",
+            "get",
+            f"{list_url}?{urlencode(shape.as_dict())}",
+        )
+        for shape in query_shapes()
+        if shape.action == "list"
+    ]
+    cases += [
+        BenchmarkCase("upcoming", "get", reverse("todos:todo-upcoming")),
+        BenchmarkCase("overdue", "get", reverse("todos:todo-overdue")),
+        BenchmarkCase("retrieve", "get", detail_url),
+        BenchmarkCase("create", "post", list_url, todo_data),
+        BenchmarkCase("update", "put", detail_url, todo_data),
+        BenchmarkCase("partial_update", "patch", detail_url, {"priority": "low"}),
+        BenchmarkCase(
+            "toggle_complete",
+            "post",
+            reverse("todos:todo-toggle-complete", args=[todo.pk]),
+        ),
+        BenchmarkCase(
+            "login",
+            "post",
+            reverse("users:login"),
+            {"username": user.username, "password": PASSWORD},
+            authenticated=False,
+        ),
+        # Refresh tokens are rotated and blacklisted, so each request
+        # needs a fresh one.
+        BenchmarkCase(
+            "refresh",
+            "post",
+            reverse("users:token-refresh"),
+            lambda: {"refresh": str(RefreshToken.for_user(user))},
+            authenticated=False,
+        ),
+    ]
+    return cases
+
+
+def run_case(case, user, iterations, warmup=0):
+    """
+    Run ``case`` ``warmup + iterations`` times and summarize the timed runs.
+
+    Returns:
+        Dictionary with count, mean and p50/p95/p99 latency in milliseconds
+        and the maximum number of queries per request.
+    """
+    client = APIClient()
+    if case.authenticated:
+        access = RefreshToken.for_user(user).access_token
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+    request = getattr(client, case.method)
+
+    query_count = 0
+
+    def count_query(execute, sql, params, many, context):
+        nonlocal query_count
+        query_count += 1
+        return execute(sql, params, many, context)
+
+    latencies, queries = [], []
+    for iteration in range(warmup + iterations):
+        data = case.data()
+        query_count = 0
+        with instrument_queries(count_query):
+            start = perf_counter()
+            response = request(case.path, data, format="json")
+            elapsed = perf_counter() - start
+        if response.status_code >= 400:
+            raise BenchmarkError(
+                f"{case.name}: {case.method.upper()} {case.path} returned "
+                f"{response.status_code}"
+            )
+        if iteration >= warmup:
+            latencies.append(elapsed)
+            queries.append(query_count)
+    return {**summarize(latencies), "queries": max(queries, default=0)}
+
+
+def run_suite(cases, user, iterations, warmup=0, meta=None, progress=None):
+    """
+    Run every case and return the results document.
+
+    ``progress`` is called with the name and summary of each finished case.
+    """
+    results = {}
+    for case in cases:
+        results[case.name] = run_case(case, user, iterations, warmup)
+        if progress is not None:
+            progress(case.name, results[case.name])
+    return {
+        "meta": {
+            "created_at": timezone.now().isoformat(),
+            "vendor": connection.vendor,
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "iterations": iterations,
+            "warmup": warmup,
+            **(meta or {}),
+        },
+        "results": results,
+    }
+
+
+def compare(results, baseline, tolerance=0.25, min_delta_ms=1.0):
+    """
+    Compare a results document with a baseline document.
+
+    A case regresses when its p95 latency grew by more than ``tolerance``
+    (a fraction) and by at least ``min_delta_ms``, or when it runs more
+    queries per request than in the baseline.
+
+    Returns:
+        List of (case name, reason) tuples.
+    """
+    regressions = []
+    known = baseline.get("results", {})
+    for name, current in results["results"].items():
+        expected = known.get(name)
+        if expected is None:
+            continue
+        if current["queries"] > expected["queries"]:
+            regressions.append(
+                (name, f"queries {expected['queries']} -> {current['queries']}")
+            )
+        delta = current["p95_ms"] - expected["p95_ms"]
+        if delta >= min_delta_ms and current["p95_ms"] > expected["p95_ms"] * (
+            1 + tolerance
+        ):
+            regressions.append(
+                (
+                    name,
+                    f"p95 {expected['p95_ms']:.2f} ms -> {current['p95_ms']:.2f} ms",
+                )
+            )
+    return regressions
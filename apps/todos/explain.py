@@ -0,0 +1,264 @@
+"""
+Query-plan analysis for the todos app.
+
+This module enumerates the query shapes ``TodoViewSet`` can generate,
+runs ``EXPLAIN`` on them, flags plans that fall back to full scans or
+explicit sorts, and proposes indexes that would cover them.
+"""
+
+import itertools
+import json
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.utils.dateparse import parse_datetime
+
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from .models import Todo
+from .pagination import DueDateKeysetPagination
+
+BASELINE_PATH = Path(__file__).resolve().parent / "query_plans.json"
+
+# Query parameters exercised by ``query_shapes``.
+FILTER_PARAMS = (
+    {},
+    {"completed": "true"},
+    {"completed": "false"},
+    {"priority": "high"},
+    {
+        "due_date_from": "2000-01-01T00:00:00Z",
+        "due_date_to": "2000-12-31T00:00:00Z",
+    },
+    {"completed": "false", "priority": "high"},
+)
+SEARCH_PARAMS = ({}, {"search": "report"})
+# Keyset-paginated actions, explained for the first and a later page.
+DUE_DATE_ACTIONS = ("upcoming", "overdue")
+CURSOR_POSITION = ("2000-06-01T00:00:00+00:00", 1)
+
+ORDERING_PARAMS = (
+    {},
+    {"ordering": "created_at"},
+    {"ordering": "-created_at"},
+    {"ordering": "due_date"},
+    {"ordering": "-due_date"},
+    {"ordering": "priority"},
+    {"ordering": "-priority"},
+)
+
+SQLITE_SCAN = re.compile(r"\bSCAN (?:TABLE )?(\w+)\b(?! USING)")
+SQLITE_SORT = re.compile(r"USE TEMP B-TREE FOR (?:RIGHT PART OF )?ORDER BY")
+SQLITE_INDEX = re.compile(r"USING (?:COVERING )?INDEX (\w+)")
+POSTGRES_SCAN = re.compile(r"Seq Scan on (\w+)")
+POSTGRES_SORT = re.compile(r"^\s*(?:->\s*)?(?:Incremental )?Sort\b", re.MULTILINE)
+POSTGRES_INDEX = re.compile(
+    r"(?:Index (?:Only )?Scan(?: Backward)? using|Bitmap Index Scan on) (\w+)"
+)
+
+
+@dataclass(frozen=True)
+class QueryShape:
+    """A viewset action together with its query parameters."""
+
+    params: tuple
+    action: str = "list"
+
+    @property
+    def name(self):
+        """Return a stable, human readable identifier for the shape."""
+        query = urlencode(sorted(self.params))
+        if self.action != "list":
+            return f"{self.action}?{query}" if query else self.action
+        return query or "default"
+
+    def as_dict(self):
+        """Return the query parameters as a dictionary."""
+        return dict(self.params)
+
+
+@dataclass
+class PlanReport:
+    """Analysis of the plan of one query shape."""
+
+    shape: QueryShape
+    plan: str
+    seq_scan: bool = False
+    sort: bool = False
+    indexes: list = field(default_factory=list)
+
+    @property
+    def ok(self):
+        """Return whether the plan avoids full scans and explicit sorts."""
+        return not (self.seq_scan or self.sort)
+
+    def summary(self):
+        """Return the parts of the report stored in the baseline file."""
+        return {"seq_scan": self.seq_scan, "sort": self.sort}
+
+
+def query_shapes():
+    """Yield every query shape ``TodoViewSet`` is checked with."""
+    for filters, search, ordering in itertools.product(
+        FILTER_PARAMS, SEARCH_PARAMS, ORDERING_PARAMS
+    ):
+        params = {**filters, **search, **ordering}
+        yield QueryShape(params=tuple(sorted(params.items())))
+    for action in DUE_DATE_ACTIONS:
+        yield QueryShape(params=(), action=action)
+        yield QueryShape(params=(("cursor", "1"),), action=action)
+
+
+def build_queryset(shape, user):
+    """Return the queryset ``TodoViewSet`` evaluates for ``shape``."""
+    from .views import TodoViewSet
+
+    request = Request(APIRequestFactory().get("/api/todos/", shape.as_dict()))
+    request.user = user
+    view = TodoViewSet(
+        action=shape.action, request=request, format_kwarg=None, args=(), kwargs={}
+    )
+    if shape.action in DUE_DATE_ACTIONS:
+        position = None
+        if "cursor" in shape.as_dict():
+            position = (parse_datetime(CURSOR_POSITION[0]), CURSOR_POSITION[1])
+        return DueDateKeysetPagination().page_queryset(
+            view.get_due_queryset(), position
+        )
+    queryset = view.filter_queryset(view.get_queryset())
+    return queryset[: settings.REST_FRAMEWORK["PAGE_SIZE"]]
+
+
+def analyze_plan(plan, vendor=None):
+    """
+    Analyze an ``EXPLAIN`` plan produced by SQLite or PostgreSQL.
+
+    Returns:
+        Tuple of (seq_scan, sort, indexes).
+    """
+    vendor = vendor or connection.vendor
+    table = Todo._meta.db_table
+    if vendor == "postgresql":
+        scans = POSTGRES_SCAN.findall(plan)
+        sort = bool(POSTGRES_SORT.search(plan))
+        indexes = POSTGRES_INDEX.findall(plan)
+    else:
+        scans = SQLITE_SCAN.findall(plan)
+        sort = bool(SQLITE_SORT.search(plan))
+        indexes = SQLITE_INDEX.findall(plan)
+    return table in scans, sort, indexes
+
+
+def explain_shape(shape, user, force_index_plans=False):
+    """
+    Run ``EXPLAIN`` for ``shape`` and return a PlanReport.
+
+    With ``force_index_plans`` on PostgreSQL, sequential scans and sorts are
+    disabled for the statement, so the plan shows whether a suitable index
+    exists rather than what the planner picks for the current table size.
+    """
+    queryset = build_queryset(shape, user)
+    with transaction.atomic():
+        if force_index_plans and connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+                cursor.execute("SET LOCAL enable_sort = off")
+        plan = queryset.explain()
+    seq_scan, sort, indexes = analyze_plan(plan)
+    return PlanReport(
+        shape=shape, plan=plan, seq_scan=seq_scan, sort=sort, indexes=indexes
+    )
+
+
+def propose_index(shape):
+    """
+    Return a ``models.Index`` definition that would cover ``shape``.
+
+    Equality filters come first after ``user``, followed by the ordering
+    column; a ``completed=false`` filter becomes a partial index condition.
+    """
+    if shape.action in DUE_DATE_ACTIONS:
+        return (
+            "models.Index(fields=['user', 'due_date', 'id'], "
+            "condition=Q(completed=False, due_date__isnull=False))"
+        )
+
+    params = shape.as_dict()
+    fields = ["user"]
+    condition = None
+    if params.get("completed") == "false":
+        condition = "Q(completed=False)"
+    elif "completed" in params:
+        fields.append("completed")
+    if "priority" in params:
+        fields.append("priority")
+
+    ordering = params.get("ordering", "-created_at").lstrip("-")
+    if "due_date_from" in params or "due_date_to" in params:
+        if ordering != "due_date" and "due_date" not in fields:
+            fields.append("due_date")
+    if ordering not in fields:
+        fields.append(ordering)
+
+    definition = f"models.Index(fields={fields!r}"
+    if condition:
+        definition += f", condition={condition}"
+    return definition + ")"
+
+
+def explain_all(user, force_index_plans=False):
+    """Return a PlanReport for every query shape."""
+    return [
+        explain_shape(shape, user, force_index_plans=force_index_plans)
+        for shape in query_shapes()
+    ]
+
+
+def load_baseline(path=BASELINE_PATH):
+    """Load the stored plan baseline, keyed by database vendor."""
+    path = Path(path)
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def write_baseline(reports, path=BASELINE_PATH):
+    """Store the plans in ``reports`` as the baseline for this vendor."""
+    baseline = load_baseline(path)
+    baseline[connection.vendor] = {
+        report.shape.name: report.summary() for report in reports
+    }
+    Path(path).write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+
+
+def find_regressions(reports, baseline):
+    """
+    Compare ``reports`` with the baseline for the current vendor.
+
+    Returns:
+        List of (report, reason) tuples for shapes that used an index plan
+        in the baseline but now need a full scan or an explicit sort.
+    """
+    known = baseline.get(connection.vendor, {})
+    regressions = []
+    for report in reports:
+        expected = known.get(report.shape.name)
+        if expected is None:
+            continue
+        if report.seq_scan and not expected["seq_scan"]:
+            regressions.append((report, "now uses a sequential scan"))
+        if report.sort and not expected["sort"]:
+            regressions.append((report, "now needs an explicit sort"))
+    return regressions
+
+
+def explain_user():
+    """Return a user instance to bind the explained queries to."""
+    User = get_user_model()
+    return User.objects.order_by("pk").first() or User(pk=1)
@@ -6,7 +6,7 @@ This module contains filter classes for Todo queryset filtering.
 
 import django_filters
 
-from .models import Todo
+from .models import ArchivedTodo, Todo
 
 
 class TodoFilter(django_filters.FilterSet):
@@ -37,3 +37,10 @@ class TodoFilter(django_filters.FilterSet):
             "completed": ["exact"],
             "priority": ["exact"],
         }
+
+
+class ArchivedTodoFilter(TodoFilter):
+    """FilterSet for ArchivedTodo model, supporting the same filters as TodoFilter."""
+
+    class Meta(TodoFilter.Meta):
+        model = ArchivedTodo
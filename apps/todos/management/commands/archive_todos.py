@@ -0,0 +1,62 @@
+"""Management command that moves old completed to-dos into the archive."""
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.todos.archive import archive_completed_todos
+
+
+class Command(BaseCommand):
+    """
+    Move completed to-dos older than a threshold into the archive table.
+
+    Every batch is committed on its own, so the command can be interrupted
+    at any point and simply re-run to pick up where it stopped.
+    """
+
+    help = "Move completed to-dos older than a threshold into the archive table."
+
+    def add_arguments(self, parser):
+        """Register command line arguments."""
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=90,
+            help="Archive completed to-dos not updated for this many days.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of to-dos moved per transaction.",
+        )
+        parser.add_argument(
+            "--max-batches",
+            type=int,
+            default=None,
+            help="Stop after this many batches (default: run until done).",
+        )
+
+    def handle(self, *args, **options):
+        """Run the archive mover."""
+        if options["days"] < 0:
+            raise CommandError("--days must not be negative.")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+
+        older_than = timezone.now() - timedelta(days=options["days"])
+        total = 0
+        for batch in archive_completed_todos(
+            older_than,
+            batch_size=options["batch_size"],
+            max_batches=options["max_batches"],
+        ):
+            total += batch.moved
+            if options["verbosity"] > 1:
+                self.stdout.write(
+                    f"Archived {batch.moved} to-dos (up to id {batch.last_id})."
+                )
+
+        self.stdout.write(self.style.SUCCESS(f"Archived {total} to-dos."))
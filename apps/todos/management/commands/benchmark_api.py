@@ -0,0 +1,138 @@
+"""Management command that benchmarks every API endpoint."""
+
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from apps.todos.benchmark import BenchmarkError, build_cases, compare, run_suite
+from apps.todos.seeding import DatasetSpec, seed_dataset
+
+
+class Command(BaseCommand):
+    """
+    Benchmark the API against a seeded dataset in a throwaway database.
+
+    The command creates a test database, seeds ``--users`` users with
+    ``--todos-per-user`` to-dos each (deterministically from ``--seed``),
+    runs every endpoint ``--iterations`` times through the test client and
+    prints p50/p95/p99 latency and queries per request. ``--output`` saves
+    the results as JSON; ``--baseline`` compares them with a saved run and
+    ``--check`` fails when a case regressed.
+    """
+
+    help = "Benchmark every API endpoint against a seeded dataset."
+
+    def add_arguments(self, parser):
+        """Register command line arguments."""
+        parser.add_argument("--users", type=int, default=20)
+        parser.add_argument("--todos-per-user", type=int, default=500)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--iterations", type=int, default=30)
+        parser.add_argument("--warmup", type=int, default=3)
+        parser.add_argument(
+            "--only",
+            default="",
+            help="Only run cases whose name contains this text.",
+        )
+        parser.add_argument("--output", help="Write the results to this JSON file.")
+        parser.add_argument("--baseline", help="Compare with this results file.")
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Fail if a case regressed against --baseline.",
+        )
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=0.25,
+            help="Allowed relative p95 increase before a case regresses.",
+        )
+        parser.add_argument(
+            "--min-delta-ms",
+            type=float,
+            default=1.0,
+            help="Ignore p95 increases smaller than this many milliseconds.",
+        )
+
+    def handle(self, *args, **options):
+        """Seed a throwaway database, run the suite and report."""
+        if options["check"] and not options["baseline"]:
+            raise CommandError("--check requires --baseline.")
+        spec = DatasetSpec(
+            users=options["users"],
+            todos_per_user=options["todos_per_user"],
+            seed=options["seed"],
+        )
+
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False
+        )
+        try:
+            results = self.run(spec, options)
+        except BenchmarkError as exc:
+            raise CommandError(str(exc))
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        if options["output"]:
+            Path(options["output"]).write_text(json.dumps(results, indent=2) + "\n")
+            self.stdout.write(f"Results written to {options['output']}")
+        if options["baseline"]:
+            self.check_baseline(results, options)
+
+    def run(self, spec, options):
+        """Seed the dataset and run the selected cases."""
+        self.stdout.write(
+            f"Seeding {spec.users} users x {spec.todos_per_user} to-dos "
+            f"(seed {spec.seed})..."
+        )
+        user = seed_dataset(spec)[0]
+        cases = [
+            case
+            for case in build_cases(user, user.todos.order_by("id").first())
+            if options["only"] in case.name
+        ]
+        self.stdout.write(
+            f"{'case':<60} {'p50':>8} {'p95':>8} {'p99':>8} {'queries':>8}"
+        )
+        return run_suite(
+            cases,
+            user,
+            iterations=options["iterations"],
+            warmup=options["warmup"],
+            meta={
+                "users": spec.users,
+                "todos_per_user": spec.todos_per_user,
+                "seed": spec.seed,
+            },
+            progress=self.report,
+        )
+
+    def report(self, name, result):
+        """Print the summary of one case."""
+        self.stdout.write(
+            f"{name[:60]:<60} {result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} "
+            f"{result['p99_ms']:>8.2f} {result['queries']:>8}"
+        )
+
+    def check_baseline(self, results, options):
+        """Report regressions against the baseline and fail with --check."""
+        baseline = json.loads(Path(options["baseline"]).read_text())
+        regressions = compare(
+            results,
+            baseline,
+            tolerance=options["tolerance"],
+            min_delta_ms=options["min_delta_ms"],
+        )
+        if not regressions:
+            self.stdout.write(self.style.SUCCESS("No regressions against baseline."))
+            return
+        for name, reason in regressions:
+            self.stdout.write(self.style.WARNING(f"{name}: {reason}"))
+        if options["check"]:
+            raise CommandError(f"{len(regressions)} regression(s) against baseline.")
@@ -0,0 +1,98 @@
+"""Management command that explains the query shapes of the to-do list."""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from apps.todos.explain import (
+    BASELINE_PATH,
+    explain_all,
+    explain_user,
+    find_regressions,
+    load_baseline,
+    propose_index,
+    write_baseline,
+)
+
+
+class Command(BaseCommand):
+    """
+    Run EXPLAIN on every query shape ``TodoViewSet.list`` can generate.
+
+    Without options the command prints the shapes whose plans need a full
+    scan or an explicit sort, together with a proposed index. ``--check``
+    compares the plans with the stored baseline and fails when a shape
+    loses its index plan; ``--write-baseline`` records the current plans.
+    """
+
+    help = "Explain to-do list queries, propose indexes and check for plan regressions."
+
+    def add_arguments(self, parser):
+        """Register command line arguments."""
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Fail if a known query shape lost its index plan.",
+        )
+        parser.add_argument(
+            "--write-baseline",
+            action="store_true",
+            help="Store the current plans as the baseline for this database.",
+        )
+        parser.add_argument(
+            "--baseline",
+            default=str(BASELINE_PATH),
+            help="Path of the baseline file.",
+        )
+        parser.add_argument(
+            "--force-index-plans",
+            action="store_true",
+            help="On PostgreSQL, disable seq scans and sorts while explaining "
+            "(implied by --check and --write-baseline).",
+        )
+        parser.add_argument(
+            "--show-plans",
+            action="store_true",
+            help="Print the full plan of every query shape.",
+        )
+
+    def handle(self, *args, **options):
+        """Explain the query shapes."""
+        force = (
+            options["force_index_plans"]
+            or options["check"]
+            or options["write_baseline"]
+        )
+        reports = explain_all(explain_user(), force_index_plans=force)
+
+        for report in reports:
+            if options["show_plans"]:
+                self.stdout.write(f"-- {report.shape.name}\n{report.plan}\n")
+            if report.ok:
+                continue
+            problems = []
+            if report.seq_scan:
+                problems.append("sequential scan")
+            if report.sort:
+                problems.append("explicit sort")
+            self.stdout.write(
+                self.style.WARNING(f"{report.shape.name}: {', '.join(problems)}")
+            )
+            self.stdout.write(f"    proposed: {propose_index(report.shape)}")
+
+        flagged = sum(not report.ok for report in reports)
+        self.stdout.write(
+            f"{len(reports)} query shapes explained on {connection.vendor}, "
+            f"{flagged} flagged."
+        )
+
+        if options["write_baseline"]:
+            write_baseline(reports, options["baseline"])
+            self.stdout.write(self.style.SUCCESS("Baseline written."))
+
+        if options["check"]:
+            regressions = find_regressions(reports, load_baseline(options["baseline"]))
+            for report, reason in regressions:
+                self.stderr.write(f"{report.shape.name}: {reason}")
+            if regressions:
+                raise CommandError(f"{len(regressions)} query plan regressions found.")
+            self.stdout.write(self.style.SUCCESS("No query plan regressions."))
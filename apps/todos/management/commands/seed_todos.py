@@ -0,0 +1,213 @@
+"""Management command that generates large synthetic to-do datasets."""
+
+import multiprocessing
+import os
+import time
+from dataclasses import replace
+
+import django
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.utils import timezone
+
+from apps.todos.seeding import (
+    USER_PREFIX,
+    DatasetSpec,
+    adapt_rows,
+    chunk_rows,
+    deferred_indexes,
+    insert_todos,
+    load_todos,
+    seed_users,
+)
+
+
+def _init_worker():
+    """Set Django up in worker processes started with ``spawn``."""
+    if not apps.ready:
+        django.setup()
+
+
+def _generate_chunk(args):
+    """Return the adapted rows of one chunk of users for the parent to insert."""
+    seed, users, todos_per_user, now = args
+    return list(adapt_rows(chunk_rows(seed, users, todos_per_user, now)))
+
+
+def _copy_chunk(args):
+    """Generate one chunk of users and ``COPY`` it over this worker's connection."""
+    seed, users, todos_per_user, now, batch_size = args
+    rows = chunk_rows(seed, users, todos_per_user, now)
+    return load_todos(rows, batch_size=batch_size)
+
+
+class Command(BaseCommand):
+    """
+    Generate users and to-dos for performance environments.
+
+    Users are created first; their to-dos are then generated in chunks of
+    users by ``--workers`` processes. Every user's rows come from a random
+    generator seeded with ``--seed`` and the user's index, so a dataset is
+    identical whatever the number of workers. On PostgreSQL each worker
+    loads its chunks with ``COPY``; on SQLite, which allows a single
+    writer, workers only generate rows and the command inserts them in
+    large batches. Secondary indexes of ``todos_todo`` are dropped during
+    the load and rebuilt afterwards unless ``--keep-indexes`` is given.
+
+    Users are named ``<prefix><n>`` for ``n`` from ``--start``. Users that
+    already exist are left with their to-dos, so running the command again
+    only fills in missing users; use ``--start`` to add more.
+    """
+
+    help = "Generate users and to-dos quickly for performance testing."
+
+    def add_arguments(self, parser):
+        """Register command line arguments."""
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--todos-per-user", type=int, default=1000)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Number of generator processes (1 disables multiprocessing).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10000,
+            help="Rows per INSERT batch (COPY streams at least 50000).",
+        )
+        parser.add_argument(
+            "--prefix",
+            default=USER_PREFIX,
+            help="Username prefix of the generated users.",
+        )
+        parser.add_argument(
+            "--start",
+            type=int,
+            default=0,
+            help="Index of the first generated user.",
+        )
+        parser.add_argument(
+            "--keep-indexes",
+            action="store_true",
+            help="Keep secondary indexes during the load.",
+        )
+
+    def handle(self, *args, **options):
+        """Create the users, load their to-dos and report throughput."""
+        spec = DatasetSpec(
+            users=options["users"],
+            todos_per_user=options["todos_per_user"],
+            seed=options["seed"],
+        )
+        if spec.users < 1 or spec.todos_per_user < 1:
+            raise CommandError("--users and --todos-per-user must be positive.")
+
+        if options["start"] < 0:
+            raise CommandError("--start must not be negative.")
+
+        first = options["start"]
+        names = [
+            f"{options['prefix']}{index}" for index in range(first, first + spec.users)
+        ]
+        existing = set(
+            get_user_model()
+            .objects.filter(username__in=names)
+            .values_list("username", flat=True)
+        )
+        start = time.perf_counter()
+        users = seed_users(spec.users, prefix=options["prefix"], start=first)
+        self.stdout.write(
+            f"Created {len(users) - len(existing)} users in "
+            f"{time.perf_counter() - start:.1f}s ({len(existing)} already existed)"
+        )
+
+        # Indexes are absolute, so a dataset seeded in several runs is the
+        # same as one seeded at once.
+        users = [
+            (first + offset, user.pk)
+            for offset, user in enumerate(users)
+            if user.username not in existing
+        ]
+        if not users:
+            self.stdout.write(self.style.SUCCESS("Every user already exists."))
+            return
+        spec = replace(spec, users=len(users))
+        if options["keep_indexes"]:
+            loaded, elapsed = self.load(spec, users, options)
+        else:
+            with deferred_indexes() as indexes:
+                loaded, elapsed = self.load(spec, users, options)
+                rebuild = time.perf_counter()
+            self.stdout.write(
+                f"Rebuilt {len(indexes)} indexes in "
+                f"{time.perf_counter() - rebuild:.1f}s"
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Loaded {loaded} to-dos in {elapsed:.1f}s "
+                f"({loaded / elapsed if elapsed else loaded:,.0f} rows/s)"
+            )
+        )
+
+    def chunks(self, spec, users, options):
+        """Split the users into chunks of about ``--batch-size`` rows."""
+        per_chunk = max(1, options["batch_size"] // spec.todos_per_user)
+        for offset in range(0, len(users), per_chunk):
+            yield users[offset : offset + per_chunk]
+
+    def load(self, spec, users, options):
+        """
+        Generate and load every user's to-dos.
+
+        Returns:
+            Tuple of (loaded rows, elapsed seconds).
+        """
+        now = timezone.now()
+        workers = max(1, options["workers"])
+        batch_size = options["batch_size"]
+        postgres = connection.vendor == "postgresql"
+        start = time.perf_counter()
+        loaded = 0
+
+        if workers == 1:
+            for chunk in self.chunks(spec, users, options):
+                rows = chunk_rows(spec.seed, chunk, spec.todos_per_user, now)
+                loaded += load_todos(rows, batch_size=batch_size)
+                self.progress(loaded, spec, start)
+            return loaded, time.perf_counter() - start
+
+        if postgres:
+            # Forked workers must open their own connections.
+            connections.close_all()
+        with multiprocessing.Pool(workers, initializer=_init_worker) as pool:
+            if postgres:
+                tasks = (
+                    (spec.seed, chunk, spec.todos_per_user, now, batch_size)
+                    for chunk in self.chunks(spec, users, options)
+                )
+                for count in pool.imap_unordered(_copy_chunk, tasks):
+                    loaded += count
+                    self.progress(loaded, spec, start)
+            else:
+                tasks = (
+                    (spec.seed, chunk, spec.todos_per_user, now)
+                    for chunk in self.chunks(spec, users, options)
+                )
+                for rows in pool.imap(_generate_chunk, tasks):
+                    loaded += insert_todos(rows, batch_size=batch_size, adapted=True)
+                    self.progress(loaded, spec, start)
+        return loaded, time.perf_counter() - start
+
+    def progress(self, loaded, spec, start):
+        """Print the running total and rate."""
+        elapsed = time.perf_counter() - start
+        rate = loaded / elapsed if elapsed else 0
+        self.stdout.write(
+            f"  {loaded:,}/{spec.total_todos:,} to-dos ({rate:,.0f} rows/s)"
+        )
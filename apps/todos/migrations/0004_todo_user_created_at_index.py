@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:21
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("todos", "0003_archivedtodo"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="todo",
+            index=models.Index(
+                fields=["user", "created_at"], name="todos_todo_user_id_2a11d7_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:23
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("todos", "0004_todo_user_created_at_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="todo",
+            index=models.Index(
+                condition=models.Q(("completed", False), ("due_date__isnull", False)),
+                fields=["user", "due_date", "id"],
+                name="todos_todo_open_due_idx",
+            ),
+        ),
+    ]
@@ -1,7 +1,8 @@
 """
 To-Do models for the application.
 
-This module defines the Todo model with all required fields.
+This module defines the Todo model with all required fields, and the
+ArchivedTodo model that holds old completed to-dos moved out of the hot table.
 """
 
 from django.conf import settings
@@ -55,6 +56,13 @@ class Todo(models.Model):
             models.Index(fields=["user", "completed"]),
             models.Index(fields=["user", "priority"]),
             models.Index(fields=["user", "due_date"]),
+            models.Index(fields=["user", "created_at"]),
+            # Open to-dos with a due date, for the upcoming/overdue endpoints.
+            models.Index(
+                fields=["user", "due_date", "id"],
+                condition=models.Q(completed=False, due_date__isnull=False),
+                name="todos_todo_open_due_idx",
+            ),
         ]
 
     def __str__(self):
@@ -66,3 +74,49 @@ class Todo(models.Model):
         self.completed = not self.completed
         self.save(update_fields=["completed", "updated_at"])
         return self.completed
+
+
+class ArchivedTodo(models.Model):
+    """
+    Archived copy of a completed to-do.
+
+    Old completed to-dos are moved here by the ``archive_todos`` management
+    command so that the indexes on ``todos_todo`` only cover rows that are
+    actually read. Rows keep the primary key they had in the hot table, and
+    the timestamps are copied verbatim rather than auto-populated.
+
+    Attributes:
+        id: Primary key of the original to-do
+        archived_at: Timestamp when the to-do was moved to the archive
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=200)
+    description = models.TextField(blank=True)
+    completed = models.BooleanField(default=True)
+    priority = models.CharField(
+        max_length=10,
+        choices=Todo.Priority.choices,
+        default=Todo.Priority.MEDIUM,
+    )
+    due_date = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField()
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="archived_todos",
+    )
+
+    class Meta:
+        verbose_name = "archived to-do"
+        verbose_name_plural = "archived to-dos"
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["user", "created_at"]),
+        ]
+
+    def __str__(self):
+        """Return string representation of the archived to-do."""
+        return self.title
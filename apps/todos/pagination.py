@@ -0,0 +1,124 @@
+"""
+Pagination classes for the todos app.
+
+This module contains the keyset paginator used by the due-date endpoints.
+"""
+
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class DueDateKeysetPagination(BasePagination):
+    """
+    Keyset pagination over ``(due_date, id)`` in ascending order.
+
+    The cursor holds the position of the last row of the previous page, so
+    every page is fetched with ``due_date >= position`` as an index range
+    condition and a fixed ``LIMIT`` regardless of how deep the client pages.
+    Only forward paging is supported.
+    """
+
+    cursor_query_param = "cursor"
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    invalid_cursor_message = "Invalid cursor"
+
+    def get_page_size(self, request):
+        """Return the page size requested by the client, within bounds."""
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def decode_cursor(self, request):
+        """Return the (due_date, id) position encoded in the request, if any."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            raw = urlsafe_b64decode(encoded.encode("ascii")).decode("ascii")
+            due_date, pk = raw.rsplit("|", 1)
+            position = (parse_datetime(due_date), int(pk))
+        except (TypeError, ValueError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if position[0] is None:
+            raise NotFound(self.invalid_cursor_message)
+        return position
+
+    def encode_cursor(self, instance):
+        """Return the next-page URL positioned after ``instance``."""
+        raw = f"{instance.due_date.isoformat()}|{instance.pk}"
+        encoded = urlsafe_b64encode(raw.encode("ascii")).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def page_queryset(self, queryset, position=None, page_size=None):
+        """Return the queryset for the page starting after ``position``."""
+        if position is not None:
+            due_date, pk = position
+            queryset = queryset.filter(
+                Q(due_date__gte=due_date) & (Q(due_date__gt=due_date) | Q(id__gt=pk))
+            )
+        page_size = page_size or self.page_size
+        # One extra row tells whether there is a next page.
+        return queryset.order_by("due_date", "id")[: page_size + 1]
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Return the rows of the requested page."""
+        self.base_url = request.build_absolute_uri()
+        page_size = self.get_page_size(request)
+        rows = list(
+            self.page_queryset(queryset, self.decode_cursor(request), page_size)
+        )
+        self.has_next = len(rows) > page_size
+        self.page = rows[:page_size]
+        return self.page
+
+    def get_next_link(self):
+        """Return the URL of the next page, or None on the last page."""
+        if not self.has_next:
+            return None
+        return self.encode_cursor(self.page[-1])
+
+    def get_paginated_response(self, data):
+        """Return the paginated response."""
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        """Return the OpenAPI schema of the paginated response."""
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        """Return the OpenAPI query parameters of the paginator."""
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "The pagination cursor value.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Number of results to return per page.",
+                "schema": {"type": "integer"},
+            },
+        ]
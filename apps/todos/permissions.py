@@ -11,9 +11,10 @@ class IsOwner(permissions.BasePermission):
     """
     Custom permission to only allow owners of an object to access it.
 
-    Assumes the model instance has a `user` attribute.
+    Assumes the model instance has a `user` foreign key. Only its id is
+    compared, so the user row does not have to be loaded.
     """
 
     def has_object_permission(self, request, view, obj):
         """Check if the requesting user is the owner of the object."""
-        return obj.user == request.user
+        return obj.user_id == request.user.pk
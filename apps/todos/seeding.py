@@ -0,0 +1,326 @@
+"""
+Synthetic data for benchmarks and performance environments.
+
+Rows are generated deterministically from a seed: every user gets its own
+random generator seeded with ``"<seed>:<user index>"``, so the data of one
+user does not depend on how many users are generated or in which order.
+Distributions roughly follow real usage: recent to-dos dominate, older
+ones are more likely to be completed, two thirds have a due date a few
+days to weeks after creation and medium priority is the most common.
+
+Rows are loaded with ``COPY`` on PostgreSQL and batched ``executemany``
+inserts elsewhere (see ``load_todos``).
+"""
+
+import csv
+import io
+import itertools
+import random
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import connections, transaction
+from django.utils import timezone
+
+from .models import Todo
+
+# Password of every generated user.
+PASSWORD = "benchmark-pass-123"
+# Username prefix of the users created by ``seed_todos`` and logged in as
+# by ``replay_traffic``: ``<prefix><index>``.
+USER_PREFIX = "seed"
+
+PRIORITY_WEIGHTS = {
+    Todo.Priority.LOW: 0.3,
+    Todo.Priority.MEDIUM: 0.5,
+    Todo.Priority.HIGH: 0.2,
+}
+VERBS = ("Write", "Review", "Call", "Email", "Plan", "Fix", "Buy", "Book", "Send")
+NOUNS = (
+    "report",
+    "invoice",
+    "dentist",
+    "groceries",
+    "slides",
+    "tickets",
+    "budget",
+    "release notes",
+    "team lunch",
+)
+DESCRIPTIONS = (
+    "",
+    "",
+    "Follow up with the team afterwards.",
+    "Check the notes from last week first.",
+    "Needs sign-off before Friday.",
+)
+
+# Columns of ``todos_todo`` filled by ``todo_rows``, in order.
+TODO_COLUMNS = (
+    "title",
+    "description",
+    "completed",
+    "priority",
+    "due_date",
+    "created_at",
+    "updated_at",
+    "user_id",
+)
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    """Size and seed of a generated dataset."""
+
+    users: int
+    todos_per_user: int
+    seed: int = 0
+
+    @property
+    def total_todos(self):
+        """Return the number of to-dos in the dataset."""
+        return self.users * self.todos_per_user
+
+
+def user_random(seed, index):
+    """Return the random generator for the user number ``index``."""
+    return random.Random(f"{seed}:{index}")
+
+
+def todo_rows(user_id, count, rng, now):
+    """
+    Yield ``count`` to-do rows for ``user_id`` as tuples of TODO_COLUMNS.
+    """
+    priorities = list(PRIORITY_WEIGHTS)
+    weights = list(PRIORITY_WEIGHTS.values())
+    for _ in range(count):
+        # Squaring skews ages towards recent to-dos.
+        age = timedelta(days=365 * rng.random() ** 2)
+        created_at = now - age
+        updated_at = created_at + age * rng.random()
+        completed = rng.random() < 0.2 + 0.6 * (age.days / 365)
+        due_date = None
+        if rng.random() < 0.65:
+            due_date = created_at + timedelta(hours=rng.randint(12, 30 * 24))
+        yield (
+            f"{rng.choice(VERBS)} {rng.choice(NOUNS)}",
+            rng.choice(DESCRIPTIONS),
+            completed,
+            rng.choices(priorities, weights)[0],
+            due_date,
+            created_at,
+            updated_at,
+            user_id,
+        )
+
+
+def adapt_rows(rows, using="default"):
+    """
+    Yield to-do rows with their dates converted for the database driver.
+
+    This is the CPU-heavy part of an insert, so ``seed_todos`` runs it in
+    its worker processes.
+    """
+    adapt = connections[using].ops.adapt_datetimefield_value
+    for title, description, completed, priority, due, created, updated, user in rows:
+        yield (
+            title,
+            description,
+            completed,
+            priority,
+            adapt(due),
+            adapt(created),
+            adapt(updated),
+            user,
+        )
+
+
+def insert_todos(rows, batch_size=5000, using="default", adapted=False):
+    """
+    Insert to-do rows with batched ``executemany`` calls.
+
+    Unlike ``bulk_create`` this keeps the generated ``created_at`` and
+    ``updated_at`` values instead of stamping every row with the current
+    time. Each batch is committed in its own transaction. Pass
+    ``adapted=True`` for rows already converted by ``adapt_rows``.
+
+    Returns:
+        Number of inserted rows.
+    """
+    connection = connections[using]
+    ops = connection.ops
+    columns = ", ".join(ops.quote_name(column) for column in TODO_COLUMNS)
+    placeholders = ", ".join(["%s"] * len(TODO_COLUMNS))
+    sql = (
+        f"INSERT INTO {ops.quote_name(Todo._meta.db_table)} ({columns}) "
+        f"VALUES ({placeholders})"
+    )
+    if not adapted:
+        rows = adapt_rows(rows, using=using)
+
+    inserted = 0
+    rows = iter(rows)
+    with connection.cursor() as cursor:
+        while batch := list(itertools.islice(rows, batch_size)):
+            with transaction.atomic(using=using):
+                cursor.executemany(sql, batch)
+            inserted += len(batch)
+    return inserted
+
+
+def csv_value(value):
+    """Return ``value`` as written to a ``COPY ... (FORMAT csv)`` stream."""
+    if value is None:
+        # Unquoted empty fields are NULL in the CSV format.
+        return ""
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+def copy_todos(rows, batch_size=50000, using="default"):
+    """
+    Load to-do rows with PostgreSQL ``COPY ... FROM STDIN``.
+
+    Rows are streamed in CSV batches of ``batch_size``, so memory use does
+    not grow with the number of rows.
+
+    Returns:
+        Number of loaded rows.
+    """
+    connection = connections[using]
+    ops = connection.ops
+    columns = ", ".join(ops.quote_name(column) for column in TODO_COLUMNS)
+    sql = (
+        f"COPY {ops.quote_name(Todo._meta.db_table)} ({columns}) "
+        "FROM STDIN WITH (FORMAT csv)"
+    )
+
+    def flush(buffer):
+        with connection.cursor() as cursor:
+            raw = cursor.cursor
+            if hasattr(raw, "copy_expert"):
+                # psycopg2
+                buffer.seek(0)
+                raw.copy_expert(sql, buffer)
+            else:
+                # psycopg 3
+                with raw.copy(sql) as copy:
+                    copy.write(buffer.getvalue())
+
+    loaded = 0
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    pending = 0
+    for row in rows:
+        writer.writerow(map(csv_value, row))
+        pending += 1
+        if pending >= batch_size:
+            flush(buffer)
+            loaded += pending
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            pending = 0
+    if pending:
+        flush(buffer)
+        loaded += pending
+    return loaded
+
+
+def load_todos(rows, batch_size=5000, using="default"):
+    """
+    Load to-do rows with the fastest method of the database backend.
+
+    Returns:
+        Number of loaded rows.
+    """
+    if connections[using].vendor == "postgresql":
+        return copy_todos(rows, batch_size=max(batch_size, 50000), using=using)
+    return insert_todos(rows, batch_size=batch_size, using=using)
+
+
+@contextmanager
+def deferred_indexes(using="default"):
+    """
+    Drop the secondary indexes of ``todos_todo`` for the duration of a load.
+
+    Maintaining indexes row by row is much slower than building them once
+    over the loaded table, so they are recreated when the block exits,
+    also when it fails. The primary key and the foreign key index on
+    ``user_id`` are kept.
+    """
+    connection = connections[using]
+    indexes = Todo._meta.indexes
+    with connection.schema_editor() as editor:
+        for index in indexes:
+            editor.remove_index(Todo, index)
+    try:
+        yield indexes
+    finally:
+        with connection.schema_editor() as editor:
+            for index in indexes:
+                editor.add_index(Todo, index)
+
+
+def chunk_rows(seed, users, todos_per_user, now):
+    """
+    Return the to-do rows of a chunk of users.
+
+    Args:
+        users: Sequence of (user index, user id) pairs.
+    """
+    return [
+        row
+        for index, user_id in users
+        for row in todo_rows(user_id, todos_per_user, user_random(seed, index), now)
+    ]
+
+
+def seed_users(count, prefix="bench", start=0, batch_size=5000, using="default"):
+    """
+    Create the users ``<prefix><start>`` to ``<prefix><start + count - 1>``.
+
+    Every user shares the password ``PASSWORD``, hashed once so creating
+    many users is fast. Users that already exist are kept as they are, so
+    seeding can be repeated.
+
+    Returns:
+        List of the users, existing or created, in index order.
+    """
+    User = get_user_model()
+    password = make_password(PASSWORD)
+    usernames = [f"{prefix}{index}" for index in range(start, start + count)]
+    User.objects.using(using).bulk_create(
+        (
+            User(username=username, email=f"{username}@example.com", password=password)
+            for username in usernames
+        ),
+        batch_size=batch_size,
+        ignore_conflicts=True,
+    )
+    # Primary keys are not returned for ignored conflicts; read them back.
+    users = User.objects.using(using).in_bulk(usernames, field_name="username")
+    return [users[username] for username in usernames]
+
+
+def seed_dataset(spec, now=None, prefix="bench", using="default"):
+    """
+    Create the users and to-dos described by ``spec``.
+
+    Returns:
+        List of the created users; the first one is the benchmark user.
+    """
+    now = now or timezone.now()
+    users = seed_users(spec.users, prefix=prefix, using=using)
+    rows = (
+        row
+        for index, user in enumerate(users)
+        for row in todo_rows(
+            user.id, spec.todos_per_user, user_random(spec.seed, index), now
+        )
+    )
+    insert_todos(rows, using=using)
+    return users
@@ -6,14 +6,24 @@ This module contains serializers for Todo CRUD operations.
 
 from rest_framework import serializers
 
-from .models import Todo
+from apps.core.fields import CompactModelSerializerMixin
+from apps.core.sparse import SparseFieldsetSerializerMixin
+from apps.monitoring.mixins import TimedSerializerMixin
 
+from .models import ArchivedTodo, Todo
 
-class TodoSerializer(serializers.ModelSerializer):
+
+class TodoSerializer(
+    TimedSerializerMixin,
+    SparseFieldsetSerializerMixin,
+    CompactModelSerializerMixin,
+    serializers.ModelSerializer,
+):
     """
     Serializer for Todo model.
 
-    Handles serialization and deserialization of Todo instances.
+    Handles serialization and deserialization of Todo instances. Pass
+    ``fields`` or ``omit`` to serialize a subset of the fields.
     """
 
     user = serializers.ReadOnlyField(source="user.username")
@@ -40,7 +50,16 @@ class TodoSerializer(serializers.ModelSerializer):
         return value.strip()
 
 
-class TodoCreateSerializer(serializers.ModelSerializer):
+class ArchivedTodoSerializer(TodoSerializer):
+    """Read-only serializer for archived to-dos returned alongside live ones."""
+
+    class Meta(TodoSerializer.Meta):
+        model = ArchivedTodo
+        fields = TodoSerializer.Meta.fields + ("archived_at",)
+        read_only_fields = fields
+
+
+class TodoCreateSerializer(CompactModelSerializerMixin, serializers.ModelSerializer):
     """Serializer for creating a new Todo."""
 
     class Meta:
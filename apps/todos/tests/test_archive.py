@@ -0,0 +1,177 @@
+"""
+Tests for the to-do archive tier.
+
+This module contains tests for the archive mover and for listing archived
+to-dos through the API.
+"""
+
+from django.core.management import call_command
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+
+import pytest
+
+from apps.todos.archive import archive_completed_todos
+from apps.todos.models import ArchivedTodo, Todo
+
+
+def make_old(todos, days=120):
+    """Backdate the given to-dos so they become archivable."""
+    old = timezone.now() - timezone.timedelta(days=days)
+    Todo.objects.filter(id__in=[t.id for t in todos]).update(
+        created_at=old, updated_at=old
+    )
+
+
+@pytest.mark.django_db
+class TestArchiveMover:
+    """Test cases for moving completed to-dos into the archive."""
+
+    def test_moves_only_old_completed_todos(self, user, todo_list):
+        """Test that only completed to-dos past the threshold are moved."""
+        make_old(todo_list)
+        recent = Todo.objects.create(title="Recent", completed=True, user=user)
+        cutoff = timezone.now() - timezone.timedelta(days=90)
+
+        batches = list(archive_completed_todos(cutoff, batch_size=2))
+
+        completed_ids = {t.id for t in todo_list if t.completed}
+        assert sum(batch.moved for batch in batches) == len(completed_ids)
+        assert set(ArchivedTodo.objects.values_list("id", flat=True)) == completed_ids
+        assert not Todo.objects.filter(id__in=completed_ids).exists()
+        assert Todo.objects.filter(id=recent.id).exists()
+
+    def test_archived_rows_keep_their_data(self, user):
+        """Test that ids, content and timestamps survive the move."""
+        todo = Todo.objects.create(
+            title="Old",
+            description="Keep me",
+            completed=True,
+            priority=Todo.Priority.HIGH,
+            user=user,
+        )
+        make_old([todo])
+        todo.refresh_from_db()
+
+        list(archive_completed_todos(timezone.now()))
+
+        archived = ArchivedTodo.objects.get(id=todo.id)
+        assert archived.title == "Old"
+        assert archived.description == "Keep me"
+        assert archived.priority == Todo.Priority.HIGH
+        assert archived.created_at == todo.created_at
+        assert archived.updated_at == todo.updated_at
+        assert archived.archived_at is not None
+        assert archived.user == user
+
+    def test_max_batches_allows_resuming(self, user, todo_list):
+        """Test that a partial run can be resumed by running again."""
+        make_old(todo_list)
+        cutoff = timezone.now()
+
+        first = list(archive_completed_todos(cutoff, batch_size=1, max_batches=1))
+        assert len(first) == 1
+        assert ArchivedTodo.objects.count() == 1
+
+        list(archive_completed_todos(cutoff, batch_size=1))
+        assert ArchivedTodo.objects.count() == 3
+        assert not Todo.objects.filter(completed=True).exists()
+
+    def test_reopened_todo_stays(self, user, todo_list):
+        """Test that a to-do reopened after selection is neither copied nor deleted."""
+        make_old(todo_list)
+        reopened, *others = [t for t in todo_list if t.completed]
+
+        def reopen(execute, sql, params, many, context):
+            if sql.startswith("INSERT INTO") and "archivedtodo" in sql:
+                Todo.objects.filter(id=reopened.id).update(completed=False)
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(reopen):
+            batches = list(archive_completed_todos(timezone.now()))
+
+        assert sum(batch.moved for batch in batches) == len(others)
+        assert not ArchivedTodo.objects.filter(id=reopened.id).exists()
+        assert Todo.objects.filter(id=reopened.id, completed=False).exists()
+
+    def test_command(self, user, todo_list):
+        """Test the archive_todos management command."""
+        make_old(todo_list)
+        call_command("archive_todos", "--days", "30", "--batch-size", "2")
+        assert ArchivedTodo.objects.count() == 3
+
+
+@pytest.mark.django_db
+class TestIncludeArchived:
+    """Test cases for listing to-dos with include_archived."""
+
+    def test_archived_hidden_by_default(self, authenticated_client, todo_list):
+        """Test that archived to-dos are not listed by default."""
+        make_old(todo_list)
+        list(archive_completed_todos(timezone.now()))
+
+        response = authenticated_client.get(reverse("todos:todo-list"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["count"] == 2
+
+    def test_include_archived_unions_both_tiers(self, authenticated_client, todo_list):
+        """Test that include_archived returns live and archived to-dos."""
+        make_old(todo_list)
+        list(archive_completed_todos(timezone.now()))
+
+        response = authenticated_client.get(
+            reverse("todos:todo-list"), {"include_archived": "true"}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["count"] == 5
+        ids = [item["id"] for item in response.data["results"]]
+        assert sorted(ids) == sorted(t.id for t in todo_list)
+        archived = [r for r in response.data["results"] if "archived_at" in r]
+        assert len(archived) == 3
+
+    def test_include_archived_applies_filters_and_ordering(
+        self, authenticated_client, user
+    ):
+        """Test that filters, search and ordering apply to both tiers."""
+        now = timezone.now()
+        old = Todo.objects.create(
+            title="Archived meeting",
+            completed=True,
+            due_date=now - timezone.timedelta(days=1),
+            user=user,
+        )
+        make_old([old])
+        list(archive_completed_todos(now))
+        live = Todo.objects.create(
+            title="Live meeting", due_date=now + timezone.timedelta(days=1), user=user
+        )
+        Todo.objects.create(title="Groceries", user=user)
+
+        response = authenticated_client.get(
+            reverse("todos:todo-list"),
+            {"include_archived": "true", "search": "meeting", "ordering": "due_date"},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [r["id"] for r in response.data["results"]] == [old.id, live.id]
+
+    def test_include_archived_only_own_todos(
+        self, authenticated_client, todo, other_user_todo
+    ):
+        """Test that archived to-dos of other users are not listed."""
+        other_user_todo.completed = True
+        other_user_todo.save()
+        make_old([other_user_todo])
+        list(archive_completed_todos(timezone.now()))
+
+        response = authenticated_client.get(
+            reverse("todos:todo-list"), {"include_archived": "true"}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [r["id"] for r in response.data["results"]] == [todo.id]
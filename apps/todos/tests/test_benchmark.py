@@ -0,0 +1,139 @@
+"""
+Tests for the synthetic dataset and the API benchmark suite.
+
+This module contains tests for apps.todos.seeding and apps.todos.benchmark.
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from apps.todos.benchmark import (
+    BenchmarkCase,
+    BenchmarkError,
+    build_cases,
+    compare,
+    run_case,
+    run_suite,
+)
+from apps.todos.models import Todo
+from apps.todos.seeding import DatasetSpec, seed_dataset, todo_rows, user_random
+
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+class TestTodoRows:
+    """Tests for the row generator."""
+
+    def test_deterministic_by_seed(self):
+        """Test that the same seed and user index yield the same rows."""
+        first = list(todo_rows(1, 50, user_random(7, 0), NOW))
+        again = list(todo_rows(1, 50, user_random(7, 0), NOW))
+        other = list(todo_rows(1, 50, user_random(8, 0), NOW))
+        assert first == again
+        assert first != other
+
+    def test_distributions(self):
+        """Test that generated values stay within realistic ranges."""
+        rows = list(todo_rows(1, 2000, user_random(0, 0), NOW))
+        priorities = [row[3] for row in rows]
+        completed = sum(row[2] for row in rows) / len(rows)
+        with_due_date = sum(row[4] is not None for row in rows) / len(rows)
+
+        assert priorities.count("medium") > priorities.count("high")
+        assert set(priorities) == {"low", "medium", "high"}
+        assert 0.2 < completed < 0.6
+        assert 0.55 < with_due_date < 0.75
+        assert all(row[5] <= row[6] <= NOW for row in rows)
+
+
+@pytest.mark.django_db
+class TestSeedDataset:
+    """Tests for seed_dataset."""
+
+    def test_keeps_generated_timestamps(self):
+        """Test that users and to-dos are created with their generated dates."""
+        users = seed_dataset(DatasetSpec(users=3, todos_per_user=10, seed=1), now=NOW)
+
+        assert len(users) == 3
+        assert Todo.objects.count() == 30
+        assert Todo.objects.filter(user=users[0]).count() == 10
+        created = Todo.objects.values_list("created_at", flat=True)
+        assert len(set(created)) == 30
+        assert max(created) <= NOW
+
+
+@pytest.mark.django_db
+class TestBenchmarkSuite:
+    """Tests for running and comparing benchmarks."""
+
+    @pytest.fixture
+    def bench_user(self):
+        """Seed a small dataset and return the benchmark user."""
+        return seed_dataset(DatasetSpec(users=2, todos_per_user=15))[0]
+
+    def test_cases_cover_endpoints(self, bench_user):
+        """Test that every endpoint and list combination is benchmarked."""
+        names = {
+            case.name for case in build_cases(bench_user, bench_user.todos.first())
+        }
+        assert {
+            "list?default",
+            "list?completed=false&ordering=-priority&priority=high&search=report",
+            "upcoming",
+            "overdue",
+            "retrieve",
+            "create",
+            "update",
+            "partial_update",
+            "toggle_complete",
+            "login",
+            "refresh",
+        } <= names
+
+    def test_run_suite(self, bench_user):
+        """Test that the suite records latency and queries per request."""
+        cases = [
+            case
+            for case in build_cases(bench_user, bench_user.todos.first())
+            if case.name in ("list?default", "retrieve", "refresh")
+        ]
+        results = run_suite(cases, bench_user, iterations=3, meta={"seed": 0})
+
+        assert results["meta"]["iterations"] == 3
+        assert results["meta"]["seed"] == 0
+        assert results["results"]["list?default"]["count"] == 3
+        assert results["results"]["list?default"]["queries"] == 3
+        assert results["results"]["retrieve"]["p99_ms"] > 0
+
+    def test_failed_request_raises(self, bench_user):
+        """Test that a failing endpoint stops the benchmark."""
+        case = BenchmarkCase("missing", "get", "/api/todos/0/")
+        with pytest.raises(BenchmarkError, match="returned 404"):
+            run_case(case, bench_user, iterations=1)
+
+
+class TestCompare:
+    """Tests for compare."""
+
+    baseline = {"results": {"list": {"p95_ms": 10.0, "queries": 3}}}
+
+    def result(self, p95_ms, queries=3):
+        """Return a results document with one case."""
+        return {"results": {"list": {"p95_ms": p95_ms, "queries": queries}}}
+
+    def test_within_tolerance(self):
+        """Test that small slowdowns are not regressions."""
+        assert compare(self.result(12.0), self.baseline) == []
+
+    def test_latency_regression(self):
+        """Test that slowdowns beyond the tolerance are regressions."""
+        assert compare(self.result(13.0), self.baseline) == [
+            ("list", "p95 10.00 ms -> 13.00 ms")
+        ]
+
+    def test_query_regression(self):
+        """Test that extra queries per request are regressions."""
+        assert compare(self.result(10.0, queries=4), self.baseline) == [
+            ("list", "queries 3 -> 4")
+        ]
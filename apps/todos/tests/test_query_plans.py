@@ -0,0 +1,120 @@
+"""
+Tests for the to-do query-plan checks.
+
+This module fails when a known to-do list query shape loses its index plan.
+"""
+
+from django.core.management import call_command
+from django.db import connection
+
+import pytest
+
+from apps.todos.explain import (
+    analyze_plan,
+    explain_all,
+    find_regressions,
+    load_baseline,
+    propose_index,
+    query_shapes,
+)
+
+POSTGRES_PLAN = """\
+Limit  (cost=0.15..8.17 rows=1 width=100)
+  ->  Sort  (cost=8.16..8.17 rows=1 width=100)
+        Sort Key: created_at DESC
+        ->  Seq Scan on todos_todo  (cost=0.00..8.15 rows=1 width=100)
+              Filter: (user_id = 1)
+"""
+
+POSTGRES_INDEX_PLAN = """\
+Limit  (cost=0.15..8.17 rows=1 width=100)
+  ->  Index Scan Backward using todos_todo_user_id_2a11d7_idx on todos_todo
+        Index Cond: (user_id = 1)
+"""
+
+
+class TestAnalyzePlan:
+    """Test cases for plan analysis."""
+
+    def test_postgres_seq_scan_and_sort(self):
+        """Test that PostgreSQL seq scans and sorts are flagged."""
+        assert analyze_plan(POSTGRES_PLAN, "postgresql") == (True, True, [])
+
+    def test_postgres_index_scan(self):
+        """Test that PostgreSQL index scans are recognized."""
+        assert analyze_plan(POSTGRES_INDEX_PLAN, "postgresql") == (
+            False,
+            False,
+            ["todos_todo_user_id_2a11d7_idx"],
+        )
+
+    def test_sqlite_plans(self):
+        """Test that SQLite scans, searches and temp b-trees are recognized."""
+        assert analyze_plan("SCAN todos_todo", "sqlite") == (True, False, [])
+        assert analyze_plan(
+            "SEARCH todos_todo USING INDEX idx (user_id=?)\n"
+            "USE TEMP B-TREE FOR ORDER BY",
+            "sqlite",
+        ) == (False, True, ["idx"])
+
+    def test_propose_partial_index(self):
+        """Test that completed=false is proposed as a partial index."""
+        shape = next(
+            s
+            for s in query_shapes()
+            if s.as_dict() == {"completed": "false", "ordering": "due_date"}
+        )
+        assert propose_index(shape) == (
+            "models.Index(fields=['user', 'due_date'], condition=Q(completed=False))"
+        )
+
+
+@pytest.mark.django_db
+class TestQueryPlanRegressions:
+    """Test cases guarding the index plans of known query shapes."""
+
+    def test_known_shapes_keep_index_plans(self, user):
+        """Test that no query shape regressed against the stored baseline."""
+        baseline = load_baseline()
+        if connection.vendor not in baseline:
+            pytest.skip(f"No query plan baseline for {connection.vendor}.")
+
+        reports = explain_all(user, force_index_plans=True)
+        regressions = find_regressions(reports, baseline)
+
+        assert not regressions, "\n".join(
+            f"{report.shape.name}: {reason}\n{report.plan}"
+            for report, reason in regressions
+        )
+
+    def test_default_list_uses_index_without_sort(self, user):
+        """Test that the default list ordering is served from an index."""
+        default = next(s for s in query_shapes() if s.name == "default")
+        (report,) = [r for r in explain_all(user) if r.shape == default]
+        assert report.ok, report.plan
+
+    def test_due_date_endpoints_use_partial_index(self, user):
+        """Test that upcoming/overdue pages are index range scans."""
+        reports = [r for r in explain_all(user) if r.shape.action != "list"]
+
+        assert reports
+        for report in reports:
+            assert report.ok, report.plan
+            assert "todos_todo_open_due_idx" in report.indexes, report.plan
+
+    def test_find_regressions_detects_lost_index(self, user):
+        """Test that losing an index plan is reported."""
+        reports = explain_all(user)
+        scanned = reports[0]
+        scanned.seq_scan = True
+        baseline = {
+            connection.vendor: {scanned.shape.name: {"seq_scan": False, "sort": False}}
+        }
+        assert find_regressions(reports, baseline) == [
+            (scanned, "now uses a sequential scan")
+        ]
+
+    def test_command_check(self, user, capsys):
+        """Test the explain_todo_queries --check command."""
+        call_command("explain_todo_queries", "--check")
+        assert "No query plan regressions." in capsys.readouterr().out
@@ -0,0 +1,167 @@
+"""
+Tests for the seed_todos management command.
+
+This module contains tests for loading generated to-dos and for the
+deferred index handling.
+"""
+
+from datetime import datetime, timezone
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+
+import pytest
+
+from apps.todos.models import Todo
+from apps.todos.seeding import csv_value, deferred_indexes
+
+User = get_user_model()
+
+
+def todo_indexes():
+    """Return the names of the indexes on ``todos_todo``."""
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(
+            cursor, Todo._meta.db_table
+        )
+    return {name for name, info in constraints.items() if info["index"]}
+
+
+def dataset(prefix):
+    """Return the generated to-dos of the users called ``<prefix><n>``."""
+    todos = Todo.objects.filter(user__username__startswith=prefix).order_by(
+        "user_id", "id"
+    )
+    return [
+        (
+            todo.user.username.removeprefix(prefix),
+            todo.title,
+            todo.completed,
+            todo.priority,
+            todo.created_at,
+        )
+        for todo in todos.select_related("user")
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class TestSeedTodosCommand:
+    """Test cases for the seed_todos command."""
+
+    def test_loads_rows_and_restores_indexes(self):
+        """Test that users and to-dos are loaded and indexes rebuilt."""
+        indexes = todo_indexes()
+        out = StringIO()
+        call_command(
+            "seed_todos",
+            "--users",
+            "4",
+            "--todos-per-user",
+            "25",
+            "--workers",
+            "1",
+            "--batch-size",
+            "30",
+            stdout=out,
+        )
+
+        assert User.objects.filter(username__startswith="seed").count() == 4
+        assert Todo.objects.count() == 100
+        assert todo_indexes() == indexes
+        assert "rows/s" in out.getvalue()
+        assert "Rebuilt 5 indexes" in out.getvalue()
+
+    def test_deterministic_across_worker_counts(self):
+        """Test that the dataset only depends on the seed."""
+        options = ["--users", "3", "--todos-per-user", "20", "--seed", "5"]
+        call_command(
+            "seed_todos", *options, "--workers", "1", "--prefix", "a", stdout=StringIO()
+        )
+        call_command(
+            "seed_todos",
+            *options,
+            "--workers",
+            "2",
+            "--batch-size",
+            "20",
+            "--prefix",
+            "b",
+            "--keep-indexes",
+            stdout=StringIO(),
+        )
+        first, second = dataset("a"), dataset("b")
+
+        assert len(first) == 60
+        assert [row[:4] for row in first] == [row[:4] for row in second]
+
+    def test_repeatable(self):
+        """Test that seeding again keeps existing users and adds new ones."""
+        options = ["--users", "2", "--todos-per-user", "5", "--workers", "1"]
+        call_command("seed_todos", *options, stdout=StringIO())
+        out = StringIO()
+        call_command("seed_todos", *options, stdout=out)
+
+        assert "Every user already exists." in out.getvalue()
+        assert Todo.objects.count() == 10
+
+        call_command(
+            "seed_todos",
+            "--users",
+            "3",
+            "--todos-per-user",
+            "5",
+            "--workers",
+            "1",
+            "--start",
+            "1",
+            stdout=StringIO(),
+        )
+        usernames = User.objects.values_list("username", flat=True)
+        assert sorted(usernames) == ["seed0", "seed1", "seed2", "seed3"]
+        assert Todo.objects.count() == 20
+
+    def test_start_matches_single_run(self):
+        """Test that a dataset seeded in two runs equals one seeded at once."""
+        options = ["--todos-per-user", "10", "--workers", "1", "--seed", "3"]
+        call_command(
+            "seed_todos", *options, "--users", "4", "--prefix", "a", stdout=StringIO()
+        )
+        call_command(
+            "seed_todos", *options, "--users", "2", "--prefix", "b", stdout=StringIO()
+        )
+        call_command(
+            "seed_todos",
+            *options,
+            "--users",
+            "2",
+            "--start",
+            "2",
+            "--prefix",
+            "b",
+            stdout=StringIO(),
+        )
+
+        assert [row[:4] for row in dataset("a")] == [row[:4] for row in dataset("b")]
+
+    def test_indexes_restored_on_failure(self):
+        """Test that a failed load still rebuilds the dropped indexes."""
+        indexes = todo_indexes()
+        with pytest.raises(RuntimeError):
+            with deferred_indexes():
+                assert "todos_todo_open_due_idx" not in todo_indexes()
+                raise RuntimeError("load failed")
+        assert todo_indexes() == indexes
+
+
+class TestCsvValue:
+    """Tests for the COPY value conversion."""
+
+    def test_values(self):
+        """Test that NULLs become empty fields and dates ISO strings."""
+        assert csv_value(None) == ""
+        assert csv_value(True) is True
+        assert csv_value(datetime(2026, 1, 2, tzinfo=timezone.utc)) == (
+            "2026-01-02T00:00:00+00:00"
+        )
@@ -0,0 +1,162 @@
+"""
+Tests for sparse fieldsets on the todos API.
+
+This module contains tests for the ``fields`` and ``omit`` query
+parameters of TodoViewSet and the column projection they apply.
+"""
+
+from datetime import timedelta
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+
+import pytest
+
+from apps.core.sparse import projection, serializer_projection
+from apps.todos.archive import archive_completed_todos
+from apps.todos.models import Todo
+from apps.todos.serializers import TodoSerializer
+
+
+def todo_selects(queries):
+    """Return the SQL of the captured queries loading to-do rows."""
+    table = Todo._meta.db_table
+    return [
+        query["sql"]
+        for query in queries
+        if query["sql"].startswith("SELECT")
+        and "COUNT(" not in query["sql"]
+        and f'FROM "{table}"' in query["sql"]
+    ]
+
+
+@pytest.mark.django_db
+class TestSparseFieldsets:
+    """Tests for the fields and omit query parameters."""
+
+    def test_fields(self, authenticated_client, todo_list):
+        """Test that only the requested fields are returned and selected."""
+        url = reverse("todos:todo-list")
+        with CaptureQueriesContext(connection) as queries:
+            response = authenticated_client.get(url, {"fields": "id,title,completed"})
+        assert response.status_code == status.HTTP_200_OK
+        for item in response.data["results"]:
+            assert set(item) == {"id", "title", "completed"}
+        (select,) = todo_selects(queries)
+        assert '"description"' not in select
+        assert "JOIN" not in select
+
+    def test_omit(self, authenticated_client, todo_list):
+        """Test that omitted fields are left out of the output and SELECT."""
+        url = reverse("todos:todo-list")
+        with CaptureQueriesContext(connection) as queries:
+            response = authenticated_client.get(url, {"omit": "description"})
+        item = response.data["results"][0]
+        assert "description" not in item
+        assert item["user"] == "testuser"
+        (select,) = todo_selects(queries)
+        assert '"description"' not in select
+        assert "JOIN" in select
+
+    def test_equivalent_fieldsets_share_projection(
+        self, authenticated_client, todo_list
+    ):
+        """Test that repeated and reordered names reuse one cached projection."""
+        url = reverse("todos:todo-list")
+        serializer_projection.cache_clear()
+        for fields in ("id,title", "title,id", "id,id,title", " title , id,title"):
+            response = authenticated_client.get(url, {"fields": fields})
+            assert list(response.data["results"][0]) == ["id", "title"]
+        assert serializer_projection.cache_info().currsize == 1
+        assert serializer_projection.cache_info().maxsize is not None
+
+    def test_unknown_field(self, authenticated_client, todo_list):
+        """Test that unknown field names are rejected."""
+        url = reverse("todos:todo-list")
+        response = authenticated_client.get(url, {"fields": "id,secret,nope"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data == {
+            "fields": ["Unknown field: secret.", "Unknown field: nope."]
+        }
+
+    def test_retrieve(self, authenticated_client, todo):
+        """Test that detail views support fields while checking ownership."""
+        url = reverse("todos:todo-detail", kwargs={"pk": todo.pk})
+        response = authenticated_client.get(url, {"fields": "title"})
+        assert response.data == {"title": "Test Todo"}
+
+    def test_retrieve_other_user(self, authenticated_client, other_user_todo):
+        """Test that other users' to-dos stay hidden with fields selected."""
+        url = reverse("todos:todo-detail", kwargs={"pk": other_user_todo.pk})
+        response = authenticated_client.get(url, {"fields": "title"})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_writes_ignore_fields(self, authenticated_client, todo):
+        """Test that updates validate and return every field."""
+        url = reverse("todos:todo-detail", kwargs={"pk": todo.pk})
+        response = authenticated_client.patch(
+            f"{url}?fields=id", {"title": "Renamed"}, format="json"
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["title"] == "Renamed"
+        assert "description" in response.data
+
+    def test_upcoming_pages(self, authenticated_client, user):
+        """Test that keyset pages work without due_date in the fields."""
+        now = timezone.now()
+        Todo.objects.bulk_create(
+            Todo(user=user, title=f"Due {i}", due_date=now + timedelta(days=i + 1))
+            for i in range(3)
+        )
+        url = reverse("todos:todo-upcoming")
+        with CaptureQueriesContext(connection) as queries:
+            response = authenticated_client.get(
+                url, {"fields": "title", "page_size": 2}
+            )
+        assert response.data["results"] == [{"title": "Due 0"}, {"title": "Due 1"}]
+        assert len(todo_selects(queries)) == 1
+        response = authenticated_client.get(response.data["next"])
+        assert response.data["results"] == [{"title": "Due 2"}]
+
+    def test_include_archived(self, authenticated_client, todo_list):
+        """Test that archived to-dos are listed with the same fieldset."""
+        Todo.objects.filter(pk=todo_list[0].pk).update(
+            updated_at=timezone.now() - timedelta(days=400)
+        )
+        list(archive_completed_todos(timezone.now() - timedelta(days=1)))
+        url = reverse("todos:todo-list")
+        response = authenticated_client.get(
+            url, {"include_archived": "true", "fields": "title"}
+        )
+        titles = sorted(item["title"] for item in response.data["results"])
+        assert titles == [f"Todo {i}" for i in range(5)]
+
+    def test_default_omit(self, authenticated_client, todo_list, settings):
+        """Test that lists can leave out fields by default."""
+        settings.TODO_LIST_DEFAULT_OMIT = ("description",)
+        url = reverse("todos:todo-list")
+        response = authenticated_client.get(url)
+        assert "description" not in response.data["results"][0]
+        response = authenticated_client.get(url, {"omit": ""})
+        assert "description" in response.data["results"][0]
+        detail = reverse("todos:todo-detail", kwargs={"pk": todo_list[0].pk})
+        assert "description" in authenticated_client.get(detail).data
+
+
+class TestProjection:
+    """Tests for the column projection of serializers."""
+
+    def test_related_source(self):
+        """Test that fields of related models become lookups."""
+        serializer = TodoSerializer(fields=("title", "user"))
+        assert projection(serializer, Todo) == {"title", "user__username"}
+
+    def test_unprojectable_source(self):
+        """Test that fields not backed by columns disable the projection."""
+        serializer = TodoSerializer(fields=("title",))
+        serializer.fields["title"].source_attrs = ["get_priority_display"]
+        assert projection(serializer, Todo) is None
@@ -313,3 +313,193 @@ class TestTodoOrdering:
         response = authenticated_client.get(url, {"ordering": "due_date"})
 
         assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db
+class TestTodoDueDateEndpoints:
+    """Test cases for the upcoming and overdue endpoints."""
+
+    @pytest.fixture
+    def due_todos(self, user):
+        """Create open, completed and undated todos around the current time."""
+        now = timezone.now()
+        return {
+            "overdue_old": Todo.objects.create(
+                title="Very late", due_date=now - timezone.timedelta(days=5), user=user
+            ),
+            "overdue_new": Todo.objects.create(
+                title="Late", due_date=now - timezone.timedelta(days=1), user=user
+            ),
+            "soon": Todo.objects.create(
+                title="Soon", due_date=now + timezone.timedelta(days=1), user=user
+            ),
+            "later": Todo.objects.create(
+                title="Later", due_date=now + timezone.timedelta(days=3), user=user
+            ),
+            "done": Todo.objects.create(
+                title="Done",
+                completed=True,
+                due_date=now + timezone.timedelta(days=2),
+                user=user,
+            ),
+            "undated": Todo.objects.create(title="Someday", user=user),
+        }
+
+    def test_upcoming(self, authenticated_client, due_todos, other_user_todo):
+        """Test that upcoming lists open todos due later, soonest first."""
+        response = authenticated_client.get(reverse("todos:todo-upcoming"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [r["id"] for r in response.data["results"]] == [
+            due_todos["soon"].id,
+            due_todos["later"].id,
+        ]
+        assert response.data["next"] is None
+
+    def test_overdue(self, authenticated_client, due_todos):
+        """Test that overdue lists open todos past due, most overdue first."""
+        response = authenticated_client.get(reverse("todos:todo-overdue"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [r["id"] for r in response.data["results"]] == [
+            due_todos["overdue_old"].id,
+            due_todos["overdue_new"].id,
+        ]
+
+    def test_keyset_pagination(self, authenticated_client, user):
+        """Test following next links through todos sharing a due date."""
+        due_date = timezone.now() + timezone.timedelta(days=1)
+        todos = [
+            Todo.objects.create(title=f"Todo {i}", due_date=due_date, user=user)
+            for i in range(5)
+        ]
+
+        url = reverse("todos:todo-upcoming") + "?page_size=2"
+        seen = []
+        while url:
+            response = authenticated_client.get(url)
+            assert response.status_code == status.HTTP_200_OK
+            assert len(response.data["results"]) <= 2
+            seen.extend(r["id"] for r in response.data["results"])
+            url = response.data["next"]
+
+        assert seen == [t.id for t in todos]
+
+    def test_invalid_cursor(self, authenticated_client):
+        """Test that a malformed cursor is rejected."""
+        response = authenticated_client.get(
+            reverse("todos:todo-upcoming"), {"cursor": "not-a-cursor"}
+        )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_requires_authentication(self, api_client):
+        """Test that the due-date endpoints require authentication."""
+        response = api_client.get(reverse("todos:todo-overdue"))
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.django_db
+class TestTodoMultiGet:
+    """Tests for the multi-get endpoint."""
+
+    def test_multi_get(self, authenticated_client, todo_list, other_user_todo):
+        """Test to-dos are returned in request order with missing IDs listed."""
+        ids = [todo_list[3].id, other_user_todo.id, todo_list[0].id, 0, todo_list[3].id]
+        response = authenticated_client.get(
+            reverse("todos:todo-multi-get"), {"ids": ",".join(map(str, ids))}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [item["id"] for item in response.data["results"]] == [
+            todo_list[3].id,
+            todo_list[0].id,
+        ]
+        assert response.data["missing"] == [other_user_todo.id, 0]
+        assert "private" in response["Cache-Control"]
+        assert "Authorization" in response["Vary"]
+
+    def test_multi_get_fields(self, authenticated_client, todo_list):
+        """Test the multi-get supports sparse fieldsets."""
+        response = authenticated_client.get(
+            reverse("todos:todo-multi-get"),
+            {"ids": f"{todo_list[1].id}", "fields": "title"},
+        )
+
+        assert response.data["results"] == [{"title": "Todo 1"}]
+
+    @pytest.mark.parametrize("ids", ["", "1,a", "1,-2", "1," + "9" * 20])
+    def test_multi_get_invalid_ids(self, authenticated_client, ids):
+        """Test missing and malformed IDs are rejected."""
+        response = authenticated_client.get(
+            reverse("todos:todo-multi-get"), {"ids": ids}
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "ids" in response.data
+
+    def test_multi_get_limit(self, authenticated_client, settings):
+        """Test requests over TODO_MULTI_GET_MAX_IDS are rejected."""
+        settings.TODO_MULTI_GET_MAX_IDS = 3
+        response = authenticated_client.get(
+            reverse("todos:todo-multi-get"), {"ids": "1,2,3,4"}
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_multi_get_unauthenticated(self, api_client):
+        """Test unauthenticated users cannot multi-get to-dos."""
+        response = api_client.get(reverse("todos:todo-multi-get"), {"ids": "1"})
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.django_db
+class TestTodoQueryBudget:
+    """Test cases guarding the todo endpoints against query explosions."""
+
+    @pytest.mark.query_budget(max_queries=3)
+    def test_list_query_budget(self, authenticated_client, todo_list):
+        """Test listing runs auth, count and page queries only."""
+        response = authenticated_client.get(reverse("todos:todo-list"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data["results"]) == 5
+
+    def test_upcoming_query_budget(self, authenticated_client, user, query_budget):
+        """Test the keyset-paginated list runs auth and page queries only."""
+        Todo.objects.bulk_create(
+            Todo(
+                title=f"Todo {i}",
+                due_date=timezone.now() + timezone.timedelta(days=i + 1),
+                user=user,
+            )
+            for i in range(5)
+        )
+        with query_budget(max_queries=2):
+            response = authenticated_client.get(reverse("todos:todo-upcoming"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data["results"]) == 5
+
+    def test_retrieve_query_budget(self, authenticated_client, todo, query_budget):
+        """Test retrieving a todo runs auth and lookup queries only."""
+        with query_budget(max_queries=2):
+            response = authenticated_client.get(
+                reverse("todos:todo-detail", args=[todo.id])
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_multi_get_query_budget(
+        self, authenticated_client, todo_list, query_budget
+    ):
+        """Test fetching several todos runs auth and one lookup query only."""
+        ids = ",".join(str(todo.id) for todo in todo_list)
+        with query_budget(max_queries=2):
+            response = authenticated_client.get(
+                reverse("todos:todo-multi-get"), {"ids": ids}
+            )
+
+        assert len(response.data["results"]) == 5
@@ -4,22 +4,60 @@ Views for the todos app.
 This module contains viewsets and views for Todo CRUD operations.
 """
 
-from rest_framework import status, viewsets
+from django.conf import settings
+from django.db.models import Value
+from django.utils import timezone
+from django.utils.cache import patch_cache_control, patch_vary_headers
+
+from rest_framework import serializers, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import OrderingFilter, SearchFilter
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import (
+    OpenApiParameter,
+    extend_schema,
+    extend_schema_view,
+    inline_serializer,
+)
 
-from drf_spectacular.utils import extend_schema, extend_schema_view
+from apps.core.parsers import MessagePackParser
+from apps.core.renderers import MessagePackRenderer
+from apps.core.sparse import SparseFieldsetViewMixin, parse_names
+from apps.monitoring.mixins import TimedViewMixin
 
-from .filters import TodoFilter
-from .models import Todo
+from .filters import ArchivedTodoFilter, TodoFilter
+from .models import ArchivedTodo, Todo
+from .pagination import DueDateKeysetPagination
 from .permissions import IsOwner
 from .serializers import (
+    ArchivedTodoSerializer,
     TodoCreateSerializer,
     TodoSerializer,
     TodoToggleCompleteSerializer,
 )
 
+# Largest primary key value; bigger ``ids`` would overflow the query.
+MAX_ID = 2**63 - 1
+
+# Query parameters of the actions supporting sparse fieldsets.
+SPARSE_FIELDSET_PARAMETERS = [
+    OpenApiParameter(
+        name="fields",
+        type=OpenApiTypes.STR,
+        description="Comma-separated fields to return, e.g. `id,title,completed`.",
+    ),
+    OpenApiParameter(
+        name="omit",
+        type=OpenApiTypes.STR,
+        description="Comma-separated fields to leave out, e.g. `description`.",
+    ),
+]
+
 
 @extend_schema_view(
     list=extend_schema(
@@ -28,7 +66,17 @@ from .serializers import (
         description="Retrieve a paginated list of to-dos for the authenticated user. "
         "Supports filtering by completed status, priority, and due date range. "
         "Supports searching by title and description. "
-        "Supports ordering by created_at, due_date, and priority.",
+        "Supports ordering by created_at, due_date, and priority. "
+        "Pass include_archived=true to also list archived to-dos. "
+        "Use fields or omit to select the returned fields.",
+        parameters=[
+            OpenApiParameter(
+                name="include_archived",
+                type=OpenApiTypes.BOOL,
+                description="Also return archived to-dos.",
+            ),
+            *SPARSE_FIELDSET_PARAMETERS,
+        ],
     ),
     create=extend_schema(
         tags=["To-Dos"],
@@ -39,6 +87,7 @@ from .serializers import (
         tags=["To-Dos"],
         summary="Retrieve a to-do",
         description="Get details of a specific to-do item.",
+        parameters=SPARSE_FIELDSET_PARAMETERS,
     ),
     update=extend_schema(
         tags=["To-Dos"],
@@ -56,7 +105,7 @@ from .serializers import (
         description="Delete a specific to-do item.",
     ),
 )
-class TodoViewSet(viewsets.ModelViewSet):
+class TodoViewSet(TimedViewMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     """
     ViewSet for Todo CRUD operations.
 
@@ -68,17 +117,57 @@ class TodoViewSet(viewsets.ModelViewSet):
     - partial_update: PATCH /api/todos/{id}/
     - destroy: DELETE /api/todos/{id}/
     - toggle_complete: POST /api/todos/{id}/toggle-complete/
+    - upcoming: GET /api/todos/upcoming/
+    - overdue: GET /api/todos/overdue/
+    - multi_get: GET /api/todos/multi-get/?ids=1,2,3
+
+    Every action also speaks MessagePack, negotiated through ``Accept`` and
+    ``Content-Type`` (see ``apps.core.fields`` for its compact values).
+
+    The read actions accept ``?fields=``/``?omit=`` and then load only the
+    columns of the selected fields (see ``apps.core.sparse``).
     """
 
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, MessagePackRenderer]
+    parser_classes = [*api_settings.DEFAULT_PARSER_CLASSES, MessagePackParser]
     permission_classes = [IsAuthenticated, IsOwner]
     filterset_class = TodoFilter
     search_fields = ["title", "description"]
     ordering_fields = ["created_at", "due_date", "priority"]
     ordering = ["-created_at"]
 
+    sparse_actions = ("list", "retrieve", "upcoming", "overdue", "multi_get")
+    # IsOwner reads ``user_id``; the keyset pagination reads ``due_date``.
+    sparse_required_fields = {
+        "retrieve": ("user",),
+        "upcoming": ("due_date",),
+        "overdue": ("due_date",),
+    }
+    sparse_default_omit_actions = ("list", "upcoming", "overdue")
+    sparse_default_omit_setting = "TODO_LIST_DEFAULT_OMIT"
+
+    # Columns selected from both tiers when listing archived to-dos; they
+    # must include every field accepted by ``ordering_fields``.
+    union_columns = ("id", "created_at", "due_date", "priority")
+
     def get_queryset(self):
         """Return todos belonging to the authenticated user."""
-        return Todo.objects.filter(user=self.request.user)
+        # The serializer reads ``todo.user``; join it up front.
+        return self.project(
+            Todo.objects.filter(user=self.request.user).select_related("user")
+        )
+
+    def get_due_queryset(self):
+        """
+        Return the open to-dos listed by the ``upcoming``/``overdue`` actions.
+
+        The filter matches the condition of the ``todos_todo_open_due_idx``
+        partial index, so the due-date endpoints are served from it.
+        """
+        queryset = self.get_queryset().filter(completed=False, due_date__isnull=False)
+        if self.action == "overdue":
+            return queryset.filter(due_date__lt=timezone.now())
+        return queryset.filter(due_date__gte=timezone.now())
 
     def get_serializer_class(self):
         """Return appropriate serializer class based on action."""
@@ -88,6 +177,89 @@ class TodoViewSet(viewsets.ModelViewSet):
             return TodoToggleCompleteSerializer
         return TodoSerializer
 
+    @property
+    def include_archived(self):
+        """Return whether the request opted in to listing archived to-dos."""
+        value = self.request.query_params.get("include_archived", "")
+        return value.lower() in ("true", "1", "yes")
+
+    def filter_archived_queryset(self, queryset):
+        """Apply the to-do filters and search to an archived to-do queryset."""
+        filterset = ArchivedTodoFilter(
+            self.request.query_params, queryset=queryset, request=self.request
+        )
+        return SearchFilter().filter_queryset(self.request, filterset.qs, self)
+
+    def list(self, request, *args, **kwargs):
+        """
+        List to-dos, optionally including archived ones.
+
+        With ``include_archived=true`` the live and archived tiers are
+        combined with a ``UNION ALL`` of their sort keys, paginated, and only
+        the rows on the requested page are then loaded from each table.
+        """
+        if not self.include_archived:
+            return super().list(request, *args, **kwargs)
+
+        live = self.filter_queryset(self.get_queryset())
+        archived = self.filter_archived_queryset(
+            ArchivedTodo.objects.filter(user=request.user)
+        )
+        ordering = OrderingFilter().get_ordering(request, live, self)
+        rows = (
+            live.order_by()
+            .annotate(archived=Value(False))
+            .values_list(*self.union_columns, "archived")
+            .union(
+                archived.order_by()
+                .annotate(archived=Value(True))
+                .values_list(*self.union_columns, "archived"),
+                all=True,
+            )
+            .order_by(*ordering, "-id")
+        )
+
+        page = self.paginate_queryset(rows)
+        paginated = page is not None
+        if not paginated:
+            page = list(rows)
+
+        context = self.get_serializer_context()
+        live_ids = [row[0] for row in page if not row[-1]]
+        archived_ids = [row[0] for row in page if row[-1]]
+        live_todos = list(self.get_queryset().filter(id__in=live_ids))
+        archived_todos = list(
+            self.project(
+                ArchivedTodo.objects.filter(id__in=archived_ids).select_related("user"),
+                ArchivedTodoSerializer,
+            )
+        )
+        # Keyed by instance, since sparse fieldsets may leave out ``id``.
+        serialized = {}
+        for archived, serializer_class, instances in (
+            (False, TodoSerializer, live_todos),
+            (True, ArchivedTodoSerializer, archived_todos),
+        ):
+            data = serializer_class(
+                instances, many=True, context=context, **self.fieldset
+            ).data
+            serialized.update(
+                {
+                    (archived, instance.id): item
+                    for instance, item in zip(instances, data)
+                }
+            )
+        # Rows moved between tiers after the page was selected are skipped.
+        results = [
+            serialized[(bool(row[-1]), row[0])]
+            for row in page
+            if (bool(row[-1]), row[0]) in serialized
+        ]
+
+        if paginated:
+            return self.get_paginated_response(results)
+        return Response(results)
+
     @extend_schema(
         tags=["To-Dos"],
         summary="Toggle to-do completion status",
@@ -111,3 +283,128 @@ class TodoViewSet(viewsets.ModelViewSet):
             },
             status=status.HTTP_200_OK,
         )
+
+    @extend_schema(
+        tags=["To-Dos"],
+        summary="List upcoming to-dos",
+        description="List incomplete to-dos that are due now or later, soonest "
+        "first. Uses keyset pagination: follow the `next` link to page.",
+        parameters=SPARSE_FIELDSET_PARAMETERS,
+    )
+    @action(
+        detail=False,
+        methods=["get"],
+        filter_backends=[],
+        pagination_class=DueDateKeysetPagination,
+    )
+    def upcoming(self, request):
+        """
+        List open to-dos due now or later.
+
+        GET /api/todos/upcoming/
+        """
+        return self.due_date_page(self.get_due_queryset())
+
+    @extend_schema(
+        tags=["To-Dos"],
+        summary="List overdue to-dos",
+        description="List incomplete to-dos whose due date has passed, most "
+        "overdue first. Uses keyset pagination: follow the `next` link to page.",
+        parameters=SPARSE_FIELDSET_PARAMETERS,
+    )
+    @action(
+        detail=False,
+        methods=["get"],
+        filter_backends=[],
+        pagination_class=DueDateKeysetPagination,
+    )
+    def overdue(self, request):
+        """
+        List open to-dos whose due date has passed.
+
+        GET /api/todos/overdue/
+        """
+        return self.due_date_page(self.get_due_queryset())
+
+    def due_date_page(self, queryset):
+        """Return one keyset-paginated page of ``queryset``."""
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @property
+    def requested_ids(self):
+        """
+        Return the distinct IDs of the ``ids`` query parameter, in order.
+
+        Raises ValidationError when the parameter is missing, holds
+        something other than IDs, or exceeds ``TODO_MULTI_GET_MAX_IDS``.
+        """
+        names = parse_names(self.request.query_params.get("ids", ""))
+        if not names:
+            raise ValidationError({"ids": ["This query parameter is required."]})
+        invalid = [name for name in names if not name.isdecimal() or int(name) > MAX_ID]
+        if invalid:
+            raise ValidationError({"ids": [f"Invalid ID: {name}." for name in invalid]})
+        ids = list(dict.fromkeys(int(name) for name in names))
+        if len(ids) > settings.TODO_MULTI_GET_MAX_IDS:
+            raise ValidationError(
+                {"ids": [f"At most {settings.TODO_MULTI_GET_MAX_IDS} IDs are allowed."]}
+            )
+        return ids
+
+    @extend_schema(
+        tags=["To-Dos"],
+        summary="Retrieve several to-dos",
+        description="Get the to-dos with the given IDs in one request, in the "
+        "order requested. IDs that do not exist or belong to another user are "
+        "listed in `missing`. Use fields or omit to select the returned fields.",
+        parameters=[
+            OpenApiParameter(
+                name="ids",
+                type=OpenApiTypes.STR,
+                required=True,
+                description="Comma-separated to-do IDs, e.g. `3,1,2`.",
+            ),
+            *SPARSE_FIELDSET_PARAMETERS,
+        ],
+        responses=inline_serializer(
+            name="TodoMultiGet",
+            fields={
+                "results": TodoSerializer(many=True),
+                "missing": serializers.ListField(child=serializers.IntegerField()),
+            },
+        ),
+    )
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="multi-get",
+        filter_backends=[],
+        pagination_class=None,
+    )
+    def multi_get(self, request):
+        """
+        Retrieve the to-dos with the given IDs with one ``id__in`` query.
+
+        GET /api/todos/multi-get/?ids=1,2,3
+
+        The queryset is limited to the user's to-dos, so no per-object
+        permission check is needed; other users' IDs are reported as missing
+        like unknown ones. The response depends only on the URL and the user:
+        it is marked private so shared caches never store it.
+        """
+        ids = self.requested_ids
+        todos = {todo.pk: todo for todo in self.get_queryset().filter(id__in=ids)}
+        serializer = self.get_serializer(
+            [todos[pk] for pk in ids if pk in todos], many=True
+        )
+        response = Response(
+            {
+                "results": serializer.data,
+                "missing": [pk for pk in ids if pk not in todos],
+            }
+        )
+        patch_cache_control(response, private=True)
+        patch_vary_headers(response, ("Authorization",))
+        return response
@@ -3,14 +3,47 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 
+from .deletion import owned_querysets, schedule_user_deletion
 from .models import User
 
 
 @admin.register(User)
 class UserAdmin(BaseUserAdmin):
-    """Admin configuration for the custom User model."""
+    """
+    Admin configuration for the custom User model.
+
+    Deleting users from the admin only deactivates them and schedules the
+    removal of their data in the background (see ``apps.users.deletion``),
+    instead of collecting every dependent row inside the request.
+    """
 
     list_display = ("username", "email", "is_staff", "is_active", "date_joined")
     list_filter = ("is_staff", "is_active", "date_joined")
     search_fields = ("username", "email")
     ordering = ("-date_joined",)
+
+    def get_queryset(self, request):
+        """Hide users that are already scheduled for deletion."""
+        return super().get_queryset(request).filter(deletion_requested_at__isnull=True)
+
+    def get_deleted_objects(self, objs, request):
+        """Summarize what will be deleted using counts instead of loading rows."""
+        objs = list(objs)
+        model_count = {User._meta.verbose_name_plural: len(objs)}
+        for obj in objs:
+            for queryset in owned_querysets(obj):
+                name = queryset.model._meta.verbose_name_plural
+                model_count[name] = model_count.get(name, 0) + queryset.count()
+        to_delete = [str(obj) for obj in objs]
+        perms_needed = set()
+        if not self.has_delete_permission(request):
+            perms_needed.add(User._meta.verbose_name)
+        return to_delete, model_count, perms_needed, []
+
+    def delete_model(self, request, obj):
+        """Schedule a single user for deletion."""
+        schedule_user_deletion([obj])
+
+    def delete_queryset(self, request, queryset):
+        """Schedule the selected users for deletion."""
+        schedule_user_deletion(queryset)
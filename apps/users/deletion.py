@@ -0,0 +1,149 @@
+"""
+Batched user deletion for the users app.
+
+Deleting a user through ``Model.delete()`` makes Django's collector load
+every dependent row into memory first. This module removes the rows that
+belong to a user in bounded batches of set-based ``DELETE`` statements
+before deleting the user itself, and can run that work off the request.
+"""
+
+import logging
+import threading
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection, models, transaction
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def owned_querysets(user):
+    """
+    Return querysets for every row removed together with ``user``.
+
+    This covers all relations that cascade from the user model, plus the
+    user's outstanding JWT refresh tokens, which would otherwise only be
+    detached from the user.
+    """
+    querysets = []
+    if apps.is_installed("rest_framework_simplejwt.token_blacklist"):
+        from rest_framework_simplejwt.token_blacklist.models import (
+            BlacklistedToken,
+            OutstandingToken,
+        )
+
+        querysets.append(BlacklistedToken.objects.filter(token__user=user))
+        querysets.append(OutstandingToken.objects.filter(user=user))
+
+    for relation in user._meta.related_objects:
+        if relation.many_to_many or relation.on_delete is not models.CASCADE:
+            continue
+        querysets.append(
+            relation.related_model._base_manager.filter(**{relation.field.name: user})
+        )
+    return querysets
+
+
+def delete_in_batches(queryset, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Delete the rows of ``queryset`` in batches of at most ``batch_size``.
+
+    Each batch selects primary keys only and deletes them with a single
+    ``DELETE ... WHERE id IN (...)``, so memory use stays bounded no matter
+    how many rows match.
+
+    Returns:
+        The number of rows deleted.
+    """
+    model = queryset.model
+    deleted = 0
+    while True:
+        ids = list(queryset.order_by().values_list("pk", flat=True)[:batch_size])
+        if not ids:
+            return deleted
+        model._base_manager.filter(pk__in=ids).delete()
+        deleted += len(ids)
+
+
+def purge_user(user, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Delete ``user`` and everything it owns in bounded batches.
+
+    The user is deactivated first (if that has not happened already) so it
+    cannot authenticate while its data is being removed.
+
+    Returns:
+        The number of dependent rows deleted.
+    """
+    if user.deletion_requested_at is None:
+        user.schedule_deletion()
+
+    deleted = 0
+    for queryset in owned_querysets(user):
+        deleted += delete_in_batches(queryset, batch_size=batch_size)
+    user.delete()
+    logger.info("Purged user %s and %d dependent rows.", user.pk, deleted)
+    return deleted
+
+
+def purge_scheduled_users(batch_size=DEFAULT_BATCH_SIZE, limit=None):
+    """
+    Purge every user scheduled for deletion, oldest request first.
+
+    Returns:
+        The number of users purged.
+    """
+    User = get_user_model()
+    pending = User._base_manager.filter(deletion_requested_at__isnull=False).order_by(
+        "deletion_requested_at"
+    )
+    if limit is not None:
+        pending = pending[:limit]
+
+    purged = 0
+    for user in pending:
+        purge_user(user, batch_size=batch_size)
+        purged += 1
+    return purged
+
+
+def _purge_in_thread(user_ids, batch_size):
+    """Thread target that purges the given users and closes its connection."""
+    User = get_user_model()
+    try:
+        for user in User._base_manager.filter(pk__in=user_ids):
+            purge_user(user, batch_size=batch_size)
+    except Exception:
+        # Users stay scheduled and are picked up by ``manage.py purge_users``.
+        logger.exception("Background purge of users %s failed.", user_ids)
+    finally:
+        connection.close()
+
+
+def schedule_user_deletion(users, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Schedule ``users`` for deletion and start purging them in the background.
+
+    The users are deactivated synchronously. Unless
+    ``USER_DELETION_IN_BACKGROUND`` is disabled, their data is then removed
+    by a daemon thread started once the current transaction commits;
+    anything left behind (for example when the worker is recycled) is
+    removed by the ``purge_users`` management command.
+    """
+    user_ids = []
+    for user in users:
+        user.schedule_deletion()
+        user_ids.append(user.pk)
+
+    if user_ids and getattr(settings, "USER_DELETION_IN_BACKGROUND", True):
+        thread = threading.Thread(
+            target=_purge_in_thread,
+            args=(user_ids, batch_size),
+            name="user-purge",
+            daemon=True,
+        )
+        transaction.on_commit(thread.start)
+    return user_ids
@@ -0,0 +1,41 @@
+"""Management command that deletes users scheduled for deletion."""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.users.deletion import DEFAULT_BATCH_SIZE, purge_scheduled_users
+
+
+class Command(BaseCommand):
+    """
+    Delete every user scheduled for deletion together with their data.
+
+    Intended to run periodically (or as a one-off job) to finish deletions
+    that were not completed in the background.
+    """
+
+    help = "Delete users scheduled for deletion in bounded batches."
+
+    def add_arguments(self, parser):
+        """Register command line arguments."""
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="Number of dependent rows deleted per statement.",
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=None,
+            help="Maximum number of users to purge in this run.",
+        )
+
+    def handle(self, *args, **options):
+        """Purge scheduled users."""
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+
+        purged = purge_scheduled_users(
+            batch_size=options["batch_size"], limit=options["limit"]
+        )
+        self.stdout.write(self.style.SUCCESS(f"Purged {purged} users."))
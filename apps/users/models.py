@@ -6,6 +6,7 @@ This module defines the custom User model extending Django's AbstractUser.
 
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils import timezone
 
 
 class User(AbstractUser):
@@ -13,9 +14,15 @@ class User(AbstractUser):
     Custom User model extending Django's AbstractUser.
 
     This model can be extended with additional fields as needed.
+
+    Attributes:
+        deletion_requested_at: Set when the account is scheduled for
+            deletion; the account and its data are then removed in the
+            background by ``apps.users.deletion``.
     """
 
     email = models.EmailField(unique=True)
+    deletion_requested_at = models.DateTimeField(null=True, blank=True, editable=False)
 
     class Meta:
         verbose_name = "user"
@@ -25,3 +32,14 @@ class User(AbstractUser):
     def __str__(self):
         """Return string representation of the user."""
         return self.username
+
+    def schedule_deletion(self):
+        """
+        Deactivate the user and mark the account for background deletion.
+
+        Deactivated users can no longer log in, refresh tokens or
+        authenticate with an existing access token.
+        """
+        self.is_active = False
+        self.deletion_requested_at = timezone.now()
+        self.save(update_fields=["is_active", "deletion_requested_at"])
@@ -9,6 +9,9 @@ from django.contrib.auth.password_validation import validate_password
 
 from rest_framework import serializers
 
+from apps.core.fields import CompactModelSerializerMixin
+from apps.monitoring.mixins import TimedSerializerMixin
+
 User = get_user_model()
 
 
@@ -51,7 +54,9 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         return user
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(
+    TimedSerializerMixin, CompactModelSerializerMixin, serializers.ModelSerializer
+):
     """Serializer for user profile information."""
 
     class Meta:
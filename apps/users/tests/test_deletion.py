@@ -0,0 +1,125 @@
+"""
+Tests for batched user deletion.
+
+This module contains tests for scheduling and purging users.
+"""
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework import status
+
+import pytest
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.todos.models import Todo
+from apps.users.deletion import delete_in_batches, purge_user, schedule_user_deletion
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestScheduleDeletion:
+    """Test cases for scheduling a user for deletion."""
+
+    def test_schedule_deactivates_user(self, user, settings):
+        """Test that scheduling deactivates the user immediately."""
+        settings.USER_DELETION_IN_BACKGROUND = False
+        schedule_user_deletion([user])
+
+        user.refresh_from_db()
+        assert user.is_active is False
+        assert user.deletion_requested_at is not None
+
+    def test_scheduled_user_cannot_authenticate(self, api_client, user, settings):
+        """Test that existing tokens stop working once deletion is scheduled."""
+        settings.USER_DELETION_IN_BACKGROUND = False
+        refresh = RefreshToken.for_user(user)
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+        schedule_user_deletion([user])
+
+        response = api_client.get(reverse("users:profile"))
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+        api_client.credentials()
+        response = api_client.post(
+            reverse("users:login"),
+            {"username": user.username, "password": "testpass123"},
+        )
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.django_db
+class TestPurgeUser:
+    """Test cases for purging a user and the rows it owns."""
+
+    def test_purge_removes_user_todos_and_tokens(self, user, user_todos):
+        """Test that purging deletes the user, its todos and its tokens."""
+        RefreshToken.for_user(user).blacklist()
+        RefreshToken.for_user(user)
+
+        deleted = purge_user(user, batch_size=3)
+
+        assert deleted == len(user_todos) + 3
+        assert not User.objects.filter(pk=user.pk).exists()
+        assert not Todo.objects.exists()
+        assert not OutstandingToken.objects.exists()
+
+    def test_delete_in_batches_is_bounded(self, user, user_todos):
+        """Test that each batch issues one select and one delete statement."""
+        with CaptureQueriesContext(connection) as queries:
+            deleted = delete_in_batches(Todo.objects.filter(user=user), batch_size=3)
+
+        assert deleted == len(user_todos)
+        deletes = [q for q in queries if q["sql"].startswith("DELETE")]
+        assert len(deletes) == 3
+        assert not any('"todos_todo"."title"' in q["sql"] for q in queries)
+
+    def test_purge_users_command(self, user, user_todos, settings):
+        """Test that the command purges all scheduled users."""
+        settings.USER_DELETION_IN_BACKGROUND = False
+        schedule_user_deletion([user])
+
+        call_command("purge_users", "--batch-size", "2")
+
+        assert not User.objects.filter(pk=user.pk).exists()
+        assert not Todo.objects.exists()
+
+
+@pytest.mark.django_db
+class TestAdminDeletion:
+    """Test cases for deleting users through the admin."""
+
+    def test_admin_delete_schedules_user(self, client, user, user_todos, settings):
+        """Test that the admin delete view only schedules the deletion."""
+        settings.USER_DELETION_IN_BACKGROUND = False
+        settings.STORAGES = {
+            **settings.STORAGES,
+            "staticfiles": {
+                "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+            },
+        }
+        admin = User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="adminpass123"
+        )
+        client.force_login(admin)
+        url = reverse("admin:users_user_delete", args=[user.pk])
+
+        response = client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+
+        response = client.post(url, {"post": "yes"})
+        assert response.status_code == status.HTTP_302_FOUND
+
+        user.refresh_from_db()
+        assert user.is_active is False
+        assert user.deletion_requested_at is not None
+        assert Todo.objects.filter(user=user).count() == len(user_todos)
+
+        response = client.get(reverse("admin:users_user_changelist"))
+        change_url = reverse("admin:users_user_change", args=[user.pk])
+        assert change_url not in response.content.decode()
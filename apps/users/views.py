@@ -9,11 +9,15 @@ from django.contrib.auth import get_user_model
 from rest_framework import generics, status
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
 
 from drf_spectacular.utils import extend_schema, extend_schema_view
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from apps.core.renderers import MessagePackRenderer
+from apps.monitoring.mixins import TimedViewMixin
+
 from .serializers import UserRegistrationSerializer, UserSerializer
 
 User = get_user_model()
@@ -26,7 +30,7 @@ User = get_user_model()
         description="Create a new user account with username, email, and password.",
     )
 )
-class UserRegistrationView(generics.CreateAPIView):
+class UserRegistrationView(TimedViewMixin, generics.CreateAPIView):
     """
     View for user registration.
 
@@ -61,9 +65,10 @@ class UserRegistrationView(generics.CreateAPIView):
     summary="Get current user profile",
     description="Retrieve the authenticated user's profile information.",
 )
-class UserProfileView(generics.RetrieveAPIView):
-    """View for retrieving the authenticated user's profile."""
+class UserProfileView(TimedViewMixin, generics.RetrieveAPIView):
+    """View for retrieving the authenticated user's profile, also as MessagePack."""
 
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, MessagePackRenderer]
     permission_classes = (IsAuthenticated,)
     serializer_class = UserSerializer
 
@@ -77,7 +82,7 @@ class UserProfileView(generics.RetrieveAPIView):
     summary="Logout user",
     description="Blacklist the refresh token to logout the user.",
 )
-class LogoutView(APIView):
+class LogoutView(TimedViewMixin, APIView):
     """
     View for user logout.
 
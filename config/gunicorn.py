@@ -0,0 +1,159 @@
+"""
+Gunicorn configuration for the To-Do application.
+
+Run with ``gunicorn -c config/gunicorn.py config.wsgi:application``.
+
+The application is imported once in the master (``preload_app``) and the
+garbage collector is frozen before workers fork, so the interpreter,
+Django, DRF and the other imported modules stay in pages shared by every
+worker instead of being copied by reference-count and GC writes. Workers
+are recycled after a jittered number of requests so they do not restart
+together; their metrics snapshots are folded into one file when they
+exit. Check the sharing with ``manage.py worker_memory``. Every
+worker warms up (see ``apps.core.health``) before accepting connections.
+
+Every value can be overridden through the environment:
+
+- ``GUNICORN_WORKERS``: default ``2 * CPUs + 1``, capped by the memory
+  limit divided by ``GUNICORN_WORKER_MEMORY_MB`` (one share is kept for the
+  master). Always 1 with the SQLite write queue
+  (``config.settings.production_sqlite``), which only serializes the
+  writers of one process; asking for more workers fails at start-up;
+- ``GUNICORN_THREADS``: default enough threads for ``4 * CPUs``
+  concurrent requests across the workers, at most 8 per worker;
+- ``GUNICORN_MAX_REQUESTS`` and ``GUNICORN_MAX_REQUESTS_JITTER``;
+- ``PORT``, ``GUNICORN_TIMEOUT`` and ``GUNICORN_PIDFILE``.
+"""
+
+import gc
+import os
+import time
+
+from django.conf import settings
+
+from apps.core.resources import (
+    cpu_limit,
+    memory_limit,
+    process_memory,
+    thread_count,
+    worker_count,
+    write_queue_databases,
+)
+
+# As in config.wsgi, which preload_app imports next.
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.production")
+
+MB = 1024 * 1024
+
+cpus = cpu_limit()
+memory = memory_limit()
+worker_memory = int(os.getenv("GUNICORN_WORKER_MEMORY_MB", "120")) * MB
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(
+    os.getenv("GUNICORN_WORKERS") or worker_count(cpus, memory, worker_memory)
+)
+single_writer = write_queue_databases(settings.DATABASES)
+if single_writer:
+    if os.getenv("GUNICORN_WORKERS") and workers != 1:
+        raise RuntimeError(
+            f"GUNICORN_WORKERS={workers} with the SQLite write queue of database "
+            f"{', '.join(single_writer)}: the queue only serializes the writers "
+            "of one process. Set GUNICORN_WORKERS=1 and raise GUNICORN_THREADS."
+        )
+    workers = 1
+threads = int(os.getenv("GUNICORN_THREADS") or thread_count(cpus, workers))
+worker_class = "gthread" if threads > 1 else "sync"
+preload_app = True
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "1000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "100"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+pidfile = os.getenv("GUNICORN_PIDFILE", "/tmp/gunicorn.pid")
+accesslog = "-"
+errorlog = "-"
+
+# Objects created while the application is imported are never collected,
+# so keep the collector from touching (and un-sharing) them until frozen.
+gc.disable()
+
+
+def when_ready(server):
+    """Warm up and freeze the preloaded heap before the first worker forks."""
+    from django.db import connections
+
+    from apps.core.health import warm_up
+
+    # URL patterns compiled here are shared by every worker.
+    warm_up(database=False)
+    # Workers must not share sockets opened while the application loaded.
+    connections.close_all()
+    gc.collect()
+    gc.freeze()
+    gc.enable()
+    server.log.info(
+        "Sizing: %d CPUs, %s MB memory -> %d workers x %d threads; "
+        "%d objects frozen",
+        cpus,
+        memory // MB if memory else "unknown",
+        workers,
+        threads,
+        gc.get_freeze_count(),
+    )
+
+
+def post_worker_init(worker):
+    """
+    Warm up the worker before it accepts connections.
+
+    gthread workers also connect every thread of their request pool to the
+    databases, so no request pays for the first connection.
+
+    An exception here would make gunicorn treat the worker as failing to
+    boot and stop the whole server, so a database outage only leaves the
+    worker unready: ``/readyz`` answers 503 and retries the warm-up.
+    """
+    from django.db import DatabaseError, connections
+
+    from apps.core.health import warm_pool, warm_up
+
+    try:
+        timings = warm_up()
+        # Threaded workers serve requests from their pool, whose threads
+        # each need their own connection; this thread's is never used.
+        pool = getattr(worker, "tpool", None)
+        if pool is not None:
+            start = time.perf_counter()
+            warm_pool(pool, worker.cfg.threads)
+            timings["pool"] = round((time.perf_counter() - start) * 1000, 1)
+            connections.close_all()
+    except DatabaseError:
+        worker.log.exception(
+            "Worker %s booted unready: database unavailable", worker.pid
+        )
+        return
+    worker.log.info("Worker %s warmed up: %s", worker.pid, timings)
+
+
+def child_exit(server, worker):
+    """Fold the metrics snapshots of an exited worker into the retired ones."""
+    from apps.monitoring.metrics import registry
+
+    try:
+        registry.retire(worker.pid)
+    except OSError:
+        server.log.exception("Cannot retire the metrics of worker %s", worker.pid)
+
+
+def worker_exit(server, worker):
+    """Log the memory of a worker when it is recycled or stopped."""
+    try:
+        usage = process_memory()
+    except OSError:
+        return
+    server.log.info(
+        "Worker %s exiting: rss %.1f MB, uss %.1f MB, shared %.1f MB",
+        worker.pid,
+        usage.rss / MB,
+        usage.uss / MB,
+        usage.shared / MB,
+    )
@@ -5,17 +5,20 @@ This module contains settings common to all environments.
 """
 
 import os
+import tempfile
 from datetime import timedelta
 from pathlib import Path
 
-from dotenv import load_dotenv
-
-# Load environment variables from .env file
-load_dotenv()
-
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 
+# Load environment variables from the .env file. Deployments configure the
+# environment directly, so python-dotenv is only imported when there is one
+if (BASE_DIR / ".env").exists():
+    from dotenv import load_dotenv
+
+    load_dotenv(BASE_DIR / ".env")
+
 # SECURITY WARNING: keep the secret key used in production secret!
 SECRET_KEY = os.getenv(
     "SECRET_KEY", "django-insecure-change-this-in-production-environment"
@@ -23,7 +26,9 @@ SECRET_KEY = os.getenv(
 
 # Application definition
 INSTALLED_APPS = [
-    "django.contrib.admin",
+    # Admin modules are discovered in config.urls, on the first request
+    # rather than at start-up
+    "django.contrib.admin.apps.SimpleAdminConfig",
     "django.contrib.auth",
     "django.contrib.contenttypes",
     "django.contrib.sessions",
@@ -36,21 +41,70 @@ INSTALLED_APPS = [
     "django_filters",
     "drf_spectacular",
     # Local apps
+    "apps.core",
+    "apps.monitoring",
     "apps.users",
     "apps.todos",
 ]
 
 MIDDLEWARE = [
+    "apps.core.health.HealthCheckMiddleware",
+    "apps.monitoring.middleware.ServerTimingMiddleware",
+    "apps.monitoring.middleware.MetricsMiddleware",
+    "apps.monitoring.slow_queries.SlowQueryMiddleware",
+    "apps.monitoring.nplusone.NPlusOneMiddleware",
+    "apps.monitoring.profiling.ProfilingMiddleware",
+    "apps.monitoring.traffic.TrafficCaptureMiddleware",
+    "apps.core.compression.CompressionMiddleware",
     "django.middleware.security.SecurityMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",
-    "django.contrib.sessions.middleware.SessionMiddleware",
+    "apps.core.middleware.WhiteNoiseMiddleware",
+    "apps.core.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
-    "django.middleware.csrf.CsrfViewMiddleware",
-    "django.contrib.auth.middleware.AuthenticationMiddleware",
-    "django.contrib.messages.middleware.MessageMiddleware",
+    "apps.core.middleware.CsrfViewMiddleware",
+    "apps.core.middleware.AuthenticationMiddleware",
+    "apps.core.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# Requests under these prefixes skip the session, CSRF, messages, static file
+# and session authentication middleware (see apps.core.middleware); the API
+# authenticates with JWT only. Set LEAN_MIDDLEWARE_PREFIXES to "" to disable
+LEAN_MIDDLEWARE_PREFIXES = tuple(
+    prefix
+    for prefix in os.getenv("LEAN_MIDDLEWARE_PREFIXES", "/api/").split(",")
+    if prefix
+)
+
+# Negotiated compression of dynamic responses (see apps.core.compression).
+# Response caches must come before CompressionMiddleware in MIDDLEWARE so
+# they store compressed bodies. COMPRESSION_ENCODINGS is in preference
+# order; br and zstd are skipped unless brotli and zstandard are installed.
+# COMPRESSION_LEVELS overrides levels, e.g. "br=5,gzip=6"
+RESPONSE_COMPRESSION = os.getenv("RESPONSE_COMPRESSION", "True").lower() in (
+    "true",
+    "1",
+    "yes",
+)
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_ENCODINGS = tuple(
+    encoding
+    for encoding in os.getenv("COMPRESSION_ENCODINGS", "br,zstd,gzip").split(",")
+    if encoding
+)
+COMPRESSION_LEVELS = {
+    "br": 4,
+    "zstd": 3,
+    "gzip": 5,
+    **{
+        encoding: int(level)
+        for encoding, level in (
+            item.split("=", 1)
+            for item in os.getenv("COMPRESSION_LEVELS", "").split(",")
+            if item
+        )
+    },
+}
+
 ROOT_URLCONF = "config.urls"
 
 TEMPLATES = [
@@ -113,6 +167,106 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 # Custom User Model
 AUTH_USER_MODEL = "users.User"
 
+# Remove the data of users deleted from the admin in a background thread
+# (otherwise only `manage.py purge_users` removes it)
+USER_DELETION_IN_BACKGROUND = os.getenv(
+    "USER_DELETION_IN_BACKGROUND", "True"
+).lower() in ("true", "1", "yes")
+
+# Fraction of requests timed by ServerTimingMiddleware (0.0 disables it)
+SERVER_TIMING_SAMPLE_RATE = float(os.getenv("SERVER_TIMING_SAMPLE_RATE", "1.0"))
+
+# Metrics exported at /metrics/ (see apps.monitoring.metrics); REQUEST_METRICS
+# turns off the per-request latency, size and query metrics. Workers
+# share their values through snapshot files in METRICS_DIR; without it each
+# scrape only sees the worker that served it. Scrapers must send
+# METRICS_AUTH_TOKEN as a bearer token; without one /metrics/ answers 403
+# unless DEBUG is on.
+REQUEST_METRICS = os.getenv("REQUEST_METRICS", "True").lower() in (
+    "true",
+    "1",
+    "yes",
+)
+METRICS_DIR = os.getenv("METRICS_DIR", "")
+METRICS_FLUSH_INTERVAL = float(os.getenv("METRICS_FLUSH_INTERVAL", "5"))
+METRICS_AUTH_TOKEN = os.getenv("METRICS_AUTH_TOKEN", "")
+
+# Statements slower than this are logged, kept per worker (SLOW_QUERY_BUFFER_SIZE
+# entries) and listed at /admin/slow-queries/ with their EXPLAIN plan.
+# Set SLOW_QUERY_LOG to False to disable the capture
+SLOW_QUERY_LOG = os.getenv("SLOW_QUERY_LOG", "True").lower() in ("true", "1", "yes")
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "100"))
+SLOW_QUERY_BUFFER_SIZE = int(os.getenv("SLOW_QUERY_BUFFER_SIZE", "200"))
+SLOW_QUERY_EXPLAIN = os.getenv("SLOW_QUERY_EXPLAIN", "True").lower() in (
+    "true",
+    "1",
+    "yes",
+)
+
+# Log requests that repeat one statement shape NPLUSONE_REPEAT_THRESHOLD
+# times or more (probable N+1 queries), with the offending stack
+NPLUSONE_LOG = os.getenv("NPLUSONE_LOG", "False").lower() in ("true", "1", "yes")
+NPLUSONE_REPEAT_THRESHOLD = int(os.getenv("NPLUSONE_REPEAT_THRESHOLD", "5"))
+
+# Sampling profiler (see apps.monitoring.profiling). PROFILER_VIEWS lists
+# views profiled at random, e.g. "TodoViewSet.list=0.01,TodoViewSet.retrieve=0.1";
+# staff can also profile single requests with a token from /admin/profiles/.
+# Writing a profile deletes all but the newest PROFILER_MAX_FILES and those
+# older than PROFILER_MAX_AGE seconds (0 keeps them regardless of age)
+PROFILER_DIR = os.getenv(
+    "PROFILER_DIR", os.path.join(tempfile.gettempdir(), "todo-profiles")
+)
+PROFILER_MAX_FILES = int(os.getenv("PROFILER_MAX_FILES", "200"))
+PROFILER_MAX_AGE = int(os.getenv("PROFILER_MAX_AGE", str(7 * 24 * 3600)))
+PROFILER_INTERVAL_MS = float(os.getenv("PROFILER_INTERVAL_MS", "5"))
+PROFILER_TOKEN_MAX_AGE = int(os.getenv("PROFILER_TOKEN_MAX_AGE", "3600"))
+PROFILER_VIEWS = {
+    view: float(rate)
+    for view, rate in (
+        item.split("=", 1)
+        for item in os.getenv("PROFILER_VIEWS", "").split(",")
+        if item
+    )
+}
+
+# Anonymized traffic capture for the replay_traffic command (see
+# apps.monitoring.traffic); disabled unless TRAFFIC_CAPTURE_PATH is set
+TRAFFIC_CAPTURE_PATH = os.getenv("TRAFFIC_CAPTURE_PATH", "")
+TRAFFIC_CAPTURE_SAMPLE_RATE = float(os.getenv("TRAFFIC_CAPTURE_SAMPLE_RATE", "1.0"))
+TRAFFIC_CAPTURE_PREFIXES = ("/api/",)
+TRAFFIC_CAPTURE_USER_BUCKETS = int(os.getenv("TRAFFIC_CAPTURE_USER_BUCKETS", "100"))
+# Query parameters whose values are recorded verbatim
+TRAFFIC_CAPTURE_SAFE_PARAMS = (
+    "completed",
+    "priority",
+    "ordering",
+    "page",
+    "page_size",
+    "include_archived",
+    "due_date_from",
+    "due_date_to",
+)
+
+CACHES = {
+    "default": {
+        "BACKEND": "apps.monitoring.cache.LocMemCache",
+    },
+}
+
+# Fields left out of to-do list pages (list, upcoming, overdue) unless the
+# client selects fields with ?fields= or ?omit=, e.g. "description"
+TODO_LIST_DEFAULT_OMIT = tuple(
+    field for field in os.getenv("TODO_LIST_DEFAULT_OMIT", "").split(",") if field
+)
+
+# Most to-dos fetched by one GET /api/todos/multi-get/?ids= request
+TODO_MULTI_GET_MAX_IDS = int(os.getenv("TODO_MULTI_GET_MAX_IDS", "100"))
+
+# Request batching at /api/batch/ (see apps.core.batch): calls per batch and
+# threads running the read-only calls of parallel batches
+BATCH_MAX_REQUESTS = int(os.getenv("BATCH_MAX_REQUESTS", "20"))
+BATCH_MAX_WORKERS = int(os.getenv("BATCH_MAX_WORKERS", "4"))
+
 # Django REST Framework settings
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
@@ -127,6 +281,16 @@ REST_FRAMEWORK = {
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 20,
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    # orjson-backed JSON with output identical to DRF's (see apps.core.renderers)
+    "DEFAULT_RENDERER_CLASSES": (
+        "apps.core.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "apps.core.parsers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
 }
 
 # Simple JWT settings
@@ -147,6 +311,10 @@ SIMPLE_JWT = {
 }
 
 # drf-spectacular settings
+# Precomputed OpenAPI schema written by the build_schema command (see
+# apps.core.schema); ignored when DEBUG is on
+SCHEMA_CACHE_DIR = os.getenv("SCHEMA_CACHE_DIR", str(BASE_DIR / "openapi"))
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "To-Do API",
     "DESCRIPTION": "A RESTful API for managing to-do items with user authentication.",
@@ -69,6 +69,9 @@ SECURE_HSTS_PRELOAD = True
 # Static files
 STATIC_ROOT = BASE_DIR / "staticfiles"  # noqa: F405
 
+# Time a sample of requests (Server-Timing header and timing log line)
+SERVER_TIMING_SAMPLE_RATE = float(os.getenv("SERVER_TIMING_SAMPLE_RATE", "0.05"))
+
 # Logging configuration
 LOGGING = {
     "version": 1,
@@ -0,0 +1,36 @@
+"""
+Single-node production settings backed by SQLite.
+
+Inherits from production settings but stores data in a local SQLite file
+through the tuned backend in ``apps.core.db.backends.sqlite3`` (WAL mode,
+busy timeout, mmap/cache pragmas and an in-process write queue). Intended
+for edge installs that run one node. ``config/gunicorn.py`` runs a single
+worker with several threads (raise ``GUNICORN_THREADS`` for more) so the
+write queue sees every writer, and refuses to start with more workers.
+
+Usage:
+    DJANGO_SETTINGS_MODULE=config.settings.production_sqlite
+"""
+
+import os
+
+from .production import *  # noqa: F401, F403
+
+DATABASES = {
+    "default": {
+        "ENGINE": "apps.core.db.backends.sqlite3",
+        "NAME": os.getenv("SQLITE_PATH", BASE_DIR / "db.sqlite3"),  # noqa: F405
+        # Keep connections open so pragmas are applied once per thread
+        "CONN_MAX_AGE": None,
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {
+            "pragmas": {
+                "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+                "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+                "cache_size": int(os.getenv("SQLITE_CACHE_SIZE", str(-64 * 1024))),
+            },
+            "write_queue": os.getenv("SQLITE_WRITE_QUEUE", "True").lower()
+            in ("true", "1", "yes"),
+        },
+    }
+}
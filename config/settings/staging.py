@@ -8,6 +8,8 @@ Usage:
     docker-compose --env-file .env.staging up --build
 """
 
+import os
+
 from .production import *  # noqa: F401, F403
 
 # Disable SSL redirect (no reverse proxy locally)
@@ -25,3 +27,6 @@ SECURE_HSTS_PRELOAD = False
 # Database SSL - disabled for local Docker Postgres
 # (Cloud databases like Render/Heroku have SSL enabled by default)
 DATABASES["default"]["OPTIONS"]["sslmode"] = "disable"  # noqa: F405
+
+# Log probable N+1 queries with their stack traces
+NPLUSONE_LOG = os.getenv("NPLUSONE_LOG", "True").lower() in ("true", "1", "yes")
@@ -7,27 +7,39 @@ This module defines the root URL patterns for the entire project.
 from django.contrib import admin
 from django.urls import include, path
 
-from drf_spectacular.views import (
-    SpectacularAPIView,
-    SpectacularRedocView,
-    SpectacularSwaggerView,
-)
+from apps.core.views import BatchView, lazy_view, schema
+from apps.monitoring.views import metrics, profile_download, profiles, slow_queries
+
+admin.autodiscover()
 
 urlpatterns = [
+    path(
+        "admin/slow-queries/",
+        admin.site.admin_view(slow_queries),
+        name="slow-queries",
+    ),
+    path("admin/profiles/", admin.site.admin_view(profiles), name="profiles"),
+    path(
+        "admin/profiles/<str:name>/",
+        admin.site.admin_view(profile_download),
+        name="profile-download",
+    ),
     path("admin/", admin.site.urls),
     # API endpoints
     path("api/", include("apps.todos.urls")),
     path("api/auth/", include("apps.users.urls")),
+    path("api/batch/", BatchView.as_view(), name="batch"),
+    path("metrics/", metrics, name="metrics"),
     # API Documentation
-    path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
+    path("api/schema/", schema, name="schema"),
     path(
         "api/docs/",
-        SpectacularSwaggerView.as_view(url_name="schema"),
+        lazy_view("drf_spectacular.views.SpectacularSwaggerView", url_name="schema"),
         name="swagger-ui",
     ),
     path(
         "api/redoc/",
-        SpectacularRedocView.as_view(url_name="schema"),
+        lazy_view("drf_spectacular.views.SpectacularRedocView", url_name="schema"),
         name="redoc",
     ),
 ]
@@ -0,0 +1,5 @@
+"""
+Project-wide pytest configuration.
+"""
+
+pytest_plugins = ["apps.monitoring.pytest_plugin"]